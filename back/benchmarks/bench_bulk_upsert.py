@@ -0,0 +1,75 @@
+"""
+勤怠データの書き込みスループットを比較するベンチマーク。
+
+- single: 1日ずつcreate_or_update_attendanceを呼ぶ（SELECT → COMMIT → REFRESH を1日ごとに実行）
+- bulk: upsert_attendanceで全日分を1トランザクションで登録・更新
+
+Usage:
+    cd back
+    python -m benchmarks.bench_bulk_upsert [--days 1000]
+"""
+import argparse
+import random
+import time
+from datetime import date, timedelta
+
+from benchmarks.common import create_bench_engine, make_attendance_row
+from modules.attendance_upsert import INPUT_COLUMNS, upsert_attendance
+from modules.tenant import Tenant
+from routers.attendance import create_or_update_attendance
+from schemas import AttendanceCreate
+
+
+def make_items(days: int, seed: int):
+    """合成の勤怠データ（日付, 入力データ）をdays日分作成する。"""
+    rng = random.Random(seed)
+    start = date(2020, 1, 1)
+    items = []
+    for i in range(days):
+        row = make_attendance_row(start + timedelta(days=i), rng)
+        items.append((row["date"], {key: row[key] for key in INPUT_COLUMNS}))
+    return items
+
+
+def run_single(Session, items) -> float:
+    """1日ずつ書き込み、所要時間（秒）を返す。"""
+    db = Session()
+    try:
+        t0 = time.perf_counter()
+        for record_date, data in items:
+            create_or_update_attendance(record_date, AttendanceCreate(**data), db, Tenant())
+        return time.perf_counter() - t0
+    finally:
+        db.close()
+
+
+def run_bulk(Session, items) -> float:
+    """一括で書き込み、所要時間（秒）を返す。"""
+    db = Session()
+    try:
+        t0 = time.perf_counter()
+        upsert_attendance(db, Tenant(), items)
+        db.commit()
+        return time.perf_counter() - t0
+    finally:
+        db.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="勤怠データ書き込みのベンチマーク")
+    parser.add_argument("--days", type=int, default=1000, help="書き込む日数")
+    args = parser.parse_args()
+
+    items = make_items(args.days, seed=0)
+    updates = make_items(args.days, seed=1)
+
+    for name, run in (("single", run_single), ("bulk", run_bulk)):
+        _, Session = create_bench_engine(f"{name}.db")
+        insert_sec = run(Session, items)
+        update_sec = run(Session, updates)
+        print(f"{name:>6}: insert {args.days / insert_sec:10.0f} rows/s ({insert_sec:.3f} s), "
+              f"update {args.days / update_sec:10.0f} rows/s ({update_sec:.3f} s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+"""
+月の絞り込み条件（extractによる年・月比較 と 月初〜翌月初の範囲条件）の
+クエリプランと実行時間を比較するベンチマーク。
+
+Usage:
+    cd back
+    python -m benchmarks.bench_month_filter [--years 10] [--users 50] [--repeat 5]
+"""
+import argparse
+
+from sqlalchemy import extract, text
+
+from benchmarks.common import bench_user_id, create_bench_engine, fill_attendance, measure
+from models import AttendanceRecord
+from modules.date_filters import month_filter
+
+
+def extract_filter(user_id: str, year: int, month: int):
+    """従来の絞り込み条件（dateカラムを関数で包むためインデックスが使えない）。"""
+    return (
+        AttendanceRecord.user_id == user_id,
+        extract("year", AttendanceRecord.date) == year,
+        extract("month", AttendanceRecord.date) == month,
+    )
+
+
+def range_filter(user_id: str, year: int, month: int):
+    """範囲条件（(user_id, date)の複合インデックスで範囲スキャンできる）。"""
+    return (
+        AttendanceRecord.user_id == user_id,
+        month_filter(AttendanceRecord.date, f"{year:04d}-{month:02d}"),
+    )
+
+
+def explain(engine, query) -> str:
+    """SQLiteのEXPLAIN QUERY PLANの結果を返す。"""
+    sql = str(query.statement.compile(engine, compile_kwargs={"literal_binds": True}))
+    with engine.connect() as conn:
+        return "\n".join(str(row[-1]) for row in conn.execute(text(f"EXPLAIN QUERY PLAN {sql}")))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="月の絞り込み条件のベンチマーク")
+    parser.add_argument("--years", type=int, default=10, help="投入するデータの年数")
+    parser.add_argument("--users", type=int, default=50, help="投入するデータのユーザー数")
+    parser.add_argument("--repeat", type=int, default=5, help="全月のクエリを繰り返す回数")
+    args = parser.parse_args()
+
+    engine, Session = create_bench_engine()
+    count = fill_attendance(engine, args.years, args.users)
+    print(f"{count} 件の勤怠データを投入しました（{args.years} 年分 × {args.users} ユーザー）")
+    user_id = bench_user_id(args.users // 2)
+
+    end_year = 2025
+    months = [(y, m) for y in range(end_year - args.years + 1, end_year + 1) for m in range(1, 13)]
+
+    db = Session()
+    try:
+        for name, build in (("extract", extract_filter), ("range", range_filter)):
+            print(f"\n== {name} ==")
+            print(explain(engine, db.query(AttendanceRecord).filter(*build(user_id, 2025, 6))))
+
+            def run_all_months():
+                for y, m in months:
+                    db.query(AttendanceRecord).filter(*build(user_id, y, m)).all()
+                    db.expunge_all()
+
+            stats = measure(run_all_months, args.repeat)
+            per_query = stats["mean_ms"] / len(months)
+            print(f"1ユーザーの{len(months)} ヶ月分: mean {stats['mean_ms']:.1f} ms / p99 {stats['p99_ms']:.1f} ms"
+                  f"（1クエリ平均 {per_query:.3f} ms）")
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
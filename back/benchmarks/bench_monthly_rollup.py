@@ -0,0 +1,65 @@
+"""
+月別推移の集計を、日ごとの勤怠データのGROUP BY（従来）と月の集計（monthly_rollups）の読み取りで
+比較するベンチマーク。
+
+過去のデータの年数（--years）を変えて実行すると、GROUP BYは読み取る範囲の日ごとの行数に比例し、
+月の集計の読み取りは範囲の月数（最大--months行）だけで決まることを確認できます。
+
+Usage:
+    cd back
+    python -m benchmarks.bench_monthly_rollup [--years 10] [--users 20] [--months 120] [--repeat 20]
+"""
+import argparse
+
+from sqlalchemy import extract
+
+from benchmarks.common import bench_user_id, create_bench_engine, fill_attendance, measure
+from models import AttendanceRecord
+from modules.attendance_aggregate import query_aggregates
+from modules.date_filters import add_months, date_range_filter, month_range
+from modules.monthly_rollup import read_rollups, rebuild_rollups
+
+
+def main():
+    parser = argparse.ArgumentParser(description="月別推移の集計（GROUP BY と 月の集計の読み取り）の比較")
+    parser.add_argument("--years", type=int, default=10, help="投入する勤怠データの年数")
+    parser.add_argument("--users", type=int, default=20, help="投入するデータのユーザー数")
+    parser.add_argument("--months", type=int, default=120, help="集計する月数（月別推移の範囲）")
+    parser.add_argument("--repeat", type=int, default=20, help="集計を繰り返す回数")
+    args = parser.parse_args()
+
+    engine, Session = create_bench_engine()
+    count = fill_attendance(engine, args.years, args.users)
+    db = Session()
+    try:
+        rollups = rebuild_rollups(db)
+        db.commit()
+        print(f"{count} 件の勤怠データから {rollups} 行の月の集計を作成しました（{args.years} 年分 × {args.users} ユーザー）")
+
+        user_id = bench_user_id(args.users // 2)
+        end_first, range_end = month_range("2025-12")
+        range_start = add_months(end_first, -(args.months - 1))
+        year_col = extract("year", AttendanceRecord.date)
+        month_col = extract("month", AttendanceRecord.date)
+
+        def group_by():
+            query_aggregates(
+                db,
+                AttendanceRecord.user_id == user_id,
+                date_range_filter(AttendanceRecord.date, range_start, range_end),
+                group_by=(year_col, month_col),
+            )
+
+        def rollup():
+            read_rollups(db, user_id, range_start.strftime("%Y-%m"), "2025-12")
+            db.expunge_all()
+
+        for name, func in (("GROUP BY（日ごとの行）", group_by), ("monthly_rollups", rollup)):
+            stats = measure(func, args.repeat)
+            print(f"{name}: {args.months} ヶ月分 mean {stats['mean_ms']:.2f} ms / p99 {stats['p99_ms']:.2f} ms")
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
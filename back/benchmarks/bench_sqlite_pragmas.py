@@ -0,0 +1,117 @@
+"""
+SQLiteの既定の設定（ロールバックジャーナル）と、接続時のPRAGMA（database.SQLITE_PRAGMAS: WAL・
+synchronous=NORMALなど）を適用した設定で、書き込みのスループットと書き込み中の読み取りのレイテンシを比較するベンチマーク。
+
+--writers個のスレッドが1日分ずつ登録・コミット（画面からの保存と同じ）を繰り返す間、
+--readers個のスレッドが月の勤怠データを読み取り続けます。
+
+Usage:
+    cd back
+    python -m benchmarks.bench_sqlite_pragmas [--writers 4] [--readers 2] [--duration 10] [--years 2]
+"""
+import argparse
+import random
+import threading
+import time
+from datetime import date, timedelta
+from typing import Dict, List, Optional
+
+from sqlalchemy.exc import OperationalError
+
+from benchmarks.common import bench_user_id, create_bench_engine, fill_attendance, make_attendance_row
+from database import SQLITE_PRAGMAS
+from models import AttendanceRecord
+from modules.date_filters import date_range_filter, month_range
+
+
+def writer(Session, index: int, deadline: float, counts: Dict[str, int], lock: threading.Lock) -> None:
+    """書き込み専用のユーザーに、1日分ずつ登録してコミットする。"""
+    rng = random.Random(index)
+    user_id = f"writer{index:02d}"
+    day = date(2030, 1, 1)
+    db = Session()
+    try:
+        while time.monotonic() < deadline:
+            try:
+                db.add(AttendanceRecord(**make_attendance_row(day, rng, user_id)))
+                db.commit()
+                key = "writes"
+                day += timedelta(days=1)
+            except OperationalError:
+                # "database is locked"（busy_timeoutを超えて待機した）
+                db.rollback()
+                key = "errors"
+            with lock:
+                counts[key] += 1
+    finally:
+        db.close()
+
+
+def reader(Session, index: int, users: int, deadline: float, latencies: List[float], lock: threading.Lock) -> None:
+    """既存のユーザーの月の勤怠データを読み取り、1回ごとの時間（ミリ秒）を記録する。"""
+    rng = random.Random(1000 + index)
+    db = Session()
+    try:
+        while time.monotonic() < deadline:
+            first, next_first = month_range(f"2025-{rng.randint(1, 12):02d}")
+            t0 = time.perf_counter()
+            db.query(AttendanceRecord).filter(
+                AttendanceRecord.user_id == bench_user_id(rng.randrange(users)),
+                date_range_filter(AttendanceRecord.date, first, next_first),
+            ).all()
+            db.rollback()  # 読み取りのトランザクションを終了（スナップショットを更新）
+            with lock:
+                latencies.append((time.perf_counter() - t0) * 1000)
+    finally:
+        db.close()
+
+
+def run(pragmas: Optional[Dict[str, str]], args) -> Dict[str, float]:
+    engine, Session = create_bench_engine(pragmas=pragmas)
+    fill_attendance(engine, years=args.years, users=args.users)
+
+    counts = {"writes": 0, "errors": 0}
+    latencies: List[float] = []
+    lock = threading.Lock()
+    deadline = time.monotonic() + args.duration
+    threads = [threading.Thread(target=writer, args=(Session, i, deadline, counts, lock)) for i in range(args.writers)]
+    threads += [
+        threading.Thread(target=reader, args=(Session, i, args.users, deadline, latencies, lock))
+        for i in range(args.readers)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    engine.dispose()
+
+    latencies.sort()
+    return {
+        "writes_per_sec": counts["writes"] / args.duration,
+        "errors": counts["errors"],
+        "reads": len(latencies),
+        "read_p50_ms": latencies[len(latencies) // 2] if latencies else 0.0,
+        "read_p99_ms": latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))] if latencies else 0.0,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="SQLiteのPRAGMA（WALなど）の有無による書き込み・読み取り性能の比較")
+    parser.add_argument("--writers", type=int, default=4, help="書き込みスレッド数")
+    parser.add_argument("--readers", type=int, default=2, help="読み取りスレッド数")
+    parser.add_argument("--duration", type=float, default=10.0, help="各設定の計測時間（秒）")
+    parser.add_argument("--years", type=int, default=2, help="投入する勤怠データの年数")
+    parser.add_argument("--users", type=int, default=10, help="読み取り対象のユーザー数")
+    args = parser.parse_args()
+
+    print(f"PRAGMA: {SQLITE_PRAGMAS}")
+    for label, pragmas in (("既定（ロールバックジャーナル）", None), ("PRAGMA適用（WAL）", SQLITE_PRAGMAS)):
+        result = run(pragmas, args)
+        print(
+            f"{label}: 書き込み {result['writes_per_sec']:.1f} 件/秒（ロックエラー {result['errors']} 件）, "
+            f"読み取り {result['reads']:,} 回 p50 {result['read_p50_ms']:.2f} ms / p99 {result['read_p99_ms']:.2f} ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
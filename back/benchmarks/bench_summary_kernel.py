@@ -0,0 +1,94 @@
+"""
+レコードごとのPythonループによる集計（従来のaggregate_attendance）と
+列指向カーネル（modules.summary_kernel）の実行時間を比較するベンチマーク。
+
+--python-limit件を超えるサイズでは、辞書のリストを作らずにNumPyで列を直接生成し、
+カーネルの計算時間のみを測定します（1000万件の辞書はメモリに載らないため）。
+
+Usage:
+    cd back
+    python -m benchmarks.bench_summary_kernel [--sizes 1000 100000 10000000] [--repeat 3]
+"""
+import argparse
+import random
+from datetime import date, datetime, timedelta
+
+import numpy as np
+
+from benchmarks.common import make_attendance_row, measure
+from modules.summary_kernel import AttendanceColumns, aggregate
+from modules.time_utils import parse_time_str
+
+
+def legacy_aggregate(records):
+    """従来の集計処理（レコード・中断ごとにdatetimeを作成して差分を取る）。"""
+    work_total = timedelta()
+    break_total = 0
+    interrupt_total = timedelta()
+    side_job_total = 0
+    for data in records:
+        if data.get("start_time") and data.get("end_time"):
+            dt_s = datetime.combine(date.today(), parse_time_str(data.get("start_time")))
+            dt_e = datetime.combine(date.today(), parse_time_str(data.get("end_time")))
+            work_total += (dt_e - dt_s)
+        break_total += int(data.get("break_minutes") or 0)
+        for it in data.get("interruptions") or []:
+            dt_its = datetime.combine(date.today(), parse_time_str(it.get("start")))
+            dt_ite = datetime.combine(date.today(), parse_time_str(it.get("end")))
+            interrupt_total += (dt_ite - dt_its)
+        side_job_total += int(data.get("side_job_minutes") or 0)
+    return work_total, break_total, interrupt_total, side_job_total
+
+
+def make_records(size: int, seed: int = 0):
+    """合成の勤怠データ（辞書）をsize件作成する。"""
+    rng = random.Random(seed)
+    day = date(2025, 1, 1)
+    return [make_attendance_row(day, rng) for _ in range(size)]
+
+
+def make_columns(size: int, seed: int = 0) -> AttendanceColumns:
+    """合成の勤怠データを列として直接作成する（中断は約3割のレコードに1件）。"""
+    rng = np.random.default_rng(seed)
+    start = rng.integers(8, 11, size) * 60 + rng.choice([0, 15, 30, 45], size)
+    end = rng.integers(17, 22, size) * 60 + rng.choice([0, 15, 30, 45], size)
+    interrupt_counts = (rng.random(size) < 0.3).astype(np.int64)
+    total_interrupts = int(interrupt_counts.sum())
+    return AttendanceColumns(
+        start=start,
+        end=end,
+        has_work=np.ones(size, dtype=bool),
+        break_minutes=np.full(size, 60, dtype=np.int64),
+        side_job_minutes=rng.choice([0, 0, 0, 30, 60], size),
+        interrupt_offsets=np.concatenate(([0], np.cumsum(interrupt_counts))),
+        interrupt_start=np.full(total_interrupts, 12 * 60, dtype=np.int64),
+        interrupt_end=np.full(total_interrupts, 12 * 60 + 30, dtype=np.int64),
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="列指向の集計カーネルのベンチマーク")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1_000, 100_000, 10_000_000], help="レコード数")
+    parser.add_argument("--repeat", type=int, default=3, help="各処理を繰り返す回数")
+    parser.add_argument("--python-limit", type=int, default=1_000_000,
+                        help="この件数以下のサイズで辞書を作成し、従来の処理と比較する")
+    args = parser.parse_args()
+
+    for size in args.sizes:
+        print(f"\n== {size:,} 件 ==")
+        if size <= args.python_limit:
+            records = make_records(size)
+            legacy = measure(lambda: legacy_aggregate(records), args.repeat)
+            build = measure(lambda: AttendanceColumns.from_records(records), args.repeat)
+            columns = AttendanceColumns.from_records(records)
+            print(f"従来（1件ずつ）      : mean {legacy['mean_ms']:.1f} ms")
+            print(f"カーネル（列の作成） : mean {build['mean_ms']:.1f} ms")
+        else:
+            columns = make_columns(size)
+            print("（辞書は作成せず、列を直接生成してカーネルの計算のみ測定）")
+        kernel = measure(lambda: aggregate(columns), args.repeat)
+        print(f"カーネル（集計）     : mean {kernel['mean_ms']:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
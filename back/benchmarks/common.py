@@ -0,0 +1,92 @@
+"""
+ベンチマーク共通の処理（一時DBの作成と合成データの投入）。
+
+ベンチマークは本番のattendance.dbを使わず、一時ディレクトリに作成したSQLiteファイルで実行します。
+"""
+import os
+import random
+import statistics
+import tempfile
+import time
+from datetime import date, timedelta
+from typing import Callable, Dict, List, Optional
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from database import Base, set_sqlite_pragmas
+from models import AttendanceRecord
+from modules.attendance_calc import calc_summary_minutes
+from modules.attendance_upsert import replace_interruptions
+from modules.tenant import DEFAULT_ORG_ID, DEFAULT_USER_ID
+
+
+def create_bench_engine(name: str = "bench.db", pragmas: Optional[Dict[str, str]] = None):
+    """一時ディレクトリにSQLiteのDBを作成し、(engine, sessionmaker)を返す（pragmasは接続時に適用）。"""
+    path = os.path.join(tempfile.mkdtemp(prefix="work-manager-bench-"), name)
+    engine = create_engine(f"sqlite:///{path}", connect_args={"check_same_thread": False})
+    if pragmas:
+        set_sqlite_pragmas(engine, pragmas)
+    Base.metadata.create_all(bind=engine)
+    return engine, sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+
+def make_attendance_row(day: date, rng: random.Random, user_id: str = DEFAULT_USER_ID) -> Dict:
+    """合成の勤怠データ1日分（AttendanceRecordのカラム値）を作成する。"""
+    start = f"{rng.randint(8, 10):02d}:{rng.choice([0, 15, 30, 45]):02d}"
+    end = f"{rng.randint(17, 21):02d}:{rng.choice([0, 15, 30, 45]):02d}"
+    interruptions = [{"start": "12:00", "end": "12:30"}] if rng.random() < 0.3 else []
+    row = {
+        "user_id": user_id,
+        "org_id": DEFAULT_ORG_ID,
+        "date": day,
+        "start_time": start,
+        "end_time": end,
+        "break_minutes": 60,
+        "interruptions": interruptions,
+        "side_job_minutes": rng.choice([0, 0, 0, 30, 60]),
+        "comment": None,
+    }
+    row.update(calc_summary_minutes(start, end, 60, interruptions))
+    return row
+
+
+def bench_user_id(i: int) -> str:
+    """ベンチマーク用のi番目のユーザーID。"""
+    return f"user{i:04d}"
+
+
+def fill_attendance(engine, years: int, users: int = 1, end: date = date(2025, 12, 31), seed: int = 0) -> int:
+    """endから遡ってyears年分・usersユーザー分の平日の勤怠データを投入し、投入件数を返す。"""
+    rng = random.Random(seed)
+    total = 0
+    for i in range(users):
+        day = date(end.year - years + 1, 1, 1)
+        rows: List[Dict] = []
+        while day <= end:
+            if day.weekday() < 5:
+                rows.append(make_attendance_row(day, rng, bench_user_id(i)))
+            day += timedelta(days=1)
+        with engine.begin() as conn:
+            conn.execute(
+                AttendanceRecord.__table__.insert(),
+                [{key: value for key, value in row.items() if key != "interruptions"} for row in rows],
+            )
+            replace_interruptions(conn, bench_user_id(i), rows)
+        total += len(rows)
+    return total
+
+
+def measure(func: Callable[[], object], repeat: int) -> Dict[str, float]:
+    """funcをrepeat回実行し、実行時間の統計（ミリ秒）を返す。"""
+    samples = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        func()
+        samples.append((time.perf_counter() - t0) * 1000)
+    samples.sort()
+    return {
+        "mean_ms": statistics.mean(samples),
+        "p50_ms": samples[len(samples) // 2],
+        "p99_ms": samples[min(len(samples) - 1, int(len(samples) * 0.99))],
+    }
@@ -0,0 +1,143 @@
+"""
+同期モード（スレッドプールで実行される def のハンドラ）と非同期モード（WORK_MANAGER_ASYNC_DB=1）の
+スループット（requests/sec）とレイテンシ（p50/p99）を、同時接続クライアント数を指定して比較する負荷試験。
+
+モードごとに一時ディレクトリのSQLite（マイグレーションで作成）でuvicornを起動し、--users人分の勤怠データを
+投入してから、--clients個のクライアントが--duration秒間、月次の読み取りAPI（と--write-ratioの割合の書き込み）を
+繰り返し呼び出します。
+
+Usage:
+    cd back
+    python -m benchmarks.load_test [--clients 200] [--duration 20] [--users 20] [--modes sync async]
+"""
+import argparse
+import asyncio
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+from typing import Dict, List
+
+import httpx
+
+from benchmarks.common import bench_user_id
+from scripts.schema_utils import upgrade_to_head
+
+# 読み取りの対象とするエンドポイント（{ym}は対象月）
+READ_PATHS = (
+    "/api/attendance/month/{ym}",
+    "/api/attendance/summary/monthly-agg/{ym}",
+    "/api/attendance/forecast/{ym}",
+    "/api/dashboard/{ym}",
+)
+MONTHS = [f"2025-{m:02d}" for m in range(1, 13)]
+ATTENDANCE = {"start_time": "09:00", "end_time": "18:00", "break_minutes": 60, "interruptions": [], "side_job_minutes": 0}
+
+
+def start_server(mode: str, port: int) -> subprocess.Popen:
+    """一時ディレクトリのSQLiteをマイグレーションで作成し、uvicornを起動する。"""
+    url = f"sqlite:///{os.path.join(tempfile.mkdtemp(prefix=f'work-manager-load-{mode}-'), 'attendance.db')}"
+    upgrade_to_head(url)
+    env = dict(os.environ, WORK_MANAGER_DATABASE_URL=url, WORK_MANAGER_ASYNC_DB="1" if mode == "async" else "0")
+    env.pop("WORK_MANAGER_ASYNC_DATABASE_URL", None)
+    app_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    return subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "main:app", "--app-dir", app_dir, "--port", str(port), "--log-level", "warning"],
+        env=env,
+    )
+
+
+async def wait_ready(client: httpx.AsyncClient, timeout: float = 30.0) -> None:
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            if (await client.get("/")).status_code == 200:
+                return
+        except httpx.TransportError:
+            if time.monotonic() > deadline:
+                raise
+        await asyncio.sleep(0.2)
+
+
+async def seed(client: httpx.AsyncClient, users: int) -> None:
+    """各ユーザーに2025年の平日の勤怠データを一括登録する。"""
+    days = [date(2025, 1, 1) + timedelta(days=i) for i in range(365)]
+    items = [{"date": d.isoformat(), **ATTENDANCE} for d in days if d.weekday() < 5]
+    for i in range(users):
+        res = await client.post("/api/attendance/bulk", json=items, headers={"X-User-Id": bench_user_id(i)})
+        res.raise_for_status()
+
+
+async def run_client(client: httpx.AsyncClient, rng: random.Random, args, deadline: float,
+                     latencies: List[float], errors: List[int]) -> None:
+    while time.monotonic() < deadline:
+        headers = {"X-User-Id": bench_user_id(rng.randrange(args.users))}
+        ym = rng.choice(MONTHS)
+        t0 = time.perf_counter()
+        try:
+            if rng.random() < args.write_ratio:
+                day = f"{ym}-{rng.randint(1, 28):02d}"
+                res = await client.post(f"/api/attendance/{day}", json={"date": day, **ATTENDANCE}, headers=headers)
+            else:
+                res = await client.get(rng.choice(READ_PATHS).format(ym=ym), headers=headers)
+            ok = res.status_code < 400
+        except httpx.HTTPError:
+            ok = False
+        latencies.append((time.perf_counter() - t0) * 1000)
+        if not ok:
+            errors.append(1)
+
+
+async def run_mode(mode: str, args) -> Dict[str, float]:
+    server = start_server(mode, args.port)
+    limits = httpx.Limits(max_connections=args.clients, max_keepalive_connections=args.clients)
+    try:
+        async with httpx.AsyncClient(base_url=f"http://127.0.0.1:{args.port}", limits=limits, timeout=60) as client:
+            await wait_ready(client)
+            await seed(client, args.users)
+            latencies: List[float] = []
+            errors: List[int] = []
+            started = time.monotonic()
+            deadline = started + args.duration
+            await asyncio.gather(*[
+                run_client(client, random.Random(i), args, deadline, latencies, errors)
+                for i in range(args.clients)
+            ])
+            elapsed = time.monotonic() - started
+    finally:
+        server.terminate()
+        server.wait()
+
+    latencies.sort()
+    return {
+        "requests": len(latencies),
+        "errors": len(errors),
+        "rps": len(latencies) / elapsed,
+        "p50_ms": latencies[len(latencies) // 2] if latencies else 0.0,
+        "p99_ms": latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))] if latencies else 0.0,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="同期・非同期モードのAPIの負荷試験")
+    parser.add_argument("--clients", type=int, default=200, help="同時接続クライアント数")
+    parser.add_argument("--duration", type=float, default=20.0, help="各モードの計測時間（秒）")
+    parser.add_argument("--users", type=int, default=20, help="データを投入するユーザー数")
+    parser.add_argument("--write-ratio", type=float, default=0.05, help="書き込みリクエストの割合")
+    parser.add_argument("--modes", nargs="+", choices=["sync", "async"], default=["sync", "async"])
+    parser.add_argument("--port", type=int, default=8765)
+    args = parser.parse_args()
+
+    for mode in args.modes:
+        result = asyncio.run(run_mode(mode, args))
+        print(
+            f"{mode:5s}: {result['requests']:,} requests ({result['errors']} errors), "
+            f"{result['rps']:.1f} req/s, p50 {result['p50_ms']:.1f} ms, p99 {result['p99_ms']:.1f} ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
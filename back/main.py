@@ -6,19 +6,35 @@ Attributes:
 
 Routes:
     /api/attendance: 勤怠データのCRUD操作を提供するエンドポイント。
+    /api/attendance/export: 勤怠データと集計値を期間指定で出力するエンドポイント。
+    /api/attendance/import: CSV/NDJSON形式の勤怠データを取り込むエンドポイント。
     /api/attendance_summary: 勤怠データの集計結果を提供するエンドポイント。
     /api/holiday: 休日データのCRUD操作を提供するエンドポイント。
+    /api/dashboard: ダッシュボード表示用のデータをまとめて提供するエンドポイント。
+
+環境変数WORK_MANAGER_ASYNC_DB=1の場合、勤怠・集計・休日・ダッシュボードのエンドポイントは
+非同期のエンジンを使用する async def のハンドラのルータ（routers.async_*）で登録します。
 """
 
 from fastapi import FastAPI
-from routers import attendance, attendance_summary, holiday
+from database import USE_ASYNC_DB
+from routers import attendance, attendance_export, attendance_import, attendance_summary, dashboard, holiday
 
 app = FastAPI()
 
+# 勤怠・集計・休日・ダッシュボードのルータ（非同期モードでは async def のハンドラのルータ）
+if USE_ASYNC_DB:
+    from routers import async_attendance, async_attendance_summary, async_dashboard, async_holiday
+    crud_routers = [async_attendance.router, async_attendance_summary.router, async_holiday.router, async_dashboard.router]
+else:
+    crud_routers = [attendance.router, attendance_summary.router, holiday.router, dashboard.router]
+
 # ルータを登録
-app.include_router(attendance.router, prefix="/api")
-app.include_router(attendance_summary.router, prefix="/api")
-app.include_router(holiday.router, prefix="/api")
+# "/attendance/export"・"/attendance/import"が"/attendance/{record_date}"より先に一致するよう、先に登録する
+app.include_router(attendance_export.router, prefix="/api")
+app.include_router(attendance_import.router, prefix="/api")
+for crud_router in crud_routers:
+    app.include_router(crud_router, prefix="/api")
 
 @app.get("/")
 def read_root():
@@ -0,0 +1,48 @@
+"""
+Alembicのマイグレーション実行環境。
+
+接続先はdatabase.SQLALCHEMY_DATABASE_URL（環境変数WORK_MANAGER_DATABASE_URL）で、
+Config.set_main_option("sqlalchemy.url", ...)で指定された場合はそちらを使用します。
+比較対象のスキーマはmodels.pyのBase.metadataです（alembic revision --autogenerate / alembic check）。
+"""
+from alembic import context
+from sqlalchemy import create_engine
+
+from database import SQLALCHEMY_DATABASE_URL, engine_options
+from models import Base
+
+config = context.config
+target_metadata = Base.metadata
+
+
+def database_url() -> str:
+    return config.get_main_option("sqlalchemy.url") or SQLALCHEMY_DATABASE_URL
+
+
+def run_migrations_offline() -> None:
+    """DBに接続せず、SQLを出力する（alembic upgrade head --sql）。"""
+    context.configure(
+        url=database_url(),
+        target_metadata=target_metadata,
+        literal_binds=True,
+        render_as_batch=True,
+    )
+    with context.begin_transaction():
+        context.run_migrations()
+
+
+def run_migrations_online() -> None:
+    url = database_url()
+    connectable = create_engine(url, **engine_options(url))
+    with connectable.connect() as connection:
+        # SQLiteはALTER TABLEの機能が限られるため、テーブルの再作成（batch）でカラム・制約を変更する
+        context.configure(connection=connection, target_metadata=target_metadata, render_as_batch=True)
+        with context.begin_transaction():
+            context.run_migrations()
+    connectable.dispose()
+
+
+if context.is_offline_mode():
+    run_migrations_offline()
+else:
+    run_migrations_online()
@@ -0,0 +1,60 @@
+"""attendance_records・holidaysテーブルを作成する
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-18 00:00:00
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+revision = "0001"
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "attendance_records",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("user_id", sa.String(), server_default="default", nullable=False),
+        sa.Column("org_id", sa.String(), server_default="default", nullable=False),
+        sa.Column("date", sa.Date(), nullable=False),
+        sa.Column("start_time", sa.String(), nullable=True),
+        sa.Column("end_time", sa.String(), nullable=True),
+        sa.Column("break_minutes", sa.Integer(), nullable=True),
+        sa.Column("interruptions", sa.JSON().with_variant(postgresql.JSONB(), "postgresql"), nullable=True),
+        sa.Column("side_job_minutes", sa.Integer(), nullable=True),
+        sa.Column("updated_at", sa.DateTime(), nullable=True),
+        sa.Column("comment", sa.String(), nullable=True),
+        sa.Column("work_minutes", sa.Integer(), nullable=True),
+        sa.Column("interrupt_minutes", sa.Integer(), nullable=True),
+        sa.Column("actual_work_minutes", sa.Integer(), nullable=True),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index("ix_attendance_records_id", "attendance_records", ["id"])
+    op.create_index("ix_attendance_records_date", "attendance_records", ["date"])
+
+    op.create_table(
+        "holidays",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("org_id", sa.String(), server_default="default", nullable=False),
+        sa.Column("user_id", sa.String(), nullable=True),
+        sa.Column("date", sa.Date(), nullable=False),
+        sa.Column("name", sa.String(), nullable=True),
+        sa.Column("is_holiday", sa.Boolean(), server_default=sa.true(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index("ix_holidays_id", "holidays", ["id"])
+    op.create_index("ix_holidays_date", "holidays", ["date"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_holidays_date", table_name="holidays")
+    op.drop_index("ix_holidays_id", table_name="holidays")
+    op.drop_table("holidays")
+    op.drop_index("ix_attendance_records_date", table_name="attendance_records")
+    op.drop_index("ix_attendance_records_id", table_name="attendance_records")
+    op.drop_table("attendance_records")
@@ -0,0 +1,48 @@
+"""ユーザー・組織単位の複合インデックスと休日の部分一意インデックスを追加する
+
+勤怠データは(user_id, date)の一意インデックスで月の範囲スキャンとUPSERTの競合判定を、
+(org_id, date)のインデックスでチーム集計を行います。休日は組織共通（user_id IS NULL）と
+個人設定（user_id IS NOT NULL）でそれぞれ日付を一意にします。
+
+大きなPostgreSQLのテーブルでは書き込みを止めないよう、CREATE INDEX CONCURRENTLYで作成します。
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-18 00:00:00
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0002"
+down_revision = "0001"
+branch_labels = None
+depends_on = None
+
+
+def create_index(name, table, columns, **kwargs) -> None:
+    """インデックスを作成する（PostgreSQLではトランザクションの外でCONCURRENTLYを指定）。"""
+    if op.get_context().dialect.name == "postgresql":
+        with op.get_context().autocommit_block():
+            op.create_index(name, table, columns, postgresql_concurrently=True, **kwargs)
+    else:
+        op.create_index(name, table, columns, **kwargs)
+
+
+def upgrade() -> None:
+    create_index("ix_attendance_records_user_date", "attendance_records", ["user_id", "date"], unique=True)
+    create_index("ix_attendance_records_org_date", "attendance_records", ["org_id", "date"])
+    create_index(
+        "ix_holidays_org_date", "holidays", ["org_id", "date"], unique=True,
+        sqlite_where=sa.text("user_id IS NULL"), postgresql_where=sa.text("user_id IS NULL"),
+    )
+    create_index(
+        "ix_holidays_user_date", "holidays", ["user_id", "date"], unique=True,
+        sqlite_where=sa.text("user_id IS NOT NULL"), postgresql_where=sa.text("user_id IS NOT NULL"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_holidays_user_date", table_name="holidays")
+    op.drop_index("ix_holidays_org_date", table_name="holidays")
+    op.drop_index("ix_attendance_records_org_date", table_name="attendance_records")
+    op.drop_index("ix_attendance_records_user_date", table_name="attendance_records")
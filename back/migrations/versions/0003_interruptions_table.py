@@ -0,0 +1,116 @@
+"""中断時間をattendance_records.interruptions（JSON）から子テーブル（interruptions）へ移す
+
+中断時間を0時からの分で1行ずつ保存し、合計や時刻による絞り込みをSQLで行えるようにします。
+既存のJSONのデータは移行してから、attendance_records.interruptionsカラムを削除します。
+移行はこのリビジョンの時点のテーブル定義（sa.table）と、このファイル内の時刻の変換で行い、
+アプリケーションのモデル・モジュールは参照しません（以降の変更でこのマイグレーションの結果が変わらないようにするため）。
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-18 00:00:00
+"""
+from datetime import datetime
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+revision = "0003"
+down_revision = "0002"
+branch_labels = None
+depends_on = None
+
+# 1回のINSERTで登録する行数
+BATCH_SIZE = 1000
+
+JSON_TYPE = sa.JSON().with_variant(postgresql.JSONB(), "postgresql")
+
+attendance_records = sa.table(
+    "attendance_records",
+    sa.column("id", sa.Integer()),
+    sa.column("interruptions", JSON_TYPE),
+)
+interruptions = sa.table(
+    "interruptions",
+    sa.column("record_id", sa.Integer()),
+    sa.column("start_minute", sa.Integer()),
+    sa.column("end_minute", sa.Integer()),
+)
+
+
+def time_str_to_minutes(value) -> int:
+    """"HH:MM"形式の文字列を0時からの経過分に変換する（空・不正な値は0）。"""
+    if not value:
+        return 0
+    try:
+        parsed = datetime.strptime(value, "%H:%M")
+    except (TypeError, ValueError):
+        return 0
+    return parsed.hour * 60 + parsed.minute
+
+
+def minutes_to_time_str(minutes: int) -> str:
+    """0時からの経過分を"HH:MM"形式の文字列に変換する。"""
+    return f"{minutes // 60:02d}:{minutes % 60:02d}"
+
+
+def upgrade() -> None:
+    op.create_table(
+        "interruptions",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("record_id", sa.Integer(), nullable=False),
+        sa.Column("start_minute", sa.Integer(), nullable=False),
+        sa.Column("end_minute", sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(["record_id"], ["attendance_records.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index("ix_interruptions_record_start", "interruptions", ["record_id", "start_minute"])
+    op.create_index("ix_interruptions_start_end", "interruptions", ["start_minute", "end_minute"])
+
+    # 既存のJSONのデータを移行
+    conn = op.get_bind()
+    rows = conn.execute(
+        sa.select(attendance_records.c.id, attendance_records.c.interruptions)
+        .where(attendance_records.c.interruptions.isnot(None))
+        .order_by(attendance_records.c.id)
+    )
+    batch = []
+    for record_id, items in rows:
+        for it in items or []:
+            batch.append({
+                "record_id": record_id,
+                "start_minute": time_str_to_minutes(it.get("start")),
+                "end_minute": time_str_to_minutes(it.get("end")),
+            })
+        if len(batch) >= BATCH_SIZE:
+            conn.execute(interruptions.insert(), batch)
+            batch = []
+    if batch:
+        conn.execute(interruptions.insert(), batch)
+
+    with op.batch_alter_table("attendance_records") as batch_op:
+        batch_op.drop_column("interruptions")
+
+
+def downgrade() -> None:
+    with op.batch_alter_table("attendance_records") as batch_op:
+        batch_op.add_column(sa.Column("interruptions", JSON_TYPE, nullable=True))
+
+    # 子テーブルのデータをJSONに戻す
+    conn = op.get_bind()
+    by_record = {}
+    for record_id, start_minute, end_minute in conn.execute(
+        sa.select(interruptions.c.record_id, interruptions.c.start_minute, interruptions.c.end_minute)
+        .order_by(interruptions.c.record_id, interruptions.c.start_minute)
+    ):
+        by_record.setdefault(record_id, []).append(
+            {"start": minutes_to_time_str(start_minute), "end": minutes_to_time_str(end_minute)}
+        )
+    for record_id, items in by_record.items():
+        conn.execute(
+            attendance_records.update().where(attendance_records.c.id == record_id).values(interruptions=items)
+        )
+
+    op.drop_index("ix_interruptions_start_end", table_name="interruptions")
+    op.drop_index("ix_interruptions_record_start", table_name="interruptions")
+    op.drop_table("interruptions")
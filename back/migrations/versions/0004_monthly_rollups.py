@@ -0,0 +1,162 @@
+"""ユーザー・月ごとの集計テーブル（monthly_rollups）を作成する
+
+勤怠データ・休日の書き込み時に差分で更新する集計テーブルを作成し、
+既存の勤怠データ・休日から集計を作成します。
+集計はこのリビジョンの時点のテーブル定義（sa.table）で行い、アプリケーションのモデル・モジュールは
+参照しません（以降のモデルの変更でこのマイグレーションの結果が変わらないようにするため）。
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-18 00:00:00
+"""
+from collections import defaultdict
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0004"
+down_revision = "0003"
+branch_labels = None
+depends_on = None
+
+# 1回のINSERTで登録する行数
+BATCH_SIZE = 500
+
+attendance_records = sa.table(
+    "attendance_records",
+    sa.column("id", sa.Integer()),
+    sa.column("org_id", sa.String()),
+    sa.column("user_id", sa.String()),
+    sa.column("date", sa.Date()),
+    sa.column("start_time", sa.String()),
+    sa.column("end_time", sa.String()),
+    sa.column("work_minutes", sa.Integer()),
+    sa.column("break_minutes", sa.Integer()),
+    sa.column("interrupt_minutes", sa.Integer()),
+    sa.column("side_job_minutes", sa.Integer()),
+)
+holidays = sa.table(
+    "holidays",
+    sa.column("org_id", sa.String()),
+    sa.column("user_id", sa.String()),
+    sa.column("date", sa.Date()),
+    sa.column("is_holiday", sa.Boolean()),
+)
+monthly_rollups = sa.table(
+    "monthly_rollups",
+    sa.column("org_id", sa.String()),
+    sa.column("user_id", sa.String()),
+    sa.column("year_month", sa.String()),
+    sa.column("work_minutes", sa.Integer()),
+    sa.column("break_minutes", sa.Integer()),
+    sa.column("interrupt_minutes", sa.Integer()),
+    sa.column("side_job_minutes", sa.Integer()),
+    sa.column("actual_work_minutes", sa.Integer()),
+    sa.column("work_days", sa.Integer()),
+    sa.column("gross_days", sa.Integer()),
+    sa.column("holiday_days", sa.Integer()),
+    sa.column("record_count", sa.Integer()),
+)
+
+
+def aggregate_rows(conn):
+    """勤怠データを組織・ユーザー・月ごとに集計する（modules.attendance_aggregate.aggregate_columnsと同じ式）。"""
+    c = attendance_records.c
+    has_work = sa.and_(c.start_time.isnot(None), c.start_time != "", c.end_time.isnot(None), c.end_time != "")
+    side_job = sa.func.coalesce(c.side_job_minutes, 0)
+    year = sa.extract("year", c.date).label("year")
+    month = sa.extract("month", c.date).label("month")
+    group_by = (c.org_id, c.user_id, year, month)
+    return conn.execute(
+        sa.select(
+            *group_by,
+            sa.func.coalesce(sa.func.sum(sa.case((has_work, c.work_minutes), else_=0)), 0).label("work_minutes"),
+            sa.func.coalesce(sa.func.sum(sa.func.coalesce(c.break_minutes, 0)), 0).label("break_minutes"),
+            sa.func.coalesce(sa.func.sum(c.interrupt_minutes), 0).label("interrupt_minutes"),
+            sa.func.coalesce(sa.func.sum(side_job), 0).label("side_job_minutes"),
+            sa.func.coalesce(sa.func.sum(sa.case((has_work, 1), else_=0)), 0).label("work_days"),
+            sa.func.coalesce(sa.func.sum(sa.case((sa.or_(has_work, side_job != 0), 1), else_=0)), 0).label("gross_days"),
+            sa.func.count(c.id).label("record_count"),
+        ).group_by(*group_by).order_by(*group_by)
+    ).all()
+
+
+def holiday_day_counts(conn, users_by_org):
+    """組織・ユーザー・月ごとの有効な休日の日数を返す（同じ日付は個人設定を優先する）。"""
+    org_days = defaultdict(dict)
+    user_days = defaultdict(dict)
+    for org_id, user_id, day, is_holiday in conn.execute(
+        sa.select(holidays.c.org_id, holidays.c.user_id, holidays.c.date, holidays.c.is_holiday)
+    ):
+        if user_id is None:
+            org_days[org_id][day] = is_holiday
+        else:
+            user_days[(org_id, user_id)][day] = is_holiday
+
+    counts = defaultdict(int)
+    for org_id, user_ids in users_by_org.items():
+        for user_id in user_ids:
+            for day, is_holiday in {**org_days[org_id], **user_days[(org_id, user_id)]}.items():
+                if is_holiday:
+                    counts[(org_id, user_id, day.strftime("%Y-%m"))] += 1
+    return counts
+
+
+def upgrade() -> None:
+    op.create_table(
+        "monthly_rollups",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("org_id", sa.String(), server_default="default", nullable=False),
+        sa.Column("user_id", sa.String(), nullable=False),
+        sa.Column("year_month", sa.String(), nullable=False),
+        sa.Column("work_minutes", sa.Integer(), server_default="0", nullable=False),
+        sa.Column("break_minutes", sa.Integer(), server_default="0", nullable=False),
+        sa.Column("interrupt_minutes", sa.Integer(), server_default="0", nullable=False),
+        sa.Column("side_job_minutes", sa.Integer(), server_default="0", nullable=False),
+        sa.Column("actual_work_minutes", sa.Integer(), server_default="0", nullable=False),
+        sa.Column("work_days", sa.Integer(), server_default="0", nullable=False),
+        sa.Column("gross_days", sa.Integer(), server_default="0", nullable=False),
+        sa.Column("holiday_days", sa.Integer(), server_default="0", nullable=False),
+        sa.Column("record_count", sa.Integer(), server_default="0", nullable=False),
+        sa.Column("updated_at", sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index("ix_monthly_rollups_user_month", "monthly_rollups", ["user_id", "year_month"], unique=True)
+    op.create_index("ix_monthly_rollups_org_month", "monthly_rollups", ["org_id", "year_month"])
+
+    # 既存の勤怠データ・休日から集計を作成
+    conn = op.get_bind()
+    rows = aggregate_rows(conn)
+    users_by_org = defaultdict(set)
+    for row in rows:
+        users_by_org[row.org_id].add(row.user_id)
+    holiday_days = holiday_day_counts(conn, users_by_org)
+
+    batch = []
+    for row in rows:
+        year_month = f"{int(row.year):04d}-{int(row.month):02d}"
+        batch.append({
+            "org_id": row.org_id,
+            "user_id": row.user_id,
+            "year_month": year_month,
+            "work_minutes": int(row.work_minutes),
+            "break_minutes": int(row.break_minutes),
+            "interrupt_minutes": int(row.interrupt_minutes),
+            "side_job_minutes": int(row.side_job_minutes),
+            "actual_work_minutes": int(row.work_minutes - row.break_minutes - row.interrupt_minutes),
+            "work_days": int(row.work_days),
+            "gross_days": int(row.gross_days),
+            "holiday_days": holiday_days.get((row.org_id, row.user_id, year_month), 0),
+            "record_count": int(row.record_count),
+        })
+        if len(batch) >= BATCH_SIZE:
+            conn.execute(monthly_rollups.insert(), batch)
+            batch = []
+    if batch:
+        conn.execute(monthly_rollups.insert(), batch)
+
+
+def downgrade() -> None:
+    op.drop_index("ix_monthly_rollups_org_month", table_name="monthly_rollups")
+    op.drop_index("ix_monthly_rollups_user_month", table_name="monthly_rollups")
+    op.drop_table("monthly_rollups")
@@ -1,6 +1,9 @@
-from sqlalchemy import Column, Integer, Date, Time, JSON, DateTime, String
+from sqlalchemy import Column, Integer, Date, Time, DateTime, String, Boolean, ForeignKey, Index, text, true
+from sqlalchemy.orm import relationship
 from datetime import datetime
 from database import Base
+from modules.tenant import DEFAULT_USER_ID, DEFAULT_ORG_ID
+from modules.time_utils import minutes_to_time_str, time_str_to_minutes
 
 def now_local():
     """
@@ -17,38 +20,179 @@ class AttendanceRecord(Base):
 
     Attributes:
         id (int): 主キー（自動採番）。
-        date (Date): 勤怠対象日。
+        user_id (str): ユーザーID。
+        org_id (str): 組織ID。
+        date (Date): 勤怠対象日（ユーザーごとに一意）。
         start_time (str): 勤務開始時刻（例: "09:00"）。
         end_time (str): 勤務終了時刻（例: "18:00"）。
         break_minutes (int): 休憩時間（分単位）。
-        interruptions (JSON): 中断時間リスト（例: [{"start": "12:00", "end": "13:00"}]）。
+        interruption_rows (List[Interruption]): 中断時間（interruptionsテーブル、開始時刻順）。
+        interruptions (list): 中断時間リスト（例: [{"start": "12:00", "end": "13:00"}]）。
+            interruption_rows を"HH:MM"形式で読み書きするプロパティ。
         side_job_minutes (int): 副業時間（分単位）。
         updated_at (DateTime): 最終更新日時。
         comment (str): コメント・備考欄。
+        work_minutes (int): 勤務時間（分単位、終了-開始）。書き込み時に計算。
+        interrupt_minutes (int): 中断時間の合計（分単位）。書き込み時に計算。
+        actual_work_minutes (int): 実働時間（分単位、勤務-休憩-中断）。書き込み時に計算。
     """
     __tablename__ = "attendance_records"
+    __table_args__ = (
+        # ユーザー・日付での検索（月表示、集計）と一意制約
+        Index("ix_attendance_records_user_date", "user_id", "date", unique=True),
+        # 組織単位の集計（チーム集計）
+        Index("ix_attendance_records_org_date", "org_id", "date"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
-    date = Column(Date, index=True, nullable=False, unique=True)
+    user_id = Column(String, nullable=False, default=DEFAULT_USER_ID, server_default=DEFAULT_USER_ID)
+    org_id = Column(String, nullable=False, default=DEFAULT_ORG_ID, server_default=DEFAULT_ORG_ID)
+    date = Column(Date, index=True, nullable=False)
     start_time = Column(String, nullable=True)
     end_time = Column(String, nullable=True)
     break_minutes = Column(Integer, nullable=True)
-    interruptions = Column(JSON, nullable=True)
     side_job_minutes = Column(Integer, nullable=True)
     updated_at = Column(DateTime, nullable=True, default=now_local, onupdate=now_local)
     comment = Column(String, nullable=True)  # コメント欄
 
+    # 集計用カラム（create_or_update_attendanceで計算して保存）
+    work_minutes = Column(Integer, nullable=True)
+    interrupt_minutes = Column(Integer, nullable=True)
+    actual_work_minutes = Column(Integer, nullable=True)
+
+    # 中断時間（勤怠データの取得時にまとめて読み込み、削除時は一緒に削除する）
+    interruption_rows = relationship(
+        "Interruption",
+        lazy="selectin",
+        cascade="all, delete-orphan",
+        order_by=lambda: [Interruption.start_minute, Interruption.id],
+    )
+
+    @property
+    def interruptions(self):
+        return [
+            {"start": minutes_to_time_str(it.start_minute), "end": minutes_to_time_str(it.end_minute)}
+            for it in self.interruption_rows
+        ]
+
+    @interruptions.setter
+    def interruptions(self, value):
+        self.interruption_rows = [Interruption.from_dict(it) for it in value or []]
+
+class Interruption(Base):
+    """
+    勤務中の中断時間を管理するモデル（勤怠記録の子テーブル）。
+
+    時刻を0時からの分で保存するため、中断時間の合計（SUM(end_minute - start_minute)）や
+    時刻による絞り込み（例: 17時以降の中断）をSQLで行えます。
+
+    Attributes:
+        id (int): 主キー（自動採番）。
+        record_id (int): 勤怠記録のID（attendance_records.id）。
+        start_minute (int): 中断開始時刻（0時からの分）。
+        end_minute (int): 中断終了時刻（0時からの分）。
+    """
+    __tablename__ = "interruptions"
+    __table_args__ = (
+        # 勤怠記録ごとの取得・合計
+        Index("ix_interruptions_record_start", "record_id", "start_minute"),
+        # 時刻による絞り込み
+        Index("ix_interruptions_start_end", "start_minute", "end_minute"),
+    )
+
+    id = Column(Integer, primary_key=True)
+    record_id = Column(Integer, ForeignKey("attendance_records.id", ondelete="CASCADE"), nullable=False)
+    start_minute = Column(Integer, nullable=False)
+    end_minute = Column(Integer, nullable=False)
+
+    @classmethod
+    def from_dict(cls, data) -> "Interruption":
+        """{"start": "HH:MM", "end": "HH:MM"}（またはstart・end属性を持つオブジェクト）から作成する。"""
+        if not isinstance(data, dict):
+            data = {"start": data.start, "end": data.end}
+        return cls(start_minute=time_str_to_minutes(data.get("start")), end_minute=time_str_to_minutes(data.get("end")))
+
 class Holiday(Base):
     """
     祝日を管理するモデル。
 
+    user_idがNULLの祝日は組織共通の祝日で、user_idが設定された祝日はそのユーザー個人の設定です。
+    個人の設定は同じ日付の組織共通の祝日より優先されます（is_holiday=Falseで組織の祝日を出勤日にできる）。
+
     Attributes:
         id (int): 主キー（自動採番）。
+        org_id (str): 組織ID。
+        user_id (str): ユーザーID（NULLの場合は組織共通）。
         date (Date): 祝日の日付。
         name (str): 祝日の名前（例: "元日", "建国記念の日"）。
+        is_holiday (bool): 休日かどうか（個人設定で組織の祝日を打ち消す場合はFalse）。
+        updated_at (DateTime): 最終更新日時（ETagの計算に使用）。
     """
     __tablename__ = "holidays"
+    __table_args__ = (
+        # 組織共通の祝日は組織・日付ごとに一意
+        Index(
+            "ix_holidays_org_date", "org_id", "date", unique=True,
+            sqlite_where=text("user_id IS NULL"), postgresql_where=text("user_id IS NULL"),
+        ),
+        # 個人設定はユーザー・日付ごとに一意
+        Index(
+            "ix_holidays_user_date", "user_id", "date", unique=True,
+            sqlite_where=text("user_id IS NOT NULL"), postgresql_where=text("user_id IS NOT NULL"),
+        ),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
-    date = Column(Date, index=True, nullable=False, unique=True)
-    name = Column(String, nullable=True)  # 祝日の名前（例: "元日", "建国記念の日"）
\ No newline at end of file
+    org_id = Column(String, nullable=False, default=DEFAULT_ORG_ID, server_default=DEFAULT_ORG_ID)
+    user_id = Column(String, nullable=True)
+    date = Column(Date, index=True, nullable=False)
+    name = Column(String, nullable=True)  # 祝日の名前（例: "元日", "建国記念の日"）
+    is_holiday = Column(Boolean, nullable=False, default=True, server_default=true())
+    updated_at = Column(DateTime, nullable=True, default=now_local, onupdate=now_local)
+
+class MonthlyRollup(Base):
+    """
+    ユーザー・月ごとの勤怠の集計を管理するモデル。
+
+    勤怠データ・休日の書き込み時に、同じトランザクション内で差分を加算して更新します
+    （modules.monthly_rollup）。月別推移などは日ごとの勤怠データを読まずに、1ヶ月1行を読み取ります。
+    勤怠データのない月の行は作成しません。
+
+    Attributes:
+        id (int): 主キー（自動採番）。
+        org_id (str): 組織ID。
+        user_id (str): ユーザーID。
+        year_month (str): 対象月（"YYYY-MM"形式、ユーザーごとに一意）。
+        work_minutes (int): 勤務時間の合計（分単位、開始・終了時刻のある日のみ）。
+        break_minutes (int): 休憩時間の合計（分単位）。
+        interrupt_minutes (int): 中断時間の合計（分単位）。
+        side_job_minutes (int): 副業時間の合計（分単位）。
+        actual_work_minutes (int): 実働時間の合計（分単位、勤務-休憩-中断）。
+        work_days (int): 勤務日数（開始・終了時刻のある日）。
+        gross_days (int): 勤務日数（副業のみの日を含む）。
+        holiday_days (int): 有効な休日（組織共通の祝日＋個人設定）の日数。
+        record_count (int): 月の勤怠データの件数（0になった行は削除する）。
+        updated_at (DateTime): 最終更新日時（ETagの計算に使用）。
+    """
+    __tablename__ = "monthly_rollups"
+    __table_args__ = (
+        # ユーザーの月の範囲の取得（月別推移）と一意制約
+        Index("ix_monthly_rollups_user_month", "user_id", "year_month", unique=True),
+        # 組織共通の祝日の変更時の更新
+        Index("ix_monthly_rollups_org_month", "org_id", "year_month"),
+    )
+
+    id = Column(Integer, primary_key=True)
+    org_id = Column(String, nullable=False, default=DEFAULT_ORG_ID, server_default=DEFAULT_ORG_ID)
+    user_id = Column(String, nullable=False)
+    year_month = Column(String, nullable=False)
+    work_minutes = Column(Integer, nullable=False, default=0, server_default="0")
+    break_minutes = Column(Integer, nullable=False, default=0, server_default="0")
+    interrupt_minutes = Column(Integer, nullable=False, default=0, server_default="0")
+    side_job_minutes = Column(Integer, nullable=False, default=0, server_default="0")
+    actual_work_minutes = Column(Integer, nullable=False, default=0, server_default="0")
+    work_days = Column(Integer, nullable=False, default=0, server_default="0")
+    gross_days = Column(Integer, nullable=False, default=0, server_default="0")
+    holiday_days = Column(Integer, nullable=False, default=0, server_default="0")
+    record_count = Column(Integer, nullable=False, default=0, server_default="0")
+    updated_at = Column(DateTime, nullable=True, default=now_local, onupdate=now_local)
@@ -0,0 +1,170 @@
+"""
+このモジュールは、勤怠データの集計をSQL（SUM/COUNT）で行います。
+
+AttendanceRecordの集計カラム（work_minutes, interrupt_minutes, actual_work_minutes）を
+データベース側で合計するため、ORMオブジェクトを生成せずに集計結果を取得できます。
+SQLite・PostgreSQLのどちらでも動作する式のみを使用しています。
+interrupt_minutesカラムは書き込み時に中断時間の子テーブル（interruptions）から計算した値で、
+子テーブルを直接合計する場合はquery_interrupt_totalsを使用します。
+集計カラムが未計算の既存レコードは、事前にscripts.backfill_summary_minutesで補完してください。
+未計算のレコードがある場合は警告をログに出力し、aggregate_attendance_sqlはPython集計で計算します。
+非同期のルータ（AsyncSession）では、aggregates_statementのSELECT文を使うasync_aggregate_attendance_sqlを使用します。
+"""
+import logging
+from typing import Any, Dict, Iterable, List, Sequence
+
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import Select, and_, case, func, or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from models import AttendanceRecord, Interruption
+from modules.attendance_calc import SUMMARY_MINUTE_COLUMNS
+from modules.summary_kernel import AttendanceColumns, aggregate
+
+logger = logging.getLogger(__name__)
+
+
+def has_work_time():
+    """開始時刻と終了時刻の両方が入力されているかを判定するSQL式を返す。"""
+    return and_(
+        AttendanceRecord.start_time.isnot(None),
+        AttendanceRecord.start_time != "",
+        AttendanceRecord.end_time.isnot(None),
+        AttendanceRecord.end_time != "",
+    )
+
+
+def aggregate_expressions() -> Dict[str, Any]:
+    """集計値（分単位・日数）と未計算のレコード数を計算するSQL式を名前ごとに返す。"""
+    has_work = has_work_time()
+    side_job = func.coalesce(AttendanceRecord.side_job_minutes, 0)
+    return {
+        "work_minutes": func.coalesce(func.sum(case((has_work, AttendanceRecord.work_minutes), else_=0)), 0),
+        "break_minutes": func.coalesce(func.sum(func.coalesce(AttendanceRecord.break_minutes, 0)), 0),
+        "interrupt_minutes": func.coalesce(func.sum(AttendanceRecord.interrupt_minutes), 0),
+        "side_job_minutes": func.coalesce(func.sum(side_job), 0),
+        "work_days": func.coalesce(func.sum(case((has_work, 1), else_=0)), 0),
+        "gross_days": func.coalesce(func.sum(case((or_(has_work, side_job != 0), 1), else_=0)), 0),
+        "record_count": func.count(AttendanceRecord.id),
+        "unfilled_count": func.coalesce(func.sum(case((unfilled_summary(), 1), else_=0)), 0),
+    }
+
+
+def aggregate_columns() -> List[Any]:
+    """集計値（分単位・日数）を計算するSELECT句の式を返す。"""
+    return [expression.label(name) for name, expression in aggregate_expressions().items()]
+
+
+def unfilled_summary():
+    """集計カラムが未計算（NULL）かを判定するSQL式を返す。"""
+    return or_(*(getattr(AttendanceRecord, name).is_(None) for name in SUMMARY_MINUTE_COLUMNS))
+
+
+def aggregates_statement(*criteria, group_by: Iterable[Any] = ()) -> Select:
+    """
+    条件に一致する勤怠データを集計するSELECT文を返す。
+
+    Args:
+        *criteria: WHERE句の条件
+        group_by (iterable): GROUP BY句の式（指定した式はSELECT句の先頭にも含まれる）
+    """
+    group_by = list(group_by)
+    query = select(*group_by, *aggregate_columns()).where(*criteria)
+    if group_by:
+        query = query.group_by(*group_by).order_by(*group_by)
+    return query
+
+
+def warn_unfilled(rows: Sequence[Any]) -> Sequence[Any]:
+    """集計結果に未計算のレコードがあれば警告をログに出力し、行をそのまま返す。"""
+    unfilled = sum(int(row.unfilled_count) for row in rows)
+    if unfilled:
+        # 未計算の集計カラムはSUMで無視される（0として合計される）
+        logger.warning(
+            "集計カラムが未計算の勤怠データが %d 件あります（scripts.backfill_summary_minutesで補完してください）",
+            unfilled,
+        )
+    return rows
+
+
+def query_aggregates(db: Session, *criteria, group_by: Iterable[Any] = ()):
+    """
+    条件に一致する勤怠データを1回のクエリで集計する。
+
+    Args:
+        db (Session): データベースセッション
+        *criteria: WHERE句の条件
+        group_by (iterable): GROUP BY句の式（指定した式はSELECT句の先頭にも含まれる）
+
+    Returns:
+        list: 集計結果の行（work_minutes, break_minutes, ..., gross_days, record_count,
+            unfilled_count（集計カラムが未計算のレコード数）を持つRow）
+    """
+    return warn_unfilled(db.execute(aggregates_statement(*criteria, group_by=group_by)).all())
+
+
+def query_interrupt_totals(db: Session, *criteria, group_by: Iterable[Any] = ()):
+    """
+    条件に一致する勤怠データの中断時間を、子テーブル（interruptions）とのJOINで合計する。
+
+    Args:
+        db (Session): データベースセッション
+        *criteria: WHERE句の条件（AttendanceRecord・Interruptionのカラムを使用可、
+            例: 17時以降の中断は Interruption.start_minute >= 17 * 60）
+        group_by (iterable): GROUP BY句の式（指定した式はSELECT句の先頭にも含まれる）
+
+    Returns:
+        list: 集計結果の行（interrupt_minutes, interruptions_countを持つRow）
+    """
+    group_by = list(group_by)
+    query = db.query(
+        *group_by,
+        func.coalesce(func.sum(Interruption.end_minute - Interruption.start_minute), 0).label("interrupt_minutes"),
+        func.count(Interruption.id).label("interruptions_count"),
+    ).select_from(AttendanceRecord)\
+        .join(Interruption, Interruption.record_id == AttendanceRecord.id)\
+        .filter(*criteria)
+    if group_by:
+        query = query.group_by(*group_by).order_by(*group_by)
+    return query.all()
+
+
+def to_monthly_aggregate(row) -> Dict[str, Any]:
+    """集計結果の行をMonthlyAggregateSummary形式（時間単位）の辞書に変換する。"""
+    work_total_hours = row.work_minutes / 60
+    break_total_hours = row.break_minutes / 60
+    interrupt_total_hours = row.interrupt_minutes / 60
+    side_job_total_hours = row.side_job_minutes / 60
+    return {
+        "work_total_hours": work_total_hours,
+        "break_total_hours": break_total_hours,
+        "interrupt_total_hours": interrupt_total_hours,
+        "side_job_total_hours": side_job_total_hours,
+        "gross_total_hours": work_total_hours + side_job_total_hours,
+        "actual_work_hours": work_total_hours - break_total_hours - interrupt_total_hours,
+        "work_days": int(row.work_days),
+        "gross_days": int(row.gross_days),
+    }
+
+
+def aggregate_attendance_sql(db: Session, *criteria) -> Dict[str, Any]:
+    """
+    条件に一致する勤怠データを集計し、MonthlyAggregateSummary形式の辞書で返す。
+
+    集計カラムが未計算のレコードがある場合は、勤怠データを読み込んでPython集計で計算する。
+    """
+    row = query_aggregates(db, *criteria)[0]
+    if row.unfilled_count:
+        records = db.scalars(select(AttendanceRecord).where(*criteria)).all()
+        return aggregate(AttendanceColumns.from_records(records))
+    return to_monthly_aggregate(row)
+
+
+async def async_aggregate_attendance_sql(db: AsyncSession, *criteria) -> Dict[str, Any]:
+    """aggregate_attendance_sqlの非同期版（Python集計はスレッドプールで計算する）。"""
+    row = warn_unfilled((await db.execute(aggregates_statement(*criteria))).all())[0]
+    if row.unfilled_count:
+        records = (await db.scalars(select(AttendanceRecord).where(*criteria))).all()
+        return await run_in_threadpool(lambda: aggregate(AttendanceColumns.from_records(records)))
+    return to_monthly_aggregate(row)
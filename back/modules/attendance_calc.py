@@ -0,0 +1,55 @@
+"""
+このモジュールは、勤怠レコードの集計用の値（分単位）を計算します。
+
+書き込み時に計算した値をAttendanceRecordの集計カラムへ保存しておくことで、
+読み取り時に"HH:MM"文字列や中断リストを毎回解析せずに済むようにします。
+"""
+from typing import Any, Dict, Iterable, Optional
+
+from modules.time_utils import time_str_to_minutes
+
+SUMMARY_MINUTE_COLUMNS = ("work_minutes", "interrupt_minutes", "actual_work_minutes")
+
+
+def calc_summary_minutes(
+    start_time: Optional[str],
+    end_time: Optional[str],
+    break_minutes: Optional[int],
+    interruptions: Optional[Iterable[Dict[str, Any]]],
+) -> Dict[str, int]:
+    """
+    勤怠の入力値から集計用の値（分単位）を計算する。
+
+    Args:
+        start_time (str or None): 勤務開始時刻（"HH:MM"形式）
+        end_time (str or None): 勤務終了時刻（"HH:MM"形式）
+        break_minutes (int or None): 休憩時間（分）
+        interruptions (list or None): 中断時間リスト（[{"start": "HH:MM", "end": "HH:MM"}, ...]）
+
+    Returns:
+        dict: work_minutes（勤務）、interrupt_minutes（中断）、actual_work_minutes（実働）
+    """
+    # 開始と終了の両方が入力されている場合のみ勤務時間を計算
+    if start_time and end_time:
+        work_minutes = time_str_to_minutes(end_time) - time_str_to_minutes(start_time)
+    else:
+        work_minutes = 0
+
+    interrupt_minutes = 0
+    for it in interruptions or []:
+        interrupt_minutes += time_str_to_minutes(it.get("end")) - time_str_to_minutes(it.get("start"))
+
+    return {
+        "work_minutes": work_minutes,
+        "interrupt_minutes": interrupt_minutes,
+        "actual_work_minutes": work_minutes - int(break_minutes or 0) - interrupt_minutes,
+    }
+
+
+def apply_summary_minutes(record) -> None:
+    """AttendanceRecordの入力値から集計カラムを計算して設定する。"""
+    values = calc_summary_minutes(
+        record.start_time, record.end_time, record.break_minutes, record.interruptions
+    )
+    for key, value in values.items():
+        setattr(record, key, value)
@@ -0,0 +1,149 @@
+"""
+このモジュールは、勤怠データの一括登録・更新（UPSERT）を提供します。
+
+SQLite・PostgreSQLでは「INSERT ... ON CONFLICT(user_id, date) DO UPDATE」を使い、
+複数日分のデータを1つのトランザクション内でまとめて書き込みます。
+中断時間（interruptionsテーブル）は対象の勤怠記録の分を削除してから、まとめて登録し直します。
+月の集計（monthly_rollupsテーブル）には、既存のデータとの差分を同じトランザクション内で反映します。
+"""
+from datetime import date
+from typing import Any, Dict, List, Sequence, Tuple
+
+from sqlalchemy import delete, insert, select
+from sqlalchemy.orm import Session
+
+from models import AttendanceRecord, Interruption, now_local
+from modules.time_utils import time_str_to_minutes
+from modules.attendance_calc import calc_summary_minutes
+from modules.monthly_rollup import SOURCE_COLUMNS, apply_record_changes, record_contribution
+from modules.tenant import Tenant
+from modules.upsert import dialect_insert
+
+# 1回のSQLで扱う行数（SQLiteのバインド変数の上限を超えないようにする）
+CHUNK_SIZE = 500
+
+# 登録・更新の対象とする入力カラム
+INPUT_COLUMNS = ("start_time", "end_time", "break_minutes", "interruptions", "side_job_minutes", "comment")
+
+
+def replace_interruptions(db: Session, user_id: str, rows: Sequence[Dict[str, Any]]) -> None:
+    """
+    勤怠記録（rowsの日付）の中断時間を、rowsの"interruptions"で置き換える（コミットは呼び出し側で行う）。
+
+    Args:
+        db (Session): データベースセッション（Connectionも可）
+        user_id (str): 勤怠記録のユーザーID
+        rows (list): "date"と"interruptions"（[{"start": "HH:MM", "end": "HH:MM"}, ...]）を持つ辞書のリスト
+    """
+    dates = [row["date"] for row in rows]
+    record_ids = {}
+    for i in range(0, len(dates), CHUNK_SIZE):
+        record_ids.update(db.execute(
+            select(AttendanceRecord.date, AttendanceRecord.id).where(
+                AttendanceRecord.user_id == user_id,
+                AttendanceRecord.date.in_(dates[i:i + CHUNK_SIZE]),
+            )
+        ).all())
+
+    ids = list(record_ids.values())
+    for i in range(0, len(ids), CHUNK_SIZE):
+        db.execute(delete(Interruption).where(Interruption.record_id.in_(ids[i:i + CHUNK_SIZE])))
+
+    values = [
+        {
+            "record_id": record_ids[row["date"]],
+            "start_minute": time_str_to_minutes(it.get("start")),
+            "end_minute": time_str_to_minutes(it.get("end")),
+        }
+        for row in rows
+        for it in row["interruptions"] or []
+    ]
+    for i in range(0, len(values), CHUNK_SIZE):
+        db.execute(insert(Interruption), values[i:i + CHUNK_SIZE])
+
+
+def build_row(tenant: Tenant, record_date: date, data: Dict[str, Any]) -> Dict[str, Any]:
+    """入力データから集計カラムを含むattendance_recordsの1行分の値を作成する。"""
+    row = {key: data.get(key) for key in INPUT_COLUMNS}
+    row.update(calc_summary_minutes(
+        row["start_time"], row["end_time"], row["break_minutes"], row["interruptions"]
+    ))
+    row["user_id"] = tenant.user_id
+    row["org_id"] = tenant.org_id
+    row["date"] = record_date
+    row["updated_at"] = now_local()
+    return row
+
+
+def upsert_attendance(db: Session, tenant: Tenant, items: Sequence[Tuple[date, Dict[str, Any]]]) -> List[Dict[str, Any]]:
+    """
+    複数日分の勤怠データを登録・更新する（コミットは呼び出し側で行う）。
+
+    同じ日付が複数含まれる場合は後のデータを採用し、それ以前のものは"skipped"とする。
+
+    Args:
+        db (Session): データベースセッション
+        tenant (Tenant): 書き込み先の利用者
+        items (list): (日付, 入力データの辞書)のリスト
+
+    Returns:
+        list: 入力順の処理結果（{"date": date, "status": "created" | "updated" | "skipped"}）
+    """
+    if not items:
+        return []
+
+    # 同じ日付は最後のデータを採用
+    last_index = {record_date: i for i, (record_date, _) in enumerate(items)}
+    rows = [build_row(tenant, record_date, data) for i, (record_date, data) in enumerate(items) if last_index[record_date] == i]
+    dates = [row["date"] for row in rows]
+
+    # 既存のデータの集計値を取得（結果の"created"/"updated"の判定と、月の集計の差分の計算用）
+    existing = {}
+    source_columns = [getattr(AttendanceRecord, name) for name in SOURCE_COLUMNS]
+    for i in range(0, len(dates), CHUNK_SIZE):
+        existing.update(
+            (row.date, record_contribution(row)) for row in db.query(AttendanceRecord.date, *source_columns).filter(
+                AttendanceRecord.user_id == tenant.user_id,
+                AttendanceRecord.date.in_(dates[i:i + CHUNK_SIZE]),
+            )
+        )
+
+    insert_stmt = dialect_insert(db)
+    if insert_stmt is not None:
+        table = AttendanceRecord.__table__
+        # 中断時間は子テーブルに書き込むため、attendance_recordsの行からは除く
+        record_rows = [{key: value for key, value in row.items() if key != "interruptions"} for row in rows]
+        stmt = insert_stmt(table)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[table.c.user_id, table.c.date],
+            set_={key: stmt.excluded[key] for key in record_rows[0] if key not in ("user_id", "date")},
+        )
+        for i in range(0, len(record_rows), CHUNK_SIZE):
+            db.execute(stmt, record_rows[i:i + CHUNK_SIZE])
+        replace_interruptions(db, tenant.user_id, rows)
+    else:
+        # ON CONFLICTに対応していないDBは1行ずつ登録・更新する
+        records = {
+            r.date: r for r in db.query(AttendanceRecord).filter(
+                AttendanceRecord.user_id == tenant.user_id, AttendanceRecord.date.in_(list(existing))
+            )
+        }
+        for row in rows:
+            record = records.get(row["date"])
+            if record is None:
+                db.add(AttendanceRecord(**row))
+            else:
+                for key, value in row.items():
+                    setattr(record, key, value)
+        db.flush()
+
+    apply_record_changes(db, tenant, [(row["date"], existing.get(row["date"]), record_contribution(row)) for row in rows])
+
+    return [
+        {
+            "date": record_date,
+            "status": "skipped" if last_index[record_date] != i
+            else "updated" if record_date in existing else "created",
+        }
+        for i, (record_date, _) in enumerate(items)
+    ]
@@ -0,0 +1,115 @@
+"""
+このモジュールは、取り込み（インポート）する勤怠データの検証を行います。
+
+検証ルールはフロントエンドの入力フォーム（show_attendance_form）と同じです。
+- 開始時刻・終了時刻は"HH:MM"形式で、開始時刻は終了時刻より後にできない
+- 中断時間は"HH:MM"形式で、開始時刻は終了時刻より前でなければならない
+- 休憩時間・副業時間は0以上の整数
+"""
+import json
+from datetime import date, datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+from pydantic import ValidationError
+
+from schemas import AttendanceCreate
+
+
+class AttendanceValidationError(ValueError):
+    """勤怠データの検証エラー。"""
+
+
+def _is_blank(value: Any) -> bool:
+    return value is None or (isinstance(value, str) and not value.strip())
+
+
+def parse_hhmm(value: Any, field: str) -> Optional[str]:
+    """"HH:MM"形式の時刻を検証して正規化した文字列を返す（未入力はNone）。"""
+    if _is_blank(value):
+        return None
+    try:
+        return datetime.strptime(str(value).strip(), "%H:%M").strftime("%H:%M")
+    except ValueError:
+        raise AttendanceValidationError(f"{field}: invalid time '{value}', expected HH:MM")
+
+
+def parse_minutes(value: Any, field: str) -> int:
+    """0以上の分数を検証して返す（未入力は0）。"""
+    if _is_blank(value):
+        return 0
+    try:
+        minutes = int(value)
+    except (TypeError, ValueError):
+        raise AttendanceValidationError(f"{field}: invalid integer '{value}'")
+    if minutes < 0:
+        raise AttendanceValidationError(f"{field}: must be 0 or greater")
+    return minutes
+
+
+def parse_interruptions(value: Any) -> List[Dict[str, str]]:
+    """中断時間リスト（リストまたはJSON文字列）を検証して返す。"""
+    if _is_blank(value):
+        return []
+    if isinstance(value, str):
+        try:
+            value = json.loads(value)
+        except ValueError:
+            raise AttendanceValidationError("interruptions: invalid JSON")
+    if not isinstance(value, list):
+        raise AttendanceValidationError("interruptions: must be a list")
+
+    result = []
+    for i, it in enumerate(value, start=1):
+        if not isinstance(it, dict):
+            raise AttendanceValidationError(f"interruptions[{i}]: must be an object with start and end")
+        start = parse_hhmm(it.get("start"), f"interruptions[{i}].start")
+        end = parse_hhmm(it.get("end"), f"interruptions[{i}].end")
+        if start is None or end is None:
+            raise AttendanceValidationError(f"interruptions[{i}]: start and end are required")
+        if start >= end:
+            raise AttendanceValidationError(f"interruptions[{i}]: start must be earlier than end")
+        result.append({"start": start, "end": end})
+    return result
+
+
+def validate_attendance_row(row: Dict[str, Any]) -> Tuple[date, Dict[str, Any]]:
+    """
+    取り込み1行分の勤怠データを検証する。
+
+    Args:
+        row (dict): 1行分のデータ（date, start_time, end_time, break_minutes,
+            interruptions, side_job_minutes, comment。その他のキーは無視）
+
+    Returns:
+        tuple: (日付, AttendanceCreate形式の入力データの辞書)
+
+    Raises:
+        AttendanceValidationError: 検証に失敗した場合
+    """
+    if _is_blank(row.get("date")):
+        raise AttendanceValidationError("date: required")
+    try:
+        record_date = date.fromisoformat(str(row["date"]).strip())
+    except ValueError:
+        raise AttendanceValidationError(f"date: invalid date '{row['date']}', expected YYYY-MM-DD")
+
+    start_time = parse_hhmm(row.get("start_time"), "start_time")
+    end_time = parse_hhmm(row.get("end_time"), "end_time")
+    if (start_time is None) != (end_time is None):
+        raise AttendanceValidationError("start_time and end_time must be given together")
+    if start_time is not None and start_time > end_time:
+        raise AttendanceValidationError("start_time must not be later than end_time")
+
+    comment = row.get("comment")
+    try:
+        data = AttendanceCreate(
+            start_time=start_time,
+            end_time=end_time,
+            break_minutes=parse_minutes(row.get("break_minutes"), "break_minutes"),
+            interruptions=parse_interruptions(row.get("interruptions")),
+            side_job_minutes=parse_minutes(row.get("side_job_minutes"), "side_job_minutes"),
+            comment=None if _is_blank(comment) else str(comment),
+        )
+    except ValidationError as e:
+        raise AttendanceValidationError(str(e))
+    return record_date, data.dict(exclude={"updated_at"})
@@ -0,0 +1,159 @@
+"""
+このモジュールは、利用者ごとの営業日カレンダー（平日かつ休日でない日）を提供します。
+
+利用者の有効な休日（組織共通の祝日＋個人設定）を日付順のリストとしてメモリに保持し、
+期間内の休日数は二分探索（bisect）で、平日数は月曜始まりの週の周期から計算するため、
+営業日数は期間の長さによらずO(log n)で求められます（nは休日の件数）。
+カレンダーは利用者ごとに初回の使用時に読み込み、休日が書き込まれたときにinvalidate()で破棄します。
+プロセス内のキャッシュのため、複数プロセスで動かす場合はsummary_cacheと同様に注意してください。
+"""
+from bisect import bisect_left
+from datetime import date
+from threading import Lock
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from models import Holiday
+from modules.date_filters import month_range
+from modules.holidays import async_get_effective_holidays, get_effective_holidays
+from modules.tenant import Tenant
+
+
+def weekdays_before(ordinal: int) -> int:
+    """
+    0001-01-01（月曜日）からordinalの前日までの平日（月〜金）の日数を返す。
+
+    Args:
+        ordinal (int): date.toordinal()の値
+    """
+    days = ordinal - 1
+    return days // 7 * 5 + min(days % 7, 5)
+
+
+class BusinessCalendar:
+    """
+    休日の日付順のインデックスを持つ営業日カレンダー。
+
+    期間はいずれもstart以上end未満（date_filters.date_range_filterと同じ）で指定します。
+    """
+
+    def __init__(self, holiday_dates: Iterable[date]):
+        self._holidays: List[int] = sorted({d.toordinal() for d in holiday_dates})
+        # 営業日数から差し引く休日（平日の休日のみ）
+        self._weekday_holidays: List[int] = [o for o in self._holidays if (o - 1) % 7 < 5]
+
+    @staticmethod
+    def _count(ordinals: List[int], start: date, end: date) -> int:
+        return bisect_left(ordinals, end.toordinal()) - bisect_left(ordinals, start.toordinal())
+
+    def is_holiday(self, day: date) -> bool:
+        """休日（曜日によらない）かどうかを返す。"""
+        ordinal = day.toordinal()
+        i = bisect_left(self._holidays, ordinal)
+        return i < len(self._holidays) and self._holidays[i] == ordinal
+
+    def is_business_day(self, day: date) -> bool:
+        """営業日（平日かつ休日でない日）かどうかを返す。"""
+        return day.weekday() < 5 and not self.is_holiday(day)
+
+    def holiday_count(self, start: date, end: date) -> int:
+        """期間内の休日（土日の休日を含む）の日数を返す。"""
+        return self._count(self._holidays, start, end)
+
+    def holidays_between(self, start: date, end: date) -> List[date]:
+        """期間内の休日を日付順に返す。"""
+        lo = bisect_left(self._holidays, start.toordinal())
+        hi = bisect_left(self._holidays, end.toordinal())
+        return [date.fromordinal(o) for o in self._holidays[lo:hi]]
+
+    def business_days(self, start: date, end: date) -> int:
+        """期間内の営業日数を返す。"""
+        if end <= start:
+            return 0
+        weekdays = weekdays_before(end.toordinal()) - weekdays_before(start.toordinal())
+        return weekdays - self._count(self._weekday_holidays, start, end)
+
+    def business_day_mask(self, start: date, end: date) -> np.ndarray:
+        """
+        期間内の日ごとの営業日かどうかを返す（business_daysと同じ平日・休日のインデックスから作成）。
+
+        Returns:
+            np.ndarray: 長さ(end - start).daysのbool配列（要素の合計はbusiness_days(start, end)と一致）
+        """
+        if end <= start:
+            return np.zeros(0, dtype=bool)
+        ordinals = np.arange(start.toordinal(), end.toordinal())
+        lo = bisect_left(self._weekday_holidays, start.toordinal())
+        hi = bisect_left(self._weekday_holidays, end.toordinal())
+        mask = (ordinals - 1) % 7 < 5
+        mask[np.array(self._weekday_holidays[lo:hi], dtype=np.int64) - start.toordinal()] = False
+        return mask
+
+    def remaining_business_days(self, year_month: str, as_of: date) -> int:
+        """
+        指定月のas_of（この日を含む）から月末までの営業日数を返す。
+
+        as_ofが月初より前の場合は月全体、月末より後の場合は0を返す。
+
+        Raises:
+            ValueError: year_monthの形式が不正な場合
+        """
+        first, next_first = month_range(year_month)
+        return self.business_days(max(first, as_of), next_first)
+
+
+# 利用者（org_id, user_id）ごとのカレンダー
+_calendars: Dict[Tuple[str, str], BusinessCalendar] = {}
+_generation = 0
+_lock = Lock()
+
+
+def _cached(tenant: Tenant) -> Tuple[Optional[BusinessCalendar], int]:
+    """(キャッシュ済みのカレンダーまたはNone, 現在の世代番号)を返す。"""
+    with _lock:
+        return _calendars.get((tenant.org_id, tenant.user_id)), _generation
+
+
+def _store(tenant: Tenant, holidays: Iterable[Holiday], generation: int) -> BusinessCalendar:
+    calendar = BusinessCalendar(holiday.date for holiday in holidays)
+    with _lock:
+        # 読み込み中に休日が書き込まれた場合は、古い可能性があるため保存しない
+        if generation == _generation:
+            _calendars[(tenant.org_id, tenant.user_id)] = calendar
+    return calendar
+
+
+def get_calendar(db: Session, tenant: Tenant) -> BusinessCalendar:
+    """利用者のカレンダーを返す（キャッシュにない場合は有効な休日を全て読み込む）。"""
+    calendar, generation = _cached(tenant)
+    if calendar is not None:
+        return calendar
+    return _store(tenant, get_effective_holidays(db, tenant), generation)
+
+
+async def async_get_calendar(db: AsyncSession, tenant: Tenant) -> BusinessCalendar:
+    """get_calendarの非同期版。"""
+    calendar, generation = _cached(tenant)
+    if calendar is not None:
+        return calendar
+    return _store(tenant, await async_get_effective_holidays(db, tenant), generation)
+
+
+def invalidate(org_id: str, user_id: Optional[str] = None) -> None:
+    """利用者のカレンダーを破棄する（user_idを省略した場合は組織内の全ユーザー）。"""
+    global _generation
+    with _lock:
+        _generation += 1
+        for key in [k for k in _calendars if k[0] == org_id and (user_id is None or k[1] == user_id)]:
+            del _calendars[key]
+
+
+def clear() -> None:
+    """全てのカレンダーを破棄する。"""
+    global _generation
+    with _lock:
+        _generation += 1
+        _calendars.clear()
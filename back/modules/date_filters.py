@@ -0,0 +1,55 @@
+"""
+このモジュールは、日付範囲による絞り込み条件を提供します。
+
+日付カラムを関数（extractなど）で包まずに「date >= 月初 AND date < 翌月初」の
+範囲条件で絞り込むことで、dateカラムのインデックスを使った範囲スキャンにします。
+"""
+from datetime import date, timedelta
+from typing import List, Tuple
+
+from sqlalchemy import and_
+
+
+def month_range(year_month: str) -> Tuple[date, date]:
+    """
+    "YYYY-MM"形式の文字列から月初日と翌月初日を返す。
+
+    Args:
+        year_month (str): 対象年月（"YYYY-MM"形式）
+
+    Returns:
+        tuple: (月初日, 翌月初日)
+
+    Raises:
+        ValueError: 形式が不正な場合
+    """
+    year, month = map(int, year_month.split("-"))
+    first = date(year, month, 1)
+    next_first = date(year + 1, 1, 1) if month == 12 else date(year, month + 1, 1)
+    return first, next_first
+
+
+def add_months(month_first: date, months: int) -> date:
+    """月初日にmonthsヶ月を加算した月の月初日を返す（負の値で過去に遡る）。"""
+    index = month_first.year * 12 + (month_first.month - 1) + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def dates_between(start: date, end: date) -> List[date]:
+    """start以上end未満の日付リストを返す。"""
+    return [start + timedelta(days=i) for i in range((end - start).days)]
+
+
+def date_range_filter(column, start: date, end: date):
+    """start以上end未満の範囲条件を返す。"""
+    return and_(column >= start, column < end)
+
+
+def month_filter(column, year_month: str):
+    """
+    指定月の範囲条件（月初以上、翌月初未満）を返す。
+
+    Raises:
+        ValueError: year_monthの形式が不正な場合
+    """
+    return date_range_filter(column, *month_range(year_month))
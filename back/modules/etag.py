@@ -0,0 +1,65 @@
+"""
+このモジュールは、読み取りAPIのETagと条件付きGET（If-None-Match → 304）を提供します。
+
+ETagは対象範囲の行数とupdated_atの最大値から作成するため、集計結果を計算する前に
+インデックスだけで判定できます。更新では updated_at が、削除では行数が変わるため、
+範囲内のどの変更でもETagが変わります。
+非同期のルータ（AsyncSession）ではasync_range_validatorで同じ検証子を作成します。
+"""
+import hashlib
+from typing import Any, Optional
+
+from fastapi import Request, Response
+from sqlalchemy import Select, func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+
+def validator_statement(model: Any, *criteria) -> Select:
+    """条件に一致する行の件数とupdated_atの最大値を求めるSELECT文を返す。"""
+    return select(func.count(model.id), func.max(model.updated_at)).where(*criteria)
+
+
+def format_validator(row: Any) -> str:
+    """validator_statementの結果の行を"件数:最大値"の文字列にする。"""
+    count, last_updated = row
+    return f"{count}:{last_updated.isoformat() if last_updated else ''}"
+
+
+def range_validator(db: Session, model: Any, *criteria) -> str:
+    """条件に一致する行の件数とupdated_atの最大値を"件数:最大値"の文字列で返す。"""
+    return format_validator(db.execute(validator_statement(model, *criteria)).one())
+
+
+async def async_range_validator(db: AsyncSession, model: Any, *criteria) -> str:
+    """range_validatorの非同期版。"""
+    return format_validator((await db.execute(validator_statement(model, *criteria))).one())
+
+
+def make_etag(*parts: Any) -> str:
+    """検証子（validator）などの値からETag（弱いETag）を作成する。"""
+    digest = hashlib.sha1("|".join(str(p) for p in parts).encode("utf-8")).hexdigest()
+    return f'W/"{digest[:20]}"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """If-None-Matchヘッダーの値にETagが含まれるかを判定する（弱い比較）。"""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    opaque = etag.removeprefix("W/")
+    return any(tag.strip().removeprefix("W/") == opaque for tag in if_none_match.split(","))
+
+
+def not_modified(request: Request, response: Response, etag: str) -> Optional[Response]:
+    """
+    レスポンスにETagを設定し、If-None-Matchが一致する場合は304のレスポンスを返す。
+
+    Returns:
+        Response or None: 304のレスポンス（一致しない場合はNone）
+    """
+    response.headers["ETag"] = etag
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers={"ETag": etag})
+    return None
@@ -0,0 +1,268 @@
+"""
+このモジュールは、勤務時間の予測（予測表と累積推移）を1か所で計算します。
+
+勤務日（開始・終了時刻の両方が入力されている日）はその実働時間、勤務日でない営業日
+（平日かつ休日でない日）は予測方式（ForecastStrategy）が曜日ごとに見積もった時間、
+土日・休日は0時間として、期間内の日を配列でまとめて計算します。
+予測表（forecast）と累積推移（series）は同じ計算結果から作成するため、両者は必ず一致します。
+
+予測方式は環境変数で既定を指定し、APIのstrategyパラメータで切り替えられます。
+
+    WORK_MANAGER_FORECAST_STRATEGY        既定の予測方式（fixed / trailing / ewma、既定: fixed）
+    WORK_MANAGER_FORECAST_HOURS           fixedの1日の時間、過去の実績がない曜日の時間（既定: 8）
+    WORK_MANAGER_FORECAST_TRAILING_WEEKS  trailingで平均する直近の週数（既定: 4）
+    WORK_MANAGER_FORECAST_EWMA_ALPHA      ewmaの平滑化係数（0〜1、大きいほど直近を重視、既定: 0.3）
+    WORK_MANAGER_FORECAST_EWMA_WEEKS      ewmaで使う直近の週数（既定: 12）
+"""
+import os
+from datetime import date, timedelta
+from typing import Any, Dict, Iterable, List, Literal, Optional, Tuple
+
+import numpy as np
+
+from modules.business_calendar import BusinessCalendar
+from modules.summary_kernel import AttendanceColumns, day_minutes
+
+DEFAULT_STRATEGY = os.getenv("WORK_MANAGER_FORECAST_STRATEGY", "fixed")
+FIXED_HOURS = float(os.getenv("WORK_MANAGER_FORECAST_HOURS", "8"))
+TRAILING_WEEKS = int(os.getenv("WORK_MANAGER_FORECAST_TRAILING_WEEKS", "4"))
+EWMA_ALPHA = float(os.getenv("WORK_MANAGER_FORECAST_EWMA_ALPHA", "0.3"))
+EWMA_WEEKS = int(os.getenv("WORK_MANAGER_FORECAST_EWMA_WEEKS", "12"))
+
+# 予測が参照する過去の実績の最大日数（勤怠データの書き込み時に、後続の月の予測のキャッシュも破棄する）
+HISTORY_DAYS = max(TRAILING_WEEKS, EWMA_WEEKS) * 7
+
+
+def weekdays_of(days: np.ndarray) -> np.ndarray:
+    """datetime64[D]の配列の曜日（月曜日=0〜日曜日=6）を返す（1970-01-01は木曜日）。"""
+    return (days.astype(np.int64) + 3) % 7
+
+
+def registered_hours(records: Iterable[Any]) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    勤怠データの日付・実働時間・勤務日かどうかを配列で返す。
+
+    Returns:
+        tuple: (日付（datetime64[D]）, 実働時間（時間）, 勤務日（開始・終了時刻のある日）か)
+    """
+    records = list(records)
+    minutes = day_minutes(AttendanceColumns.from_records(records))
+    days = np.array([record.date for record in records], dtype="datetime64[D]")
+    return days, minutes["actual_work_minutes"] / 60, minutes["has_work"]
+
+
+class ForecastStrategy:
+    """
+    勤務日でない営業日の勤務時間を曜日ごとに見積もる予測方式のインターフェース。
+
+    Attributes:
+        name (str): APIのstrategyパラメータで指定する名前
+        history_weeks (int): 見積もりに使う予測期間の直前の週数（0は過去の実績を使わない）
+    """
+    name = ""
+    history_weeks = 0
+
+    @property
+    def cache_key(self) -> str:
+        """ETag・キャッシュのキーに含める、方式とパラメータを表す文字列。"""
+        return self.name
+
+    @property
+    def label(self) -> str:
+        """画面に表示する、方式とパラメータの説明。"""
+        raise NotImplementedError
+
+    def expected_hours(self, days: np.ndarray, hours: np.ndarray, start: date) -> np.ndarray:
+        """
+        曜日ごと（月曜日=0〜日曜日=6）の見積もり時間を返す。
+
+        Args:
+            days (np.ndarray): startより前の勤務日の日付（datetime64[D]）
+            hours (np.ndarray): 勤務日の実働時間（時間）
+            start (date): 予測期間の開始日
+
+        Returns:
+            np.ndarray: 長さ7の配列
+        """
+        raise NotImplementedError
+
+    def _window(self, days: np.ndarray, hours: np.ndarray, start: date) -> Tuple[np.ndarray, np.ndarray]:
+        """直近history_weeks週の勤務日に絞り込む。"""
+        first = np.datetime64(start - timedelta(weeks=self.history_weeks))
+        mask = (days >= first) & (days < np.datetime64(start))
+        return days[mask], hours[mask]
+
+    @staticmethod
+    def _weighted_mean(weekdays: np.ndarray, values: np.ndarray, weights: np.ndarray) -> np.ndarray:
+        """曜日ごとの加重平均を返す（実績のない曜日はFIXED_HOURS）。"""
+        total = np.bincount(weekdays, weights=values * weights, minlength=7)
+        weight = np.bincount(weekdays, weights=weights, minlength=7)
+        return np.where(weight > 0, total / np.where(weight > 0, weight, 1), FIXED_HOURS)
+
+
+class FixedHours(ForecastStrategy):
+    """全ての営業日を一定の時間（既定は8時間）と見積もる。"""
+    name = "fixed"
+
+    def __init__(self, hours: float = FIXED_HOURS):
+        self.hours = hours
+
+    @property
+    def cache_key(self) -> str:
+        return f"{self.name}:{self.hours}"
+
+    @property
+    def label(self) -> str:
+        return f"固定（1日{self.hours:g}時間）"
+
+    def expected_hours(self, days: np.ndarray, hours: np.ndarray, start: date) -> np.ndarray:
+        return np.full(7, self.hours, dtype=float)
+
+
+class TrailingWeekdayAverage(ForecastStrategy):
+    """直近N週の同じ曜日の勤務日の実働時間の平均で見積もる。"""
+    name = "trailing"
+
+    def __init__(self, weeks: int = TRAILING_WEEKS):
+        self.history_weeks = weeks
+
+    @property
+    def cache_key(self) -> str:
+        return f"{self.name}:{self.history_weeks}"
+
+    @property
+    def label(self) -> str:
+        return f"直近{self.history_weeks}週の曜日別平均"
+
+    def expected_hours(self, days: np.ndarray, hours: np.ndarray, start: date) -> np.ndarray:
+        days, hours = self._window(days, hours, start)
+        return self._weighted_mean(weekdays_of(days), hours, np.ones(len(hours)))
+
+
+class WeekdayEwma(ForecastStrategy):
+    """同じ曜日の勤務日の実働時間の指数加重平均（直近の週ほど重い）で見積もる。"""
+    name = "ewma"
+
+    def __init__(self, alpha: float = EWMA_ALPHA, weeks: int = EWMA_WEEKS):
+        self.alpha = alpha
+        self.history_weeks = weeks
+
+    @property
+    def cache_key(self) -> str:
+        return f"{self.name}:{self.alpha}:{self.history_weeks}"
+
+    @property
+    def label(self) -> str:
+        return f"直近{self.history_weeks}週の曜日別の指数加重平均"
+
+    def expected_hours(self, days: np.ndarray, hours: np.ndarray, start: date) -> np.ndarray:
+        days, hours = self._window(days, hours, start)
+        # 予測期間の開始日から何週前の実績か（直前の1週間が0）
+        age_weeks = (np.datetime64(start) - days).astype(np.int64) // 7
+        return self._weighted_mean(weekdays_of(days), hours, (1 - self.alpha) ** age_weeks)
+
+
+# APIで指定できる予測方式の名前
+StrategyName = Literal["fixed", "trailing", "ewma"]
+
+STRATEGIES = {cls.name: cls for cls in (FixedHours, TrailingWeekdayAverage, WeekdayEwma)}
+
+
+def get_strategy(name: Optional[str] = None) -> ForecastStrategy:
+    """
+    名前に対応する予測方式を返す（省略時はWORK_MANAGER_FORECAST_STRATEGY）。
+
+    Raises:
+        ValueError: 未知の名前の場合
+    """
+    name = name or DEFAULT_STRATEGY
+    if name not in STRATEGIES:
+        raise ValueError(f"Unknown forecast strategy: {name}")
+    return STRATEGIES[name]()
+
+
+def strategy_options() -> List[Dict[str, str]]:
+    """APIで指定できる予測方式の名前と、現在の設定での説明を返す（画面の選択肢用）。"""
+    return [{"name": name, "label": cls().label} for name, cls in STRATEGIES.items()]
+
+
+def forecast_range(
+    records: List[Any],
+    history: List[Any],
+    calendar: BusinessCalendar,
+    start: date,
+    end: date,
+    strategy: ForecastStrategy,
+) -> Dict[str, Any]:
+    """
+    start以上end未満の期間の勤務時間を予測する。
+
+    Args:
+        records (list): 期間内の勤怠データ（AttendanceRecord）
+        history (list): 期間の直前strategy.history_weeks週の勤怠データ
+        calendar (BusinessCalendar): 利用者の営業日カレンダー
+        start (date): 開始日（この日を含む）
+        end (date): 終了日（この日を含まない）
+        strategy (ForecastStrategy): 予測方式
+
+    Returns:
+        dict: forecast（registered_work_hours, predicted_work_hours, unregistered_days, holiday_days,
+              strategy, strategy_label, history_days）、
+              daily（dates, actual, forecast: 日ごとの時間の列）、series（dailyの累積推移）
+    """
+    days = np.arange(np.datetime64(start), np.datetime64(end))
+    weekdays = weekdays_of(days)
+    # 日ごとの営業日の判定と営業日数は、どちらもカレンダーの同じインデックスから求める
+    business = calendar.business_day_mask(start, end)
+
+    # 期間内の勤怠データを日ごとの配列に並べる
+    record_days, record_hours, record_has_work = registered_hours(records)
+    positions = (record_days - np.datetime64(start)).astype(np.int64)
+    actual = np.zeros(len(days))
+    registered = np.zeros(len(days), dtype=bool)
+    np.add.at(actual, positions, record_hours)
+    registered[positions[record_has_work]] = True
+
+    history_days, history_hours, history_has_work = registered_hours(history)
+    expected = strategy.expected_hours(history_days[history_has_work], history_hours[history_has_work], start)
+
+    unregistered = business & ~registered
+    unregistered_days = calendar.business_days(start, end) - int((business & registered).sum())
+    daily_forecast = np.where(registered, actual, np.where(unregistered, expected[weekdays], 0.0))
+    registered_work_hours = float(actual[registered].sum())
+    daily = {
+        "dates": np.datetime_as_string(days).tolist(),
+        "actual": actual.tolist(),
+        "forecast": daily_forecast.tolist(),
+    }
+    return {
+        "forecast": {
+            "registered_work_hours": registered_work_hours,
+            "predicted_work_hours": registered_work_hours + float(daily_forecast[unregistered].sum()),
+            "unregistered_days": unregistered_days,
+            "holiday_days": calendar.holiday_count(start, end),
+            "strategy": strategy.name,
+            "strategy_label": strategy.label,
+            # 画面側のキャッシュも、書き込んだ日からこの日数後までの月の予測を無効にする
+            "history_days": HISTORY_DAYS,
+        },
+        "daily": daily,
+        "series": cumulative_series(daily),
+    }
+
+
+def cumulative_series(daily: Dict[str, List]) -> Dict[str, List]:
+    """
+    日ごとの実績・予測時間の列から累積推移の列を作成する。
+
+    Args:
+        daily (dict): dates（"YYYY-MM-DD"のリスト）、actual・forecast（日ごとの時間のリスト）
+
+    Returns:
+        dict: dates、actual・forecast（累積時間を小数第2位で丸めたリスト）
+    """
+    return {
+        "dates": list(daily["dates"]),
+        "actual": np.round(np.cumsum(daily["actual"]), 2).tolist(),
+        "forecast": np.round(np.cumsum(daily["forecast"]), 2).tolist(),
+    }
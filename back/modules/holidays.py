@@ -0,0 +1,138 @@
+"""
+このモジュールは、ユーザーごとの有効な休日（組織共通の祝日＋個人設定）の取得と、休日の一括登録・更新を提供します。
+"""
+from datetime import date
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+
+from sqlalchemy import Select, or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from models import Holiday
+from modules.date_filters import date_range_filter
+from modules.tenant import Tenant
+
+
+def holiday_owner_filter(tenant: Tenant, scope: str):
+    """
+    休日の設定範囲（scope）に対応する絞り込み条件を返す。
+
+    Args:
+        tenant (Tenant): 利用者
+        scope (str): "org"（組織共通）、"user"（個人設定）、"effective"（両方）
+    """
+    org_condition = Holiday.org_id == tenant.org_id
+    if scope == "org":
+        return org_condition & Holiday.user_id.is_(None)
+    if scope == "user":
+        return org_condition & (Holiday.user_id == tenant.user_id)
+    return org_condition & or_(Holiday.user_id.is_(None), Holiday.user_id == tenant.user_id)
+
+
+def effective_holidays_statement(tenant: Tenant, start: Optional[date] = None, end: Optional[date] = None) -> Select:
+    """
+    利用者の組織共通の祝日と個人設定を取得するSELECT文を返す（select_effectiveで有効な休日に絞り込む）。
+
+    Args:
+        tenant (Tenant): 利用者
+        start (date or None): 開始日（この日を含む）
+        end (date or None): 終了日（この日を含まない）
+    """
+    query = select(Holiday).where(holiday_owner_filter(tenant, "effective"))
+    if start is not None and end is not None:
+        query = query.where(date_range_filter(Holiday.date, start, end))
+    return query
+
+
+def select_effective(holidays: Iterable[Holiday]) -> List[Holiday]:
+    """
+    組織共通の祝日と個人設定から、有効な休日を日付順に返す。
+
+    同じ日付に組織共通の祝日と個人設定がある場合は個人設定を優先し、
+    is_holiday=Falseの設定（出勤日への変更）は結果から除外する。
+    """
+    by_date = {}
+    for holiday in holidays:
+        if holiday.user_id is None:
+            by_date.setdefault(holiday.date, holiday)
+        else:
+            by_date[holiday.date] = holiday
+    return [by_date[d] for d in sorted(by_date) if by_date[d].is_holiday]
+
+
+def get_effective_holidays(
+    db: Session, tenant: Tenant, start: Optional[date] = None, end: Optional[date] = None
+) -> List[Holiday]:
+    """
+    利用者にとって有効な休日を日付順に返す（select_effectiveを参照）。
+
+    Args:
+        db (Session): データベースセッション
+        tenant (Tenant): 利用者
+        start (date or None): 開始日（この日を含む）
+        end (date or None): 終了日（この日を含まない）
+    """
+    return select_effective(db.scalars(effective_holidays_statement(tenant, start, end)))
+
+
+async def async_get_effective_holidays(
+    db: AsyncSession, tenant: Tenant, start: Optional[date] = None, end: Optional[date] = None
+) -> List[Holiday]:
+    """get_effective_holidaysの非同期版。"""
+    return select_effective(await db.scalars(effective_holidays_statement(tenant, start, end)))
+
+
+# 1回のSQLで扱う日付の数（SQLiteのバインド変数の上限を超えないようにする）
+CHUNK_SIZE = 500
+
+
+def upsert_holidays(db: Session, tenant: Tenant, items: Sequence[Any]) -> List[Dict[str, Any]]:
+    """
+    複数の休日を登録・更新する（コミットは呼び出し側で行う）。
+
+    同じ設定範囲・日付が複数含まれる場合は後のデータを採用し、それ以前のものは"skipped"とする。
+
+    Args:
+        db (Session): データベースセッション
+        tenant (Tenant): 書き込み先の利用者
+        items (list): date・name・scope・is_holidayを持つ休日（HolidayCreate）のリスト
+
+    Returns:
+        list: 入力順の処理結果（{"date": date, "scope": str,
+            "status": "created" | "updated" | "unchanged" | "skipped"}）
+    """
+    last_index = {(item.scope, item.date): i for i, item in enumerate(items)}
+    statuses: Dict[int, str] = {}
+    for scope in ("org", "user"):
+        targets = [(i, item) for i, item in enumerate(items) if item.scope == scope and last_index[(scope, item.date)] == i]
+        dates = [item.date for _, item in targets]
+        existing = {}
+        for start in range(0, len(dates), CHUNK_SIZE):
+            existing.update(
+                (holiday.date, holiday) for holiday in db.query(Holiday).filter(
+                    holiday_owner_filter(tenant, scope), Holiday.date.in_(dates[start:start + CHUNK_SIZE])
+                )
+            )
+        for i, item in targets:
+            holiday = existing.get(item.date)
+            if holiday is None:
+                db.add(Holiday(
+                    org_id=tenant.org_id,
+                    user_id=tenant.user_id if scope == "user" else None,
+                    date=item.date,
+                    name=item.name,
+                    is_holiday=item.is_holiday,
+                ))
+                statuses[i] = "created"
+            elif holiday.name != item.name or holiday.is_holiday != item.is_holiday:
+                holiday.name = item.name
+                holiday.is_holiday = item.is_holiday
+                statuses[i] = "updated"
+            else:
+                statuses[i] = "unchanged"
+    db.flush()
+
+    return [
+        {"date": item.date, "scope": item.scope, "status": statuses.get(i, "skipped")}
+        for i, item in enumerate(items)
+    ]
@@ -0,0 +1,163 @@
+"""
+このモジュールは、日本の国民の祝日・休日を規則（「国民の祝日に関する法律」）から計算します。
+
+ネットワークや外部のデータを使わずに、任意の年の祝日を作成できます。
+
+- 日付が固定の祝日、ハッピーマンデー（第n月曜日）、制定・改正の年による変更
+- 春分の日・秋分の日（1980〜2099年に有効な近似式、官報での公表値と一致）
+- 振替休日（祝日が日曜日の場合、2007年以降は次の祝日でない日）
+- 国民の休日（前日と翌日が祝日の日）
+- 東京オリンピック・パラリンピックによる2020・2021年の移動、皇室の行事による休日
+
+将来の臨時の休日（皇室の行事など）は法律の制定後にSPECIAL_HOLIDAYSへ追加してください。
+"""
+from datetime import date, timedelta
+from typing import Dict, List, Tuple
+
+# 対応する年の範囲（春分・秋分の日の近似式が有効な範囲）
+MIN_YEAR = 1980
+MAX_YEAR = 2099
+
+SUBSTITUTE_HOLIDAY = "振替休日"
+CITIZENS_HOLIDAY = "国民の休日"
+
+# 皇室の行事などによる1回限りの休日
+SPECIAL_HOLIDAYS = {
+    date(1989, 2, 24): "昭和天皇の大喪の礼",
+    date(1990, 11, 12): "即位礼正殿の儀",
+    date(1993, 6, 9): "皇太子徳仁親王の結婚の儀",
+    date(2019, 5, 1): "天皇の即位の日",
+    date(2019, 10, 22): "即位礼正殿の儀",
+}
+
+# 東京オリンピック・パラリンピックに伴う移動（年: {祝日の名前: 日付}）
+OLYMPIC_MOVES = {
+    2020: {"海の日": date(2020, 7, 23), "スポーツの日": date(2020, 7, 24), "山の日": date(2020, 8, 10)},
+    2021: {"海の日": date(2021, 7, 22), "スポーツの日": date(2021, 7, 23), "山の日": date(2021, 8, 8)},
+}
+
+
+def nth_monday(year: int, month: int, n: int) -> date:
+    """指定月の第n月曜日を返す。"""
+    first = date(year, month, 1)
+    return first + timedelta(days=(7 - first.weekday()) % 7 + 7 * (n - 1))
+
+
+def vernal_equinox_day(year: int) -> int:
+    """春分の日（3月の日）を返す（1980〜2099年）。"""
+    return int(20.8431 + 0.242194 * (year - 1980) - int((year - 1980) / 4))
+
+
+def autumnal_equinox_day(year: int) -> int:
+    """秋分の日（9月の日）を返す（1980〜2099年）。"""
+    return int(23.2488 + 0.242194 * (year - 1980) - int((year - 1980) / 4))
+
+
+def national_holidays_proper(year: int) -> Dict[date, str]:
+    """振替休日・国民の休日を除く、国民の祝日を返す。"""
+    holidays = {
+        date(year, 1, 1): "元日",
+        date(year, 2, 11): "建国記念の日",
+        date(year, 3, vernal_equinox_day(year)): "春分の日",
+        date(year, 5, 3): "憲法記念日",
+        date(year, 5, 5): "こどもの日",
+        date(year, 9, autumnal_equinox_day(year)): "秋分の日",
+        date(year, 11, 3): "文化の日",
+        date(year, 11, 23): "勤労感謝の日",
+    }
+
+    holidays[date(year, 1, 15) if year < 2000 else nth_monday(year, 1, 2)] = "成人の日"
+
+    if year <= 1988:
+        holidays[date(year, 4, 29)] = "天皇誕生日"
+    elif year <= 2006:
+        holidays[date(year, 4, 29)] = "みどりの日"
+    else:
+        holidays[date(year, 4, 29)] = "昭和の日"
+        holidays[date(year, 5, 4)] = "みどりの日"
+
+    if 1989 <= year <= 2018:
+        holidays[date(year, 12, 23)] = "天皇誕生日"
+    elif year >= 2020:
+        holidays[date(year, 2, 23)] = "天皇誕生日"
+
+    moved = OLYMPIC_MOVES.get(year, {})
+    if 1996 <= year <= 2002:
+        holidays[date(year, 7, 20)] = "海の日"
+    elif year >= 2003:
+        holidays[moved.get("海の日", nth_monday(year, 7, 3))] = "海の日"
+
+    if year >= 2016:
+        holidays[moved.get("山の日", date(year, 8, 11))] = "山の日"
+
+    holidays[date(year, 9, 15) if year < 2003 else nth_monday(year, 9, 3)] = "敬老の日"
+
+    if year < 2000:
+        holidays[date(year, 10, 10)] = "体育の日"
+    elif year < 2020:
+        holidays[nth_monday(year, 10, 2)] = "体育の日"
+    else:
+        holidays[moved.get("スポーツの日", nth_monday(year, 10, 2))] = "スポーツの日"
+
+    for day, name in SPECIAL_HOLIDAYS.items():
+        if day.year == year:
+            holidays[day] = name
+    return holidays
+
+
+def japanese_holidays(year: int) -> List[Tuple[date, str]]:
+    """
+    指定年の国民の祝日・休日（振替休日・国民の休日を含む）を日付順に返す。
+
+    Args:
+        year (int): 対象年（MIN_YEAR〜MAX_YEAR）
+
+    Returns:
+        list: (日付, 名前)のリスト
+
+    Raises:
+        ValueError: 対応する範囲外の年の場合
+    """
+    if not MIN_YEAR <= year <= MAX_YEAR:
+        raise ValueError(f"year must be between {MIN_YEAR} and {MAX_YEAR}")
+
+    # 年をまたぐ振替休日・国民の休日の判定のため、前後の年の祝日も含める
+    proper: Dict[date, str] = {}
+    for y in (year - 1, year, year + 1):
+        proper.update(national_holidays_proper(y))
+    holidays = dict(proper)
+
+    # 国民の休日（1986年以降）: 前日と翌日が国民の祝日である祝日でない日（2006年以前は日曜日を除く）
+    for day in sorted(proper):
+        between = day + timedelta(days=1)
+        if between.year < 1986 or between in proper or (between + timedelta(days=1)) not in proper:
+            continue
+        if between.year <= 2006 and between.weekday() == 6:
+            continue
+        holidays[between] = CITIZENS_HOLIDAY
+
+    # 振替休日: 国民の祝日が日曜日の場合、2006年以前は翌日（月曜日）、2007年以降は次の祝日でない日
+    for day in sorted(proper):
+        if day.weekday() != 6:
+            continue
+        substitute = day + timedelta(days=1)
+        if day.year >= 2007:
+            while substitute in holidays:
+                substitute += timedelta(days=1)
+        # 2006年以前は振替休日が国民の休日より優先される
+        if substitute not in holidays or holidays[substitute] == CITIZENS_HOLIDAY:
+            holidays[substitute] = SUBSTITUTE_HOLIDAY
+
+    return sorted((day, name) for day, name in holidays.items() if day.year == year)
+
+
+def japanese_holidays_between(start_year: int, end_year: int) -> List[Tuple[date, str]]:
+    """
+    start_year〜end_year（両端を含む）の国民の祝日・休日を日付順に返す。
+
+    Raises:
+        ValueError: 対応する範囲外の年、またはstart_year > end_yearの場合
+    """
+    if start_year > end_year:
+        raise ValueError("start_year must not be after end_year")
+    return [item for year in range(start_year, end_year + 1) for item in japanese_holidays(year)]
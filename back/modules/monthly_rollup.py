@@ -0,0 +1,293 @@
+"""
+このモジュールは、ユーザー・月ごとの集計（monthly_rollupsテーブル）の差分更新と作り直しを提供します。
+
+勤怠データを書き込むときは、変更前後の値の差分だけを対象月の行に加算し、
+休日を書き込むときは対象月の行の休日数を数え直します。どちらも書き込みと同じ
+トランザクション内で実行するため（コミットは呼び出し側で行う）、勤怠データと集計が食い違いません。
+月別推移などは日ごとの勤怠データを読まずに、1ヶ月1行の集計を読み取れます。
+スクリプトなどで勤怠データを直接書き込んだ場合や、集計がずれた場合は
+scripts.rebuild_monthly_rollupsで勤怠データから作り直してください。
+"""
+from collections import defaultdict
+from datetime import date
+from functools import partial
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import Select, bindparam, delete, extract, insert, or_, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from models import AttendanceRecord, Holiday, MonthlyRollup, now_local
+from modules.attendance_aggregate import query_aggregates
+from modules.date_filters import date_range_filter, month_range
+from modules.tenant import Tenant
+from modules.upsert import dialect_insert
+
+# 勤怠データ1件ごとに加算する集計カラム
+ROLLUP_COLUMNS = (
+    "work_minutes",
+    "break_minutes",
+    "interrupt_minutes",
+    "side_job_minutes",
+    "actual_work_minutes",
+    "work_days",
+    "gross_days",
+    "record_count",
+)
+
+# 集計値の計算に使うattendance_recordsのカラム
+SOURCE_COLUMNS = ("start_time", "end_time", "work_minutes", "break_minutes", "interrupt_minutes", "side_job_minutes")
+
+# 作り直しで1回のINSERTで登録する行数
+CHUNK_SIZE = 500
+
+Contribution = Dict[str, int]
+
+
+def record_contribution(record: Any) -> Contribution:
+    """
+    勤怠データ1件が月の集計に加える値を返す（attendance_aggregate.aggregate_columnsと同じ定義）。
+
+    Args:
+        record: AttendanceRecord、SOURCE_COLUMNSの属性を持つ行、または同じキーの辞書
+
+    Returns:
+        dict: ROLLUP_COLUMNSの各カラムに加算する値
+    """
+    get = record.get if isinstance(record, dict) else partial(getattr, record)
+    has_work = bool(get("start_time")) and bool(get("end_time"))
+    work = (get("work_minutes") or 0) if has_work else 0
+    break_minutes = get("break_minutes") or 0
+    interrupt = get("interrupt_minutes") or 0
+    side_job = get("side_job_minutes") or 0
+    return {
+        "work_minutes": work,
+        "break_minutes": break_minutes,
+        "interrupt_minutes": interrupt,
+        "side_job_minutes": side_job,
+        "actual_work_minutes": work - break_minutes - interrupt,
+        "work_days": int(has_work),
+        "gross_days": int(has_work or side_job != 0),
+        "record_count": 1,
+    }
+
+
+def holiday_day_counts(
+    db: Session, org_id: str, user_ids: Iterable[str], start: Optional[date] = None, end: Optional[date] = None
+) -> Dict[Tuple[str, str], int]:
+    """
+    ユーザー・月ごとの有効な休日の日数を返す（modules.holidays.get_effective_holidaysと同じ判定）。
+
+    Args:
+        db (Session): データベースセッション
+        org_id (str): 組織ID
+        user_ids (iterable): 対象のユーザーID
+        start (date or None): 開始日（この日を含む）
+        end (date or None): 終了日（この日を含まない）
+
+    Returns:
+        dict: (user_id, "YYYY-MM")をキーとする休日の日数（0日の月は含まない）
+    """
+    user_ids = set(user_ids)
+    query = select(Holiday.user_id, Holiday.date, Holiday.is_holiday).where(Holiday.org_id == org_id)
+    if len(user_ids) == 1:
+        query = query.where(or_(Holiday.user_id.is_(None), Holiday.user_id.in_(user_ids)))
+    if start is not None and end is not None:
+        query = query.where(date_range_filter(Holiday.date, start, end))
+
+    org_days: Dict[date, bool] = {}
+    user_days: Dict[str, Dict[date, bool]] = defaultdict(dict)
+    for user_id, day, is_holiday in db.execute(query):
+        if user_id is None:
+            org_days[day] = is_holiday
+        else:
+            user_days[user_id][day] = is_holiday
+
+    counts: Dict[Tuple[str, str], int] = defaultdict(int)
+    for user_id in user_ids:
+        # 同じ日付は個人設定を優先する
+        for day, is_holiday in {**org_days, **user_days.get(user_id, {})}.items():
+            if is_holiday:
+                counts[(user_id, day.strftime("%Y-%m"))] += 1
+    return dict(counts)
+
+
+def add_deltas(db: Session, tenant: Tenant, deltas: Dict[str, Contribution]) -> None:
+    """
+    月ごとの差分を利用者の集計に加算する（コミットは呼び出し側で行う）。
+
+    行がない月は作成し（休日数はその時点で数える）、勤怠データが0件になった月の行は削除する。
+    SQLite・PostgreSQLでは「INSERT ... ON CONFLICT(user_id, year_month) DO UPDATE」で加算するため、
+    同じ月の最初の書き込みが同時に行われても一意制約の違反になりません。
+
+    Args:
+        db (Session): データベースセッション
+        tenant (Tenant): 利用者
+        deltas (dict): "YYYY-MM"をキーとする、ROLLUP_COLUMNSの各カラムの差分
+    """
+    table = MonthlyRollup.__table__
+    insert_stmt = dialect_insert(db)
+    for year_month, delta in sorted(deltas.items()):
+        if not any(delta.values()):
+            continue
+        row_condition = (table.c.user_id == tenant.user_id) & (table.c.year_month == year_month)
+        if insert_stmt is not None:
+            # ON CONFLICTの更新ではonupdateが働かないため、updated_atは明示する
+            first, next_first = month_range(year_month)
+            holiday_days = holiday_day_counts(db, tenant.org_id, [tenant.user_id], first, next_first)
+            stmt = insert_stmt(table).values(
+                org_id=tenant.org_id,
+                user_id=tenant.user_id,
+                year_month=year_month,
+                holiday_days=holiday_days.get((tenant.user_id, year_month), 0),
+                updated_at=now_local(),
+                **delta,
+            )
+            db.execute(stmt.on_conflict_do_update(
+                index_elements=[table.c.user_id, table.c.year_month],
+                set_={
+                    **{name: table.c[name] + stmt.excluded[name] for name in ROLLUP_COLUMNS},
+                    "updated_at": stmt.excluded.updated_at,
+                },
+            ))
+        else:
+            result = db.execute(
+                update(table).where(row_condition).values({name: table.c[name] + delta[name] for name in ROLLUP_COLUMNS})
+            )
+            if result.rowcount == 0:
+                # その月の最初の勤怠データ
+                first, next_first = month_range(year_month)
+                holiday_days = holiday_day_counts(db, tenant.org_id, [tenant.user_id], first, next_first)
+                db.execute(insert(table).values(
+                    org_id=tenant.org_id,
+                    user_id=tenant.user_id,
+                    year_month=year_month,
+                    holiday_days=holiday_days.get((tenant.user_id, year_month), 0),
+                    **delta,
+                ))
+        if delta["record_count"] < 0:
+            db.execute(delete(table).where(row_condition, table.c.record_count <= 0))
+
+
+def apply_record_changes(
+    db: Session, tenant: Tenant, changes: Iterable[Tuple[date, Optional[Contribution], Optional[Contribution]]]
+) -> None:
+    """
+    勤怠データの変更を利用者の月の集計に反映する（コミットは呼び出し側で行う）。
+
+    Args:
+        db (Session): データベースセッション
+        tenant (Tenant): 利用者
+        changes (iterable): (日付, 変更前の値, 変更後の値)のリスト。値はrecord_contributionの結果で、
+            登録時の変更前・削除時の変更後はNone
+    """
+    deltas: Dict[str, Contribution] = defaultdict(lambda: dict.fromkeys(ROLLUP_COLUMNS, 0))
+    for record_date, old, new in changes:
+        delta = deltas[record_date.strftime("%Y-%m")]
+        for name in ROLLUP_COLUMNS:
+            delta[name] += (new[name] if new else 0) - (old[name] if old else 0)
+    add_deltas(db, tenant, deltas)
+
+
+def refresh_holiday_days(db: Session, org_id: str, dates: Iterable[date], user_id: Optional[str] = None) -> None:
+    """
+    休日を書き込んだ日付を含む月の集計の休日数を数え直す（コミットは呼び出し側で行う）。
+
+    Args:
+        db (Session): データベースセッション
+        org_id (str): 組織ID
+        dates (iterable): 書き込んだ休日の日付
+        user_id (str or None): 個人設定の場合はそのユーザー、Noneは組織内の全ユーザー
+    """
+    # 未反映の休日の変更をDBに送る（SessionLocalはautoflush=False）
+    db.flush()
+    table = MonthlyRollup.__table__
+    for year_month in sorted({d.strftime("%Y-%m") for d in dates}):
+        query = select(table.c.id, table.c.user_id).where(table.c.org_id == org_id, table.c.year_month == year_month)
+        if user_id is not None:
+            query = query.where(table.c.user_id == user_id)
+        rows = db.execute(query).all()
+        if not rows:
+            continue
+        counts = holiday_day_counts(db, org_id, {row.user_id for row in rows}, *month_range(year_month))
+        db.execute(
+            update(table).where(table.c.id == bindparam("row_id")),
+            [{"row_id": row.id, "holiday_days": counts.get((row.user_id, year_month), 0)} for row in rows],
+        )
+
+
+def rebuild_rollups(db: Session, user_id: Optional[str] = None) -> int:
+    """
+    勤怠データと休日から集計を作り直す（コミットは呼び出し側で行う）。
+
+    Args:
+        db (Session): データベースセッション
+        user_id (str or None): 対象のユーザーID（省略時は全ユーザー）
+
+    Returns:
+        int: 作成した集計の行数
+    """
+    table = MonthlyRollup.__table__
+    criteria = []
+    delete_stmt = delete(table)
+    if user_id is not None:
+        criteria.append(AttendanceRecord.user_id == user_id)
+        delete_stmt = delete_stmt.where(table.c.user_id == user_id)
+    db.execute(delete_stmt)
+
+    year_col = extract("year", AttendanceRecord.date).label("year")
+    month_col = extract("month", AttendanceRecord.date).label("month")
+    rows = query_aggregates(
+        db, *criteria, group_by=(AttendanceRecord.org_id, AttendanceRecord.user_id, year_col, month_col)
+    )
+
+    users_by_org: Dict[str, set] = defaultdict(set)
+    for row in rows:
+        users_by_org[row.org_id].add(row.user_id)
+    holiday_days: Dict[Tuple[str, str, str], int] = {}
+    for org_id, user_ids in users_by_org.items():
+        for (user_id, year_month), count in holiday_day_counts(db, org_id, user_ids).items():
+            holiday_days[(org_id, user_id, year_month)] = count
+
+    values: List[Dict[str, Any]] = []
+    for row in rows:
+        year_month = f"{int(row.year):04d}-{int(row.month):02d}"
+        values.append({
+            "org_id": row.org_id,
+            "user_id": row.user_id,
+            "year_month": year_month,
+            "work_minutes": int(row.work_minutes),
+            "break_minutes": int(row.break_minutes),
+            "interrupt_minutes": int(row.interrupt_minutes),
+            "side_job_minutes": int(row.side_job_minutes),
+            "actual_work_minutes": int(row.work_minutes - row.break_minutes - row.interrupt_minutes),
+            "work_days": int(row.work_days),
+            "gross_days": int(row.gross_days),
+            "holiday_days": holiday_days.get((row.org_id, row.user_id, year_month), 0),
+            "record_count": int(row.record_count),
+        })
+    for i in range(0, len(values), CHUNK_SIZE):
+        db.execute(insert(table), values[i:i + CHUNK_SIZE])
+    return len(values)
+
+
+def rollups_statement(user_id: str, start_month: str, end_month: str) -> Select:
+    """ユーザーのstart_month〜end_month（"YYYY-MM"、両端を含む）の集計を取得するSELECT文を返す。"""
+    return select(MonthlyRollup).where(
+        MonthlyRollup.user_id == user_id,
+        MonthlyRollup.year_month.between(start_month, end_month),
+    )
+
+
+def read_rollups(db: Session, user_id: str, start_month: str, end_month: str) -> Dict[str, MonthlyRollup]:
+    """
+    ユーザーのstart_month〜end_month（"YYYY-MM"、両端を含む）の集計を月ごとに返す（行のない月は含まない）。
+    """
+    rows = db.scalars(rollups_statement(user_id, start_month, end_month)).all()
+    return {row.year_month: row for row in rows}
+
+
+async def async_read_rollups(db: AsyncSession, user_id: str, start_month: str, end_month: str) -> Dict[str, MonthlyRollup]:
+    """read_rollupsの非同期版。"""
+    rows = (await db.scalars(rollups_statement(user_id, start_month, end_month))).all()
+    return {row.year_month: row for row in rows}
@@ -0,0 +1,213 @@
+"""
+このモジュールは、月単位の集計結果のキャッシュを提供します。
+
+キーは(org_id, user_id, year_month, endpoint)で、勤怠データや休日が書き込まれたときに
+その月のエントリだけを削除します。変更のない過去の月の表示は辞書の参照だけで済みます。
+計算中に削除があった場合は、書き込み前のデータから計算した可能性があるため結果を保存しません
+（business_calendarと同じ世代番号による判定）。
+既定はプロセス内のLRUキャッシュです。複数プロセスで動かす場合などは、
+CacheBackendと同じメソッドを持つ実装をset_backend()で差し替えてください。
+"""
+from collections import OrderedDict
+from datetime import date, timedelta
+from threading import Lock
+from typing import Any, Awaitable, Callable, Hashable, Iterable, Optional, Tuple
+
+from modules.date_filters import add_months
+from modules.tenant import Tenant
+
+# 既定のキャッシュの最大件数
+DEFAULT_MAXSIZE = 1024
+
+CacheKey = Tuple[str, Optional[str], str, str]
+
+
+class CacheBackend:
+    """キャッシュの保存先のインターフェース。"""
+
+    def get(self, key: Hashable) -> Tuple[bool, Any]:
+        """(見つかったか, 値)を返す。"""
+        raise NotImplementedError
+
+    def set(self, key: Hashable, value: Any) -> None:
+        raise NotImplementedError
+
+    def delete_where(self, predicate: Callable[[Hashable], bool]) -> int:
+        """predicateに一致するキーを削除し、削除した件数を返す。"""
+        raise NotImplementedError
+
+    def clear(self) -> None:
+        raise NotImplementedError
+
+    def __len__(self) -> int:
+        raise NotImplementedError
+
+
+class LRUCacheBackend(CacheBackend):
+    """プロセス内のLRUキャッシュ（スレッドセーフ）。"""
+
+    def __init__(self, maxsize: int = DEFAULT_MAXSIZE):
+        self.maxsize = maxsize
+        self._entries: "OrderedDict[Hashable, Any]" = OrderedDict()
+        self._lock = Lock()
+
+    def get(self, key: Hashable) -> Tuple[bool, Any]:
+        with self._lock:
+            if key not in self._entries:
+                return False, None
+            self._entries.move_to_end(key)
+            return True, self._entries[key]
+
+    def set(self, key: Hashable, value: Any) -> None:
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def delete_where(self, predicate: Callable[[Hashable], bool]) -> int:
+        with self._lock:
+            keys = [key for key in self._entries if predicate(key)]
+            for key in keys:
+                del self._entries[key]
+            return len(keys)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+_backend: CacheBackend = LRUCacheBackend()
+_stats = {"hits": 0, "misses": 0, "invalidations": 0}
+_stats_lock = Lock()
+# 削除（invalidate_month・clear）のたびに増やす世代番号。計算中に削除があった値は保存しない
+_generation = 0
+_generation_lock = Lock()
+
+
+def set_backend(backend: CacheBackend) -> None:
+    """キャッシュの保存先を差し替える（統計値はリセットする）。"""
+    global _backend
+    _backend = backend
+    reset_stats()
+
+
+def _count(name: str, n: int = 1) -> None:
+    with _stats_lock:
+        _stats[name] += n
+
+
+def month_key(tenant: Tenant, year_month: str, endpoint: str, user_id: Optional[str] = "") -> CacheKey:
+    """
+    キャッシュのキーを作成する。
+
+    Args:
+        tenant (Tenant): 利用者
+        year_month (str): 対象月（"YYYY-MM"形式に正規化済みのもの）
+        endpoint (str): エンドポイントの識別名
+        user_id (str or None): 省略時はtenantのユーザー、Noneは組織全体の集計
+    """
+    return (tenant.org_id, tenant.user_id if user_id == "" else user_id, year_month, endpoint)
+
+
+def _lookup(key: CacheKey) -> Tuple[bool, Any, int]:
+    """(見つかったか, 値, 現在の世代番号)を返し、ヒット・ミスを数える。"""
+    found, value = _backend.get(key)
+    _count("hits" if found else "misses")
+    with _generation_lock:
+        return found, value, _generation
+
+
+def _store(key: CacheKey, value: Any, generation: int) -> None:
+    with _generation_lock:
+        # 計算中に書き込み（削除）があった場合は、書き込み前のデータから計算した可能性があるため保存しない
+        if generation == _generation:
+            _backend.set(key, value)
+
+
+def get_or_compute(key: CacheKey, compute: Callable[[], Any]) -> Any:
+    """キャッシュに値があれば返し、なければcomputeの結果を保存して返す。"""
+    found, value, generation = _lookup(key)
+    if found:
+        return value
+    value = compute()
+    _store(key, value, generation)
+    return value
+
+
+async def async_get_or_compute(key: CacheKey, compute: Callable[[], Awaitable[Any]]) -> Any:
+    """get_or_computeの非同期版（computeはコルーチンを返す関数）。"""
+    found, value, generation = _lookup(key)
+    if found:
+        return value
+    value = await compute()
+    _store(key, value, generation)
+    return value
+
+
+def invalidate_month(org_id: str, year_month: str, user_id: Optional[str] = None) -> None:
+    """
+    指定月のエントリを削除する。
+
+    user_idを指定した場合はそのユーザーと組織全体の集計のエントリ、
+    省略した場合（組織共通の祝日の変更など）は組織内の全ユーザーのエントリを削除する。
+    """
+    global _generation
+
+    def matches(key: CacheKey) -> bool:
+        key_org, key_user, key_month, _ = key
+        if key_org != org_id or key_month != year_month:
+            return False
+        return user_id is None or key_user is None or key_user == user_id
+
+    with _generation_lock:
+        _generation += 1
+        _count("invalidations", _backend.delete_where(matches))
+
+
+def invalidate_dates(
+    tenant: Tenant, dates: Iterable[date], org_wide: bool = False, following_days: int = 0
+) -> None:
+    """
+    書き込んだ日付を含む月のエントリを削除する（org_wide=Trueで組織内の全ユーザー）。
+
+    following_daysを指定した場合は、書き込んだ日付からその日数後までを含む月も削除する
+    （過去の実績を参照する勤務時間の予測のため）。
+    """
+    user_id = None if org_wide else tenant.user_id
+    months = set()
+    for d in dates:
+        month_first = d.replace(day=1)
+        last = d + timedelta(days=following_days)
+        while month_first <= last:
+            months.add(month_first.strftime("%Y-%m"))
+            month_first = add_months(month_first, 1)
+    for year_month in sorted(months):
+        invalidate_month(tenant.org_id, year_month, user_id)
+
+
+def get_stats() -> dict:
+    """ヒット・ミスの回数と現在の件数を返す。"""
+    with _stats_lock:
+        stats = dict(_stats)
+    lookups = stats["hits"] + stats["misses"]
+    stats["size"] = len(_backend)
+    stats["hit_rate"] = stats["hits"] / lookups if lookups else 0.0
+    return stats
+
+
+def reset_stats() -> None:
+    with _stats_lock:
+        for name in _stats:
+            _stats[name] = 0
+
+
+def clear() -> None:
+    """全てのエントリを削除する。"""
+    global _generation
+    with _generation_lock:
+        _generation += 1
+        _backend.clear()
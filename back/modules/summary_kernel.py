@@ -0,0 +1,174 @@
+"""
+このモジュールは、勤怠データの集計をNumPyの列指向配列でまとめて計算します。
+
+勤怠レコードを開始・終了・休憩・副業の分単位の整数配列に変換し、
+中断時間は全レコード分を1本の配列に平坦化して、レコードごとの開始位置（offsets）で参照します。
+日ごとの集計（calc_day_summary_backend）、複数日の集計（aggregate_attendance）、
+月の勤務時間予測（forecast_monthly_work_hours）は、いずれもこのモジュールの計算結果を使用します。
+"""
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from modules.time_utils import time_str_to_minutes
+
+# "HH:MM"文字列の種類は少ないため、変換結果をキャッシュして解析を1回に抑える
+_to_minutes = lru_cache(maxsize=4096)(time_str_to_minutes)
+
+
+def _field(record: Any, name: str) -> Any:
+    """辞書・ORMオブジェクトのどちらからも値を取得する。"""
+    if isinstance(record, dict):
+        return record.get(name)
+    return getattr(record, name)
+
+
+def _interrupt_intervals(record: Any) -> List[Tuple[int, int]]:
+    """中断時間を(開始, 終了)の分のリストで返す（ORMオブジェクトは子テーブルの分をそのまま使用）。"""
+    if isinstance(record, dict):
+        return [(_to_minutes(it.get("start")), _to_minutes(it.get("end"))) for it in record.get("interruptions") or []]
+    return [(it.start_minute, it.end_minute) for it in record.interruption_rows]
+
+
+@dataclass
+class AttendanceColumns:
+    """
+    勤怠データの列指向表現。
+
+    Attributes:
+        start (np.ndarray): 勤務開始時刻（0時からの分）
+        end (np.ndarray): 勤務終了時刻（0時からの分）
+        has_work (np.ndarray): 開始時刻と終了時刻の両方が入力されているか
+        break_minutes (np.ndarray): 休憩時間（分）
+        side_job_minutes (np.ndarray): 副業時間（分）
+        interrupt_offsets (np.ndarray): レコードiの中断はinterrupt_start[offsets[i]:offsets[i+1]]
+        interrupt_start (np.ndarray): 中断開始時刻（0時からの分、全レコード分を平坦化）
+        interrupt_end (np.ndarray): 中断終了時刻（0時からの分、全レコード分を平坦化）
+    """
+    start: np.ndarray
+    end: np.ndarray
+    has_work: np.ndarray
+    break_minutes: np.ndarray
+    side_job_minutes: np.ndarray
+    interrupt_offsets: np.ndarray
+    interrupt_start: np.ndarray
+    interrupt_end: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.start)
+
+    @classmethod
+    def from_records(cls, records: Iterable[Any]) -> "AttendanceColumns":
+        """勤怠レコード（AttendanceRecordまたは同じキーを持つ辞書）から列を作成する。"""
+        start, end, has_work, break_minutes, side_job_minutes = [], [], [], [], []
+        offsets = [0]
+        interrupt_start, interrupt_end = [], []
+        for record in records:
+            start_time = _field(record, "start_time")
+            end_time = _field(record, "end_time")
+            start.append(_to_minutes(start_time))
+            end.append(_to_minutes(end_time))
+            has_work.append(bool(start_time and end_time))
+            break_minutes.append(int(_field(record, "break_minutes") or 0))
+            side_job_minutes.append(int(_field(record, "side_job_minutes") or 0))
+            for it_start, it_end in _interrupt_intervals(record):
+                interrupt_start.append(it_start)
+                interrupt_end.append(it_end)
+            offsets.append(len(interrupt_start))
+        return cls(
+            start=np.array(start, dtype=np.int64),
+            end=np.array(end, dtype=np.int64),
+            has_work=np.array(has_work, dtype=bool),
+            break_minutes=np.array(break_minutes, dtype=np.int64),
+            side_job_minutes=np.array(side_job_minutes, dtype=np.int64),
+            interrupt_offsets=np.array(offsets, dtype=np.int64),
+            interrupt_start=np.array(interrupt_start, dtype=np.int64),
+            interrupt_end=np.array(interrupt_end, dtype=np.int64),
+        )
+
+
+def day_minutes(columns: AttendanceColumns) -> Dict[str, np.ndarray]:
+    """
+    レコードごとの集計値（分単位）を配列で計算する。
+
+    Returns:
+        dict: work_minutes, break_minutes, interrupt_minutes, interruptions_count,
+              side_job_minutes, actual_work_minutes, has_work（いずれもレコード数の長さの配列）
+    """
+    work = np.where(columns.has_work, columns.end - columns.start, 0)
+
+    # 中断時間の累積和の差分で、レコードごとの中断時間を求める
+    durations = columns.interrupt_end - columns.interrupt_start
+    cumulative = np.concatenate(([0], np.cumsum(durations)))
+    offsets = columns.interrupt_offsets
+    interrupt = cumulative[offsets[1:]] - cumulative[offsets[:-1]]
+
+    return {
+        "work_minutes": work,
+        "break_minutes": columns.break_minutes,
+        "interrupt_minutes": interrupt,
+        "interruptions_count": np.diff(offsets),
+        "side_job_minutes": columns.side_job_minutes,
+        "actual_work_minutes": work - columns.break_minutes - interrupt,
+        "has_work": columns.has_work,
+    }
+
+
+def day_summaries(columns: AttendanceColumns) -> list:
+    """レコードごとのAttendanceSummary形式（時間単位）の辞書のリストを返す。"""
+    minutes = {key: values.tolist() for key, values in day_minutes(columns).items()}
+    summaries = []
+    for i in range(len(columns)):
+        work = minutes["work_minutes"][i]
+        break_minutes = minutes["break_minutes"][i]
+        interrupt = minutes["interrupt_minutes"][i]
+        side_job = minutes["side_job_minutes"][i]
+        summaries.append({
+            "work_hours": round(work / 60, 2),
+            "break_hours": round(break_minutes / 60, 2),
+            "interruptions_count": minutes["interruptions_count"][i],
+            "interrupt_hours": round(interrupt / 60, 2),
+            "side_job_hours": round(side_job / 60, 2),
+            "break_total_hours": round((break_minutes + interrupt) / 60, 2),
+            "actual_work_hours": round(minutes["actual_work_minutes"][i] / 60, 2),
+            "gross_hours": round((work + side_job - interrupt) / 60, 2),
+        })
+    return summaries
+
+
+def aggregate(columns: AttendanceColumns, mask: Optional[np.ndarray] = None) -> Dict[str, Any]:
+    """
+    複数日の勤怠データを集計し、MonthlyAggregateSummary形式（時間単位）の辞書で返す。
+
+    Args:
+        columns (AttendanceColumns): 勤怠データ
+        mask (np.ndarray or None): 集計対象のレコード（省略時は全件）
+    """
+    minutes = day_minutes(columns)
+    if mask is not None:
+        minutes = {key: values[mask] for key, values in minutes.items()}
+
+    work_total_hours = int(minutes["work_minutes"].sum()) / 60
+    break_total_hours = int(minutes["break_minutes"].sum()) / 60
+    interrupt_total_hours = int(minutes["interrupt_minutes"].sum()) / 60
+    side_job_total_hours = int(minutes["side_job_minutes"].sum()) / 60
+    has_work = minutes["has_work"]
+    return {
+        "work_total_hours": work_total_hours,
+        "break_total_hours": break_total_hours,
+        "interrupt_total_hours": interrupt_total_hours,
+        "side_job_total_hours": side_job_total_hours,
+        "gross_total_hours": work_total_hours + side_job_total_hours,
+        "actual_work_hours": work_total_hours - break_total_hours - interrupt_total_hours,
+        "work_days": int(has_work.sum()),
+        # グロス日数（勤務または副業に入力がある日）
+        "gross_days": int((has_work | (minutes["side_job_minutes"] != 0)).sum()),
+    }
+
+
+def registered_actual_minutes(columns: AttendanceColumns) -> int:
+    """勤務日（開始・終了が入力されている日）の実働時間の合計（分）を返す。"""
+    minutes = day_minutes(columns)
+    return int(minutes["actual_work_minutes"][columns.has_work].sum())
@@ -0,0 +1,144 @@
+"""
+このモジュールは、組織内の全ユーザーの月次集計（チーム集計）を計算します。
+
+ユーザーごとのSUM/COUNTを1回のGROUP BYクエリで行い、実働時間順の並び替えとページングも
+SQL（ORDER BY / LIMIT / OFFSET）で行うため、取得するのは当該ページのユーザーの行だけです。
+統計値（平均・中央値・90パーセンタイル）は、PostgreSQLではpercentile_contでデータベース側で、
+それ以外ではユーザーごとの実働時間の列だけを取得してNumPyで1回で計算します。
+集計カラムが未計算の勤怠データがある月は、警告をログに出力してPython集計で計算します
+（aggregate_attendance_sqlと同じ扱い）。
+
+各関数はSELECT文の作成と結果の変換だけを行い、実行は呼び出し側で行うため、
+同期（Session）と非同期（AsyncSession）のどちらのルータからも使用できます。
+"""
+import logging
+from collections import defaultdict
+from typing import Any, Dict, List, Literal, Sequence
+
+import numpy as np
+from sqlalchemy import Select, func, select
+
+from models import AttendanceRecord
+from modules.attendance_aggregate import aggregate_expressions, to_monthly_aggregate
+from modules.summary_kernel import AttendanceColumns, aggregate
+
+logger = logging.getLogger(__name__)
+
+TeamOrder = Literal["desc", "asc"]
+
+
+def _actual_minutes(expressions: Dict[str, Any]):
+    return expressions["work_minutes"] - expressions["break_minutes"] - expressions["interrupt_minutes"]
+
+
+def stats_statement(dialect: str, *criteria) -> Select:
+    """
+    統計値を求めるSELECT文を返す。
+
+    PostgreSQLでは1行（member_count, mean_minutes, median_minutes, p90_minutes, unfilled_count）、
+    それ以外ではユーザーごとの行（actual_minutes, unfilled_count）を返す。
+    """
+    expressions = aggregate_expressions()
+    per_user = select(
+        _actual_minutes(expressions).label("actual_minutes"),
+        expressions["unfilled_count"].label("unfilled_count"),
+    ).where(*criteria).group_by(AttendanceRecord.user_id)
+    if dialect != "postgresql":
+        return per_user
+    members = per_user.subquery()
+    actual = members.c.actual_minutes
+    return select(
+        func.count().label("member_count"),
+        func.coalesce(func.avg(actual), 0).label("mean_minutes"),
+        func.coalesce(func.percentile_cont(0.5).within_group(actual), 0).label("median_minutes"),
+        func.coalesce(func.percentile_cont(0.9).within_group(actual), 0).label("p90_minutes"),
+        func.coalesce(func.sum(members.c.unfilled_count), 0).label("unfilled_count"),
+    )
+
+
+def read_stats(dialect: str, rows: Sequence[Any]) -> Dict[str, Any]:
+    """
+    stats_statementの結果から統計値（時間単位）と未計算のレコード数を返す。
+
+    Returns:
+        dict: member_count, mean_actual_work_hours, median_actual_work_hours, p90_actual_work_hours, unfilled_count
+    """
+    if dialect == "postgresql":
+        row = rows[0]
+        return {
+            "member_count": int(row.member_count),
+            "mean_actual_work_hours": float(row.mean_minutes) / 60,
+            "median_actual_work_hours": float(row.median_minutes) / 60,
+            "p90_actual_work_hours": float(row.p90_minutes) / 60,
+            "unfilled_count": int(row.unfilled_count),
+        }
+    stats = stats_from_hours(np.array([float(row.actual_minutes) for row in rows]) / 60)
+    stats["unfilled_count"] = sum(int(row.unfilled_count) for row in rows)
+    return stats
+
+
+def stats_from_hours(actual_hours: np.ndarray) -> Dict[str, Any]:
+    """ユーザーごとの実働時間（時間）の配列から統計値を計算する（パーセンタイルは線形補間）。"""
+    if len(actual_hours) == 0:
+        return {
+            "member_count": 0,
+            "mean_actual_work_hours": 0.0,
+            "median_actual_work_hours": 0.0,
+            "p90_actual_work_hours": 0.0,
+        }
+    median, p90 = np.percentile(actual_hours, [50, 90])
+    return {
+        "member_count": len(actual_hours),
+        "mean_actual_work_hours": float(actual_hours.mean()),
+        "median_actual_work_hours": float(median),
+        "p90_actual_work_hours": float(p90),
+    }
+
+
+def members_statement(order: TeamOrder, limit: int, offset: int, *criteria) -> Select:
+    """実働時間順（同じ実働時間はユーザーID順）の当該ページのユーザーの集計を求めるSELECT文を返す。"""
+    expressions = aggregate_expressions()
+    actual = _actual_minutes(expressions)
+    return select(
+        AttendanceRecord.user_id,
+        *(expression.label(name) for name, expression in expressions.items()),
+    ).where(*criteria)\
+        .group_by(AttendanceRecord.user_id)\
+        .order_by(actual.desc() if order == "desc" else actual.asc(), AttendanceRecord.user_id)\
+        .limit(limit)\
+        .offset(offset)
+
+
+def read_members(rows: Sequence[Any]) -> List[Dict[str, Any]]:
+    """members_statementの結果をTeamMemberAggregate形式の辞書のリストに変換する。"""
+    return [{"user_id": row.user_id, **to_monthly_aggregate(row)} for row in rows]
+
+
+def records_statement(*criteria) -> Select:
+    """Python集計で計算する場合の勤怠データを取得するSELECT文を返す。"""
+    return select(AttendanceRecord).where(*criteria).order_by(AttendanceRecord.user_id, AttendanceRecord.date)
+
+
+def team_from_records(records: Sequence[AttendanceRecord], order: TeamOrder, limit: int, offset: int) -> Dict[str, Any]:
+    """
+    勤怠データからユーザーごとの集計をPython集計で計算し、並び替え・ページングする。
+
+    Returns:
+        dict: total, stats, members（当該ページ）
+    """
+    logger.warning(
+        "集計カラムが未計算の勤怠データがあるため、チーム集計をPython集計で計算します"
+        "（scripts.backfill_summary_minutesで補完してください）"
+    )
+    positions: Dict[str, List[int]] = defaultdict(list)
+    for i, record in enumerate(records):
+        positions[record.user_id].append(i)
+    columns = AttendanceColumns.from_records(records)
+    members = []
+    for user_id in sorted(positions):
+        mask = np.zeros(len(records), dtype=bool)
+        mask[positions[user_id]] = True
+        members.append({"user_id": user_id, **aggregate(columns, mask)})
+    members.sort(key=lambda m: m["actual_work_hours"], reverse=(order == "desc"))
+    stats = stats_from_hours(np.array([m["actual_work_hours"] for m in members]))
+    return {"total": len(members), "stats": stats, "members": members[offset:offset + limit]}
@@ -0,0 +1,33 @@
+"""
+このモジュールは、リクエストの利用者（ユーザー・組織）の識別を提供します。
+
+ユーザーIDと組織IDはリクエストヘッダー（X-User-Id, X-Org-Id）で受け取り、
+省略時は既定値を使用します（1人で利用する場合は指定不要）。
+"""
+from dataclasses import dataclass
+
+from fastapi import Header
+
+DEFAULT_USER_ID = "default"
+DEFAULT_ORG_ID = "default"
+
+
+@dataclass(frozen=True)
+class Tenant:
+    """
+    リクエストの利用者。
+
+    Attributes:
+        user_id (str): ユーザーID。
+        org_id (str): 組織ID。
+    """
+    user_id: str = DEFAULT_USER_ID
+    org_id: str = DEFAULT_ORG_ID
+
+
+def get_tenant(
+    x_user_id: str = Header(DEFAULT_USER_ID),
+    x_org_id: str = Header(DEFAULT_ORG_ID),
+) -> Tenant:
+    """リクエストヘッダーから利用者を取得する（FastAPIの依存関係として使用）。"""
+    return Tenant(user_id=x_user_id, org_id=x_org_id)
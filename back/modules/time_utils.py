@@ -9,7 +9,16 @@ def parse_time_str(tstr: Optional[str]) -> time:
         return datetime.strptime(tstr, "%H:%M").time()
     except Exception:
         return time(0, 0)
-    
+
+def time_str_to_minutes(tstr: Optional[str]) -> int:
+    """"HH:MM"形式の文字列を0時からの経過分に変換。失敗時は0を返す。"""
+    t = parse_time_str(tstr)
+    return t.hour * 60 + t.minute
+
+def minutes_to_time_str(minutes: int) -> str:
+    """0時からの経過分を"HH:MM"形式の文字列に変換。"""
+    return f"{minutes // 60:02d}:{minutes % 60:02d}"
+
 # interruptionsを文字列（"HH:MM"）に変換
 def serialize_interruptions(inter_list):
     result = []
@@ -0,0 +1,21 @@
+"""
+このモジュールは、接続先DBに応じた「INSERT ... ON CONFLICT」の作成を提供します。
+
+SQLite・PostgreSQLはON CONFLICTに対応しているため、一意インデックスの競合を
+1つのSQLで登録・更新に振り分けられます（同時に書き込まれても一意制約の違反になりません）。
+"""
+from typing import Callable, Optional
+
+from sqlalchemy.orm import Session
+
+
+def dialect_insert(db: Session) -> Optional[Callable]:
+    """接続先DBに応じたON CONFLICT対応のinsert関数を返す（未対応のDBはNone）。"""
+    dialect = db.get_bind().dialect.name
+    if dialect == "sqlite":
+        from sqlalchemy.dialects.sqlite import insert
+        return insert
+    if dialect == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert
+        return insert
+    return None
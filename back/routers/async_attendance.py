@@ -0,0 +1,96 @@
+"""
+このモジュールは、勤怠データのCRUD操作のエンドポイントを非同期（async def）のハンドラで提供します。
+
+非同期モード（database.USE_ASYNC_DB）でrouters.attendanceの代わりに登録します。
+読み取りはrouters.attendanceと同じSELECT文をAsyncSessionで実行して待機し、
+月の集計（monthly_rollups）の更新などの書き込み用の関数は同期版と共通のものをAsyncSession.run_syncで実行します。
+"""
+from datetime import date
+from typing import AsyncIterator, List
+
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+import database
+from models import AttendanceRecord
+from schemas import AttendanceCreate, AttendanceOut, AttendanceBulkItem, AttendanceBulkResponse
+from modules.attendance_upsert import upsert_attendance
+from modules import monthly_rollup, summary_cache
+from modules.date_filters import month_range
+from modules.etag import async_range_validator, make_etag, not_modified
+from modules.forecast_engine import HISTORY_DAYS
+from modules.tenant import Tenant, get_tenant
+from routers.attendance import bulk_counts, month_criteria, record_statement, stage_record
+
+router = APIRouter()
+
+async def get_db() -> AsyncIterator[AsyncSession]:
+    async with database.AsyncSessionLocal() as db:
+        yield db
+
+@router.get("/attendance/{record_date}", response_model=AttendanceOut)
+async def read_attendance(record_date: date, db: AsyncSession = Depends(get_db), tenant: Tenant = Depends(get_tenant)):
+    record = (await db.scalars(record_statement(tenant, record_date))).first()
+    if not record:
+        raise HTTPException(status_code=404, detail="Record not found")
+    return record
+
+# "/attendance/{record_date}"より先に登録する（"bulk"が日付として解釈されないように）
+@router.post("/attendance/bulk", response_model=AttendanceBulkResponse)
+async def bulk_upsert_attendance(items: List[AttendanceBulkItem], db: AsyncSession = Depends(get_db), tenant: Tenant = Depends(get_tenant)):
+    """
+    複数日分の勤怠データを1つのトランザクションで登録・更新するAPI
+    """
+    results = await db.run_sync(
+        upsert_attendance, tenant, [(item.date, item.dict(exclude={"date"})) for item in items]
+    )
+    await db.commit()
+    summary_cache.invalidate_dates(tenant, [item.date for item in items], following_days=HISTORY_DAYS)
+    return bulk_counts(results)
+
+@router.post("/attendance/{record_date}", response_model=AttendanceOut)
+async def create_or_update_attendance(record_date: date, data: AttendanceCreate, db: AsyncSession = Depends(get_db), tenant: Tenant = Depends(get_tenant)):
+    record = (await db.scalars(record_statement(tenant, record_date))).first()
+    previous = monthly_rollup.record_contribution(record) if record else None
+    record = stage_record(db, tenant, record, record_date, data)
+    # 月の集計に差分を反映（同じトランザクション内）
+    changes = [(record_date, previous, monthly_rollup.record_contribution(record))]
+    await db.run_sync(monthly_rollup.apply_record_changes, tenant, changes)
+    await db.commit()
+    summary_cache.invalidate_dates(tenant, [record_date], following_days=HISTORY_DAYS)
+    await db.refresh(record)
+    return record
+
+@router.delete("/attendance/{record_date}")
+async def delete_attendance(record_date: date, db: AsyncSession = Depends(get_db), tenant: Tenant = Depends(get_tenant)):
+    record = (await db.scalars(record_statement(tenant, record_date))).first()
+    if not record:
+        raise HTTPException(status_code=404, detail="Record not found")
+    changes = [(record_date, monthly_rollup.record_contribution(record), None)]
+    await db.run_sync(monthly_rollup.apply_record_changes, tenant, changes)
+    await db.delete(record)
+    await db.commit()
+    summary_cache.invalidate_dates(tenant, [record_date], following_days=HISTORY_DAYS)
+    return {"detail": "Deleted"}
+
+@router.get("/attendance/month/{year_month}", response_model=List[AttendanceOut])
+async def read_month_data(
+    year_month: str,
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(get_db),
+    tenant: Tenant = Depends(get_tenant),
+):
+    try:
+        first, next_first = month_range(year_month)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid format. Use YYYY-MM.")
+    criteria = month_criteria(tenant, first, next_first)
+
+    # 件数・最終更新日時が変わっていなければ304を返す
+    etag = make_etag("month", await async_range_validator(db, AttendanceRecord, *criteria))
+    cached = not_modified(request, response, etag)
+    if cached:
+        return cached
+    return (await db.scalars(select(AttendanceRecord).where(*criteria))).all()
@@ -0,0 +1,325 @@
+"""
+このモジュールは、勤怠データの集計結果のエンドポイントを非同期（async def）のハンドラで提供します。
+
+非同期モード（database.USE_ASYNC_DB）でrouters.attendance_summaryの代わりに登録します。
+ETag・勤怠データ・休日・月の集計の読み取りはrouters.attendance_summaryと同じSELECT文をAsyncSessionで実行して待機し、
+日ごとの集計・予測・累積推移・Python集計などのCPUを使う計算（DBを使わない関数）はrun_in_threadpoolで
+スレッドプールで実行するため、計算中もイベントループは他のリクエストを処理できます。
+"""
+from datetime import date
+from typing import Any, AsyncIterator, Dict, List, Literal, Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy.ext.asyncio import AsyncSession
+
+import database
+from models import AttendanceRecord, Holiday, MonthlyRollup
+from modules import business_calendar, summary_cache, team_aggregate
+from modules.attendance_aggregate import async_aggregate_attendance_sql
+from modules.date_filters import add_months, month_range
+from modules.etag import async_range_validator, make_etag, not_modified
+from modules.forecast_engine import ForecastStrategy, StrategyName, cumulative_series, get_strategy
+from modules.monthly_rollup import async_read_rollups
+from modules.tenant import Tenant, get_tenant
+from routers.attendance import record_statement
+from routers.attendance_summary import (
+    calc_day_summary_backend,
+    effective_holiday_criteria,
+    extend_daily,
+    forecast_from,
+    history_start,
+    month_day_summaries,
+    month_records_statement,
+    series_end,
+    team_criteria,
+    trend_range,
+    trend_summaries,
+    user_range_criteria,
+)
+from schemas import AttendanceDaySummaryResponse, CumulativeSeries, MonthlyAggregateSummary, MonthlyForecast, MonthlyTrendSummary, TeamAggregateResponse
+
+router = APIRouter()
+
+async def get_db() -> AsyncIterator[AsyncSession]:
+    async with database.AsyncSessionLocal() as db:
+        yield db
+
+async def attendance_etag(db: AsyncSession, endpoint: str, *criteria) -> str:
+    """勤怠データの範囲（criteria）の件数・最終更新日時からETagを作成する。"""
+    return make_etag(endpoint, await async_range_validator(db, AttendanceRecord, *criteria))
+
+async def user_month_etag(db: AsyncSession, tenant: Tenant, endpoint: str, first: date, next_first: date) -> str:
+    """ユーザーの月の勤怠データからETagを作成する。"""
+    return await attendance_etag(db, endpoint, *user_range_criteria(tenant, first, next_first))
+
+async def user_month_holiday_etag(
+    db: AsyncSession, tenant: Tenant, endpoint: str, first: date, next_first: date, history_start: Optional[date] = None
+) -> str:
+    """
+    ユーザーの月の勤怠データと有効な休日の両方からETagを作成する。
+
+    history_startを指定した場合は、勤怠データの範囲をその日からとする（過去の実績を参照する予測用）。
+    """
+    return make_etag(
+        await user_month_etag(db, tenant, endpoint, history_start or first, next_first),
+        await async_range_validator(db, Holiday, *effective_holiday_criteria(tenant, first, next_first)),
+    )
+
+async def fetch_month_records(db: AsyncSession, tenant: Tenant, first: date, next_first: date) -> List[AttendanceRecord]:
+    """登録済みの勤怠データを取得する。"""
+    return (await db.scalars(month_records_statement(tenant, first, next_first))).all()
+
+async def fetch_history_records(db: AsyncSession, tenant: Tenant, first: date, strategy: ForecastStrategy) -> List[AttendanceRecord]:
+    """予測方式が参照する月初より前の実績を取得する（参照しない方式は空）。"""
+    if not strategy.history_weeks:
+        return []
+    return await fetch_month_records(db, tenant, history_start(first, strategy), first)
+
+async def month_forecast(
+    db: AsyncSession,
+    tenant: Tenant,
+    records: List[AttendanceRecord],
+    first: date,
+    next_first: date,
+    strategy: ForecastStrategy,
+    as_of: Optional[date] = None,
+) -> Dict[str, Any]:
+    """直前の実績と営業日カレンダーを読み込み、予測表・日ごとの時間・累積推移をスレッドプールで計算する。"""
+    history = await fetch_history_records(db, tenant, first, strategy)
+    calendar = await business_calendar.async_get_calendar(db, tenant)
+    return await run_in_threadpool(forecast_from, records, history, calendar, first, next_first, strategy, as_of)
+
+# 1日の集計を計算するAPI
+@router.get("/attendance/summary/daily/{record_date}", response_model=AttendanceDaySummaryResponse)
+async def get_day_detail_summary(
+    record_date: date,
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(get_db),
+    tenant: Tenant = Depends(get_tenant),
+):
+    etag = await attendance_etag(db, "daily", AttendanceRecord.user_id == tenant.user_id, AttendanceRecord.date == record_date)
+    cached = not_modified(request, response, etag)
+    if cached:
+        return cached
+    record = (await db.scalars(record_statement(tenant, record_date))).first()
+    if not record:
+        raise HTTPException(status_code=404, detail="Record not found")
+    # 1件分の計算のため、スレッドプールには渡さない
+    return calc_day_summary_backend(record)
+
+@router.get("/attendance/summary/monthly/{year_month}", response_model=List[AttendanceDaySummaryResponse])
+async def get_monthly_summary(
+    year_month: str,
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(get_db),
+    tenant: Tenant = Depends(get_tenant),
+):
+    """
+    指定した月の勤怠データを1日ずつ計算して返すAPI
+    """
+    try:
+        first, next_first = month_range(year_month)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid format. Use YYYY-MM.")
+
+    cached = not_modified(request, response, await user_month_etag(db, tenant, "monthly", first, next_first))
+    if cached:
+        return cached
+
+    async def build_monthly_summary():
+        records = await fetch_month_records(db, tenant, first, next_first)
+        return await run_in_threadpool(month_day_summaries, records, first, next_first)
+
+    key = summary_cache.month_key(tenant, first.strftime("%Y-%m"), "monthly")
+    return await summary_cache.async_get_or_compute(key, build_monthly_summary)
+
+# ⬛ 1. 月別サマリーAPI
+@router.get("/attendance/summary/12months", response_model=List[MonthlyTrendSummary])
+async def get_monthly_trend(
+    request: Request,
+    response: Response,
+    months: int = Query(12, ge=1, le=120),
+    end_month: Optional[str] = Query(None, description="最終月（YYYY-MM形式、省略時は今月）"),
+    db: AsyncSession = Depends(get_db),
+    tenant: Tenant = Depends(get_tenant),
+):
+    """
+    end_monthまでのmonthsヶ月分の月別集計を、月の集計（monthly_rollups）から返すAPI（古い月から順）
+    """
+    end_first, start_month, end_month = trend_range(months, end_month)
+
+    # 集計の行数・最終更新日時からETagを作成（勤怠データ・休日の書き込みで集計の行が更新される）
+    etag = make_etag("12months", await async_range_validator(
+        db, MonthlyRollup,
+        MonthlyRollup.user_id == tenant.user_id,
+        MonthlyRollup.year_month.between(start_month, end_month),
+    ))
+    cached = not_modified(request, response, etag)
+    if cached:
+        return cached
+
+    return trend_summaries(await async_read_rollups(db, tenant.user_id, start_month, end_month), end_first, months)
+
+@router.get("/attendance/forecast/{year_month}", response_model=MonthlyForecast)
+async def forecast_monthly_work_hours(
+    year_month: str,
+    request: Request,
+    response: Response,
+    strategy: Optional[StrategyName] = Query(None, description="予測方式（省略時はWORK_MANAGER_FORECAST_STRATEGY）"),
+    db: AsyncSession = Depends(get_db),
+    tenant: Tenant = Depends(get_tenant),
+):
+    try:
+        first, next_first = month_range(year_month)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid format. Use YYYY-MM.")
+    forecast_strategy = get_strategy(strategy)
+
+    # 予測は祝日と直前の実績にも依存するため、参照する範囲の勤怠データと休日からETagを作成
+    # （残りの営業日数は当日から数えるため、日付もETag・キャッシュのキーに含める）
+    as_of = date.today()
+    endpoint = f"forecast:{forecast_strategy.cache_key}:{as_of.isoformat()}"
+    etag = await user_month_holiday_etag(db, tenant, endpoint, first, next_first, history_start(first, forecast_strategy))
+    cached = not_modified(request, response, etag)
+    if cached:
+        return cached
+
+    async def build_forecast():
+        records = await fetch_month_records(db, tenant, first, next_first)
+        return (await month_forecast(db, tenant, records, first, next_first, forecast_strategy, as_of))["forecast"]
+
+    key = summary_cache.month_key(tenant, first.strftime("%Y-%m"), endpoint)
+    return await summary_cache.async_get_or_compute(key, build_forecast)
+
+@router.get("/attendance/summary/cumulative", response_model=CumulativeSeries)
+async def get_cumulative_series(
+    request: Request,
+    response: Response,
+    date_from: date = Query(..., alias="from", description="開始日（YYYY-MM-DD）"),
+    date_to: date = Query(..., alias="to", description="終了日（YYYY-MM-DD、この日を含む）"),
+    strategy: Optional[StrategyName] = Query(None, description="予測方式（省略時はWORK_MANAGER_FORECAST_STRATEGY）"),
+    db: AsyncSession = Depends(get_db),
+    tenant: Tenant = Depends(get_tenant),
+):
+    """
+    指定期間の実績・予測勤務時間の累積推移を列形式（dates, actual, forecast）で返すAPI
+    """
+    end = series_end(date_from, date_to)
+    forecast_strategy = get_strategy(strategy)
+
+    # 各月の予測はその月の直前の実績を参照するため、開始月の直前から期間の終わりまでの範囲でETagを作成
+    first_month = date_from.replace(day=1)
+    etag = await user_month_holiday_etag(
+        db, tenant, f"cumulative:{forecast_strategy.cache_key}",
+        date_from, end, history_start(first_month, forecast_strategy),
+    )
+    cached = not_modified(request, response, etag)
+    if cached:
+        return cached
+
+    # 日ごとの時間を月単位で計算（キャッシュ）し、期間の分を連結して累積する
+    daily: Dict[str, List] = {"dates": [], "actual": [], "forecast": []}
+    month_first = first_month
+    while month_first < end:
+        month_daily = await cached_month_daily(db, tenant, month_first, add_months(month_first, 1), forecast_strategy)
+        extend_daily(daily, month_daily, month_first, date_from, end)
+        month_first = add_months(month_first, 1)
+    return await run_in_threadpool(cumulative_series, daily)
+
+async def cached_month_daily(
+    db: AsyncSession, tenant: Tenant, first: date, next_first: date, strategy: ForecastStrategy
+) -> Dict[str, List]:
+    """月の日ごとの実績・予測時間を返す（月単位の集計キャッシュを使用）。"""
+    async def build_month_daily():
+        records = await fetch_month_records(db, tenant, first, next_first)
+        return (await month_forecast(db, tenant, records, first, next_first, strategy))["daily"]
+
+    key = summary_cache.month_key(tenant, first.strftime("%Y-%m"), f"daily:{strategy.cache_key}")
+    return await summary_cache.async_get_or_compute(key, build_month_daily)
+
+@router.get("/attendance/summary/monthly-agg/{year_month}", response_model=MonthlyAggregateSummary)
+async def get_monthly_aggregate(
+    year_month: str,
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(get_db),
+    tenant: Tenant = Depends(get_tenant),
+):
+    """
+    指定した月の勤怠データを集計して返すAPI
+    """
+    try:
+        first, next_first = month_range(year_month)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid format. Use YYYY-MM.")
+
+    cached = not_modified(request, response, await user_month_etag(db, tenant, "monthly-agg", first, next_first))
+    if cached:
+        return cached
+
+    # SUM/COUNTをデータベース側で実行（ORMオブジェクトは生成しない）
+    key = summary_cache.month_key(tenant, first.strftime("%Y-%m"), "monthly-agg")
+    return await summary_cache.async_get_or_compute(
+        key, lambda: async_aggregate_attendance_sql(db, *user_range_criteria(tenant, first, next_first))
+    )
+
+@router.get("/attendance/summary/team/{year_month}", response_model=TeamAggregateResponse)
+async def get_team_aggregate(
+    year_month: str,
+    request: Request,
+    response: Response,
+    page: int = Query(1, ge=1),
+    page_size: int = Query(50, ge=1, le=500),
+    order: Literal["desc", "asc"] = Query("desc", description="実働時間の並び順"),
+    db: AsyncSession = Depends(get_db),
+    tenant: Tenant = Depends(get_tenant),
+):
+    """
+    組織内の全ユーザーの月次集計をGROUP BYクエリで返すAPI（実働時間順・ページングはSQLで行う）
+    """
+    try:
+        first, next_first = month_range(year_month)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid format. Use YYYY-MM.")
+
+    criteria = team_criteria(tenant, first, next_first)
+    etag = await attendance_etag(db, "team", *criteria)
+    cached = not_modified(request, response, etag)
+    if cached:
+        return cached
+
+    # 並び替え・ページングもSQLで行い、当該ページの結果をキャッシュする（組織全体の集計）
+    key = summary_cache.month_key(tenant, first.strftime("%Y-%m"), f"team:{order}:{page}:{page_size}", user_id=None)
+    return await summary_cache.async_get_or_compute(key, lambda: build_team_aggregate(
+        db, first.strftime("%Y-%m"), order, page, page_size, *criteria
+    ))
+
+async def build_team_aggregate(
+    db: AsyncSession, year_month: str, order: str, page: int, page_size: int, *criteria
+) -> Dict[str, Any]:
+    """
+    条件に一致する勤怠データのユーザーごとの集計の当該ページと、全ユーザーの統計値を返す。
+
+    集計カラムが未計算の勤怠データがある場合は、勤怠データを読み込んでPython集計（スレッドプール）で計算する。
+    """
+    offset = (page - 1) * page_size
+    dialect = db.get_bind().dialect.name
+    stats_rows = (await db.execute(team_aggregate.stats_statement(dialect, *criteria))).all()
+    stats = team_aggregate.read_stats(dialect, stats_rows)
+    if stats.pop("unfilled_count"):
+        records = (await db.scalars(team_aggregate.records_statement(*criteria))).all()
+        result = await run_in_threadpool(team_aggregate.team_from_records, records, order, page_size, offset)
+    else:
+        rows = (await db.execute(team_aggregate.members_statement(order, page_size, offset, *criteria))).all()
+        result = {"total": stats["member_count"], "stats": stats, "members": team_aggregate.read_members(rows)}
+    return {"year_month": year_month, "page": page, "page_size": page_size, **result}
+
+@router.get("/attendance/summary/cache/stats")
+async def get_summary_cache_stats():
+    """
+    月単位の集計キャッシュのヒット・ミス回数と件数を返すAPI
+    """
+    return summary_cache.get_stats()
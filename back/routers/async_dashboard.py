@@ -0,0 +1,72 @@
+"""
+このモジュールは、ダッシュボード画面の表示に必要なデータを1回で返すAPIを非同期（async def）のハンドラで提供します。
+
+非同期モード（database.USE_ASYNC_DB）でrouters.dashboardの代わりに登録します。
+勤怠データ・直前の実績・営業日カレンダーはAsyncSessionで読み込んで待機し、
+全項目の計算（routers.dashboard.dashboard_from）はrun_in_threadpoolでスレッドプールで実行します。
+"""
+from datetime import date
+from typing import AsyncIterator, Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy.ext.asyncio import AsyncSession
+
+import database
+from modules import business_calendar, summary_cache
+from modules.date_filters import month_range
+from modules.etag import not_modified
+from modules.forecast_engine import ForecastStrategy, StrategyName, get_strategy
+from modules.tenant import Tenant, get_tenant
+from routers.async_attendance_summary import fetch_history_records, fetch_month_records, user_month_holiday_etag
+from routers.attendance_summary import history_start
+from routers.dashboard import dashboard_from
+from schemas import DashboardResponse
+
+router = APIRouter()
+
+async def get_db() -> AsyncIterator[AsyncSession]:
+    async with database.AsyncSessionLocal() as db:
+        yield db
+
+
+async def build_dashboard(
+    db: AsyncSession, tenant: Tenant, first: date, next_first: date, strategy: ForecastStrategy, as_of: date
+) -> dict:
+    """月の勤怠データを1回読み込み、営業日カレンダーとあわせてダッシュボードの全項目をスレッドプールで計算する。"""
+    records = await fetch_month_records(db, tenant, first, next_first)
+    history = await fetch_history_records(db, tenant, first, strategy)
+    calendar = await business_calendar.async_get_calendar(db, tenant)
+    return await run_in_threadpool(dashboard_from, records, history, calendar, first, next_first, strategy, as_of)
+
+
+@router.get("/dashboard/{year_month}", response_model=DashboardResponse)
+async def get_dashboard(
+    year_month: str,
+    request: Request,
+    response: Response,
+    strategy: Optional[StrategyName] = Query(None, description="予測方式（省略時はWORK_MANAGER_FORECAST_STRATEGY）"),
+    db: AsyncSession = Depends(get_db),
+    tenant: Tenant = Depends(get_tenant),
+):
+    """
+    指定した月のダッシュボード表示用データ（集計・予測・日ごとの集計・休日・累積推移）を返すAPI
+    """
+    try:
+        first, next_first = month_range(year_month)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid format. Use YYYY-MM.")
+    forecast_strategy = get_strategy(strategy)
+
+    # 残りの営業日数は当日から数えるため、日付もETag・キャッシュのキーに含める
+    as_of = date.today()
+    endpoint = f"dashboard:{forecast_strategy.cache_key}:{as_of.isoformat()}"
+    etag = await user_month_holiday_etag(db, tenant, endpoint, first, next_first, history_start(first, forecast_strategy))
+    cached = not_modified(request, response, etag)
+    if cached:
+        return cached
+
+    key = summary_cache.month_key(tenant, first.strftime("%Y-%m"), endpoint)
+    return await summary_cache.async_get_or_compute(
+        key, lambda: build_dashboard(db, tenant, first, next_first, forecast_strategy, as_of)
+    )
@@ -0,0 +1,165 @@
+"""
+このモジュールは、休日データのCRUD操作のエンドポイントを非同期（async def）のハンドラで提供します。
+
+非同期モード（database.USE_ASYNC_DB）でrouters.holidayの代わりに登録します。
+読み取りはrouters.holidayと同じSELECT文をAsyncSessionで実行して待機し、
+休日の一括登録や月の集計の休日数の更新などの書き込み用の関数は同期版と共通のものをAsyncSession.run_syncで実行します。
+"""
+from datetime import date
+from typing import AsyncIterator, List, Literal
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from sqlalchemy.ext.asyncio import AsyncSession
+
+import database
+from models import Holiday
+from schemas import HolidayBulkResponse, HolidayCreate, HolidayOut
+from modules.date_filters import date_range_filter, month_range
+from modules.etag import async_range_validator, make_etag, not_modified
+from modules.holidays import async_get_effective_holidays, holiday_owner_filter
+from modules.jp_holidays import MAX_YEAR, MIN_YEAR
+from modules.tenant import Tenant, get_tenant
+from routers.holiday import (
+    finish_bulk_write,
+    holiday_statement,
+    invalidate_caches,
+    national_holiday_items,
+    new_holiday,
+    refresh_rollups,
+    scope_statement,
+    stage_holidays,
+)
+
+router = APIRouter()
+
+async def get_db() -> AsyncIterator[AsyncSession]:
+    async with database.AsyncSessionLocal() as db:
+        yield db
+
+async def find_holiday(db: AsyncSession, tenant: Tenant, holiday_date: date, scope: str):
+    """組織共通（scope="org"）または個人設定（scope="user"）の休日を1件取得する。"""
+    return (await db.scalars(holiday_statement(tenant, holiday_date, scope))).first()
+
+async def holidays_etag(db: AsyncSession, tenant: Tenant, scope: str, *criteria) -> str:
+    """対象の休日（組織共通・個人設定）の件数・最終更新日時からETagを作成する。"""
+    return make_etag("holidays", scope, await async_range_validator(db, Holiday, holiday_owner_filter(tenant, scope), *criteria))
+
+@router.get("/holidays/", response_model=List[HolidayOut])
+async def get_holidays(
+    request: Request,
+    response: Response,
+    scope: Literal["effective", "org", "user"] = "effective",
+    db: AsyncSession = Depends(get_db),
+    tenant: Tenant = Depends(get_tenant),
+):
+    """
+    休日一覧を取得するAPI
+    :param scope: "effective"（個人設定を反映した有効な休日）、"org"（組織共通のみ）、"user"（個人設定のみ）
+    """
+    cached = not_modified(request, response, await holidays_etag(db, tenant, scope))
+    if cached:
+        return cached
+    if scope == "effective":
+        return await async_get_effective_holidays(db, tenant)
+    return (await db.scalars(scope_statement(tenant, scope))).all()
+
+@router.get("/holidays/{year_month}", response_model=List[HolidayOut])
+async def get_holidays_by_month(
+    year_month: str,
+    request: Request,
+    response: Response,
+    scope: Literal["effective", "org", "user"] = "effective",
+    db: AsyncSession = Depends(get_db),
+    tenant: Tenant = Depends(get_tenant),
+):
+    """
+    指定した月の祝日を取得するAPI
+    :param year_month: "YYYY-MM"形式の文字列
+    :param scope: "effective"（個人設定を反映した有効な休日）、"org"（組織共通のみ）、"user"（個人設定のみ）
+    """
+    try:
+        first, next_first = month_range(year_month)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid year_month format. Use 'YYYY-MM'.")
+
+    month_condition = date_range_filter(Holiday.date, first, next_first)
+    cached = not_modified(request, response, await holidays_etag(db, tenant, scope, month_condition))
+    if cached:
+        return cached
+    if scope == "effective":
+        return await async_get_effective_holidays(db, tenant, first, next_first)
+    return (await db.scalars(scope_statement(tenant, scope, month_condition))).all()
+
+@router.post("/holidays/", response_model=HolidayOut)
+async def add_holiday(holiday: HolidayCreate, db: AsyncSession = Depends(get_db), tenant: Tenant = Depends(get_tenant)):
+    existing = await find_holiday(db, tenant, holiday.date, holiday.scope)
+    if existing:
+        raise HTTPException(status_code=400, detail="Holiday already exists")
+    created = new_holiday(tenant, holiday)
+    db.add(created)
+    await db.run_sync(refresh_rollups, tenant, [holiday.date], holiday.scope)
+    await db.commit()
+    invalidate_caches(tenant, [holiday.date], holiday.scope)
+    await db.refresh(created)
+    return created
+
+async def bulk_write_holidays(db: AsyncSession, tenant: Tenant, items: List[HolidayCreate]) -> dict:
+    """複数の休日を1つのトランザクションで登録・更新し、一括登録レスポンスを返す。"""
+    results, changed = await db.run_sync(stage_holidays, tenant, items)
+    await db.commit()
+    return finish_bulk_write(tenant, results, changed)
+
+@router.post("/holidays/bulk", response_model=HolidayBulkResponse)
+async def bulk_upsert_holidays(items: List[HolidayCreate], db: AsyncSession = Depends(get_db), tenant: Tenant = Depends(get_tenant)):
+    """
+    複数の休日を1つのトランザクションで登録・更新するAPI（既存の休日は名前・区分を上書き）
+    """
+    return await bulk_write_holidays(db, tenant, items)
+
+@router.post("/holidays/national", response_model=HolidayBulkResponse)
+async def register_national_holidays(
+    start_year: int = Query(..., ge=MIN_YEAR, le=MAX_YEAR),
+    end_year: int = Query(..., ge=MIN_YEAR, le=MAX_YEAR),
+    db: AsyncSession = Depends(get_db),
+    tenant: Tenant = Depends(get_tenant),
+):
+    """
+    start_year〜end_yearの日本の国民の祝日・休日（振替休日・国民の休日を含む）を規則から計算し、
+    組織共通の祝日として一括登録するAPI（外部への通信は行わない）
+    """
+    return await bulk_write_holidays(db, tenant, national_holiday_items(start_year, end_year))
+
+@router.put("/holidays/{holiday_date}", response_model=HolidayOut)
+async def update_holiday(holiday_date: date, updated_holiday: HolidayCreate, db: AsyncSession = Depends(get_db), tenant: Tenant = Depends(get_tenant)):
+    """
+    指定した日付の祝日を更新するAPI
+    :param holiday_date: 更新対象の日付
+    :param updated_holiday: 更新後の祝日データ（scopeで組織共通・個人設定を指定）
+    """
+    holiday = await find_holiday(db, tenant, holiday_date, updated_holiday.scope)
+    if not holiday:
+        raise HTTPException(status_code=404, detail="Holiday not found")
+
+    holiday.name = updated_holiday.name
+    holiday.is_holiday = updated_holiday.is_holiday
+    await db.run_sync(refresh_rollups, tenant, [holiday_date], updated_holiday.scope)
+    await db.commit()
+    invalidate_caches(tenant, [holiday_date], updated_holiday.scope)
+    await db.refresh(holiday)
+    return holiday
+
+@router.delete("/holidays/{holiday_date}")
+async def delete_holiday(
+    holiday_date: date,
+    scope: Literal["org", "user"] = "org",
+    db: AsyncSession = Depends(get_db),
+    tenant: Tenant = Depends(get_tenant),
+):
+    holiday = await find_holiday(db, tenant, holiday_date, scope)
+    if not holiday:
+        raise HTTPException(status_code=404, detail="Holiday not found")
+    await db.delete(holiday)
+    await db.run_sync(refresh_rollups, tenant, [holiday_date], scope)
+    await db.commit()
+    invalidate_caches(tenant, [holiday_date], scope)
+    return {"detail": "Holiday deleted"}
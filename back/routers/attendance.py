@@ -1,17 +1,23 @@
-from fastapi import FastAPI, HTTPException, Depends, APIRouter
+from fastapi import FastAPI, HTTPException, Depends, APIRouter, Request, Response
+from sqlalchemy import Select, select
 from sqlalchemy.orm import Session
 from datetime import date
-from typing import List
+from typing import Any, List, Optional, Tuple
 
-from models import AttendanceRecord, Base
-from schemas import AttendanceCreate, AttendanceOut, AttendanceUpdate
-from database import SessionLocal, engine
-
-from sqlalchemy import extract
+from models import AttendanceRecord, now_local
+from schemas import AttendanceCreate, AttendanceOut, AttendanceUpdate, AttendanceBulkItem, AttendanceBulkResponse
+from database import SessionLocal
+from modules.attendance_calc import apply_summary_minutes
+from modules.attendance_upsert import upsert_attendance
+from modules import monthly_rollup, summary_cache
+from modules.date_filters import date_range_filter, month_range
+from modules.etag import make_etag, not_modified, range_validator
+from modules.forecast_engine import HISTORY_DAYS
+from modules.tenant import Tenant, get_tenant
 
 router = APIRouter()
 
-Base.metadata.create_all(bind=engine)
+# テーブル・インデックスは起動時には作成しない（alembic upgrade head で作成・変更する）
 
 def get_db():
     db = SessionLocal()
@@ -20,45 +26,100 @@ def get_db():
     finally:
         db.close()
 
-@router.get("/attendance/{record_date}", response_model=AttendanceOut)
-def read_attendance(record_date: date, db: Session = Depends(get_db)):
-    record = db.query(AttendanceRecord).filter_by(date=record_date).first()
-    if not record:
-        raise HTTPException(status_code=404, detail="Record not found")
-    return record
+def record_statement(tenant: Tenant, record_date: date) -> Select:
+    """利用者の指定日の勤怠データを取得するSELECT文を返す。"""
+    return select(AttendanceRecord).filter_by(user_id=tenant.user_id, date=record_date)
 
-@router.post("/attendance/{record_date}", response_model=AttendanceOut)
-def create_or_update_attendance(record_date: date, data: AttendanceCreate, db: Session = Depends(get_db)):
-    record = db.query(AttendanceRecord).filter_by(date=record_date).first()
+def month_criteria(tenant: Tenant, first: date, next_first: date) -> Tuple[Any, Any]:
+    """利用者の月の勤怠データの条件を返す（(user_id, date)の複合インデックスで範囲スキャン）。"""
+    return AttendanceRecord.user_id == tenant.user_id, date_range_filter(AttendanceRecord.date, first, next_first)
+
+def bulk_counts(results: List[dict]) -> dict:
+    """一括登録の処理結果から件数を数え、一括登録レスポンスを返す。"""
+    counts = {status: sum(1 for r in results if r["status"] == status) for status in ("created", "updated", "skipped")}
+    return {**counts, "results": results}
+
+def stage_record(db, tenant: Tenant, record: Optional[AttendanceRecord], record_date: date, data: AttendanceCreate) -> AttendanceRecord:
+    """
+    既存の勤怠データ（recordがNoneの場合は新規作成してセッションに追加）に入力値と集計用カラムを設定する。
+
+    dbはSession・AsyncSessionのどちらでもよい（addのみ使用、コミットは呼び出し側で行う）。
+    """
+    # updated_atはクライアントの値を使わない（Noneを代入するとonupdateが発火せず、ETagが変わらなくなる）
+    values = data.dict(exclude={"updated_at"})
     if record:
         # Update
-        for key, value in data.dict().items():
+        for key, value in values.items():
             setattr(record, key, value)
+        record.updated_at = now_local()
     else:
         # Create new
-        record = AttendanceRecord(date=record_date, **data.dict())
+        record = AttendanceRecord(user_id=tenant.user_id, org_id=tenant.org_id, date=record_date, **values)
         db.add(record)
+    # 集計用カラムを更新
+    apply_summary_minutes(record)
+    return record
+
+@router.get("/attendance/{record_date}", response_model=AttendanceOut)
+def read_attendance(record_date: date, db: Session = Depends(get_db), tenant: Tenant = Depends(get_tenant)):
+    record = db.scalars(record_statement(tenant, record_date)).first()
+    if not record:
+        raise HTTPException(status_code=404, detail="Record not found")
+    return record
+
+# "/attendance/{record_date}"より先に登録する（"bulk"が日付として解釈されないように）
+@router.post("/attendance/bulk", response_model=AttendanceBulkResponse)
+def bulk_upsert_attendance(items: List[AttendanceBulkItem], db: Session = Depends(get_db), tenant: Tenant = Depends(get_tenant)):
+    """
+    複数日分の勤怠データを1つのトランザクションで登録・更新するAPI
+    """
+    results = upsert_attendance(
+        db, tenant, [(item.date, item.dict(exclude={"date"})) for item in items]
+    )
     db.commit()
+    summary_cache.invalidate_dates(tenant, [item.date for item in items], following_days=HISTORY_DAYS)
+    return bulk_counts(results)
+
+@router.post("/attendance/{record_date}", response_model=AttendanceOut)
+def create_or_update_attendance(record_date: date, data: AttendanceCreate, db: Session = Depends(get_db), tenant: Tenant = Depends(get_tenant)):
+    record = db.scalars(record_statement(tenant, record_date)).first()
+    previous = monthly_rollup.record_contribution(record) if record else None
+    record = stage_record(db, tenant, record, record_date, data)
+    # 月の集計に差分を反映（同じトランザクション内）
+    monthly_rollup.apply_record_changes(db, tenant, [(record_date, previous, monthly_rollup.record_contribution(record))])
+    db.commit()
+    summary_cache.invalidate_dates(tenant, [record_date], following_days=HISTORY_DAYS)
     db.refresh(record)
     return record
 
 @router.delete("/attendance/{record_date}")
-def delete_attendance(record_date: date, db: Session = Depends(get_db)):
-    record = db.query(AttendanceRecord).filter_by(date=record_date).first()
+def delete_attendance(record_date: date, db: Session = Depends(get_db), tenant: Tenant = Depends(get_tenant)):
+    record = db.scalars(record_statement(tenant, record_date)).first()
     if not record:
         raise HTTPException(status_code=404, detail="Record not found")
+    monthly_rollup.apply_record_changes(db, tenant, [(record_date, monthly_rollup.record_contribution(record), None)])
     db.delete(record)
     db.commit()
+    summary_cache.invalidate_dates(tenant, [record_date], following_days=HISTORY_DAYS)
     return {"detail": "Deleted"}
 
 @router.get("/attendance/month/{year_month}", response_model=List[AttendanceOut])
-def read_month_data(year_month: str, db: Session = Depends(get_db)):
+def read_month_data(
+    year_month: str,
+    request: Request,
+    response: Response,
+    db: Session = Depends(get_db),
+    tenant: Tenant = Depends(get_tenant),
+):
     try:
-        year, month = map(int, year_month.split("-"))
-    except:
+        first, next_first = month_range(year_month)
+    except ValueError:
         raise HTTPException(status_code=400, detail="Invalid format. Use YYYY-MM.")
-    records = db.query(AttendanceRecord)\
-        .filter(extract("year", AttendanceRecord.date) == year)\
-        .filter(extract("month", AttendanceRecord.date) == month)\
-        .all()
-    return records
+    criteria = month_criteria(tenant, first, next_first)
+
+    # 件数・最終更新日時が変わっていなければ304を返す
+    etag = make_etag("month", range_validator(db, AttendanceRecord, *criteria))
+    cached = not_modified(request, response, etag)
+    if cached:
+        return cached
+    return db.scalars(select(AttendanceRecord).where(*criteria)).all()
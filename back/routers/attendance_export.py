@@ -0,0 +1,109 @@
+"""
+このモジュールは、勤怠データと集計値を任意の期間でストリーミング出力するAPIを提供します。
+
+サーバーサイドカーソル（yield_per）で少しずつレコードを読み込み、集計値は読み込んだ件数ごとに
+列指向カーネルでまとめて計算して、StreamingResponseで1行ずつ返すため、期間の長さに関わらずメモリ使用量は一定です。
+"""
+import csv
+import io
+import json
+from datetime import date, timedelta
+from typing import Any, Dict, Iterator, Literal
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import StreamingResponse
+from sqlalchemy import select
+
+from database import SessionLocal
+from models import AttendanceRecord
+from modules.date_filters import date_range_filter
+from modules.tenant import Tenant, get_tenant
+from routers.attendance_summary import calc_day_summaries_backend
+from schemas import AttendanceSummary
+
+router = APIRouter()
+
+# サーバーサイドカーソルで一度に取得する件数
+EXPORT_BATCH_SIZE = 500
+
+RAW_FIELDS = [
+    "date", "start_time", "end_time", "break_minutes", "interruptions",
+    "side_job_minutes", "updated_at", "comment",
+]
+SUMMARY_FIELDS = list(AttendanceSummary.model_fields)
+EXPORT_FIELDS = RAW_FIELDS + SUMMARY_FIELDS
+
+
+def iter_export_rows(user_id: str, date_from: date, date_to: date) -> Iterator[Dict[str, Any]]:
+    """
+    期間内の勤怠データを日付順に1件ずつ、元データと集計値を合わせた辞書で返す。
+
+    StreamingResponseはリクエストの依存関係（get_db）の終了後に読み出されるため、
+    セッションはジェネレータ内で作成・クローズする。
+    """
+    db = SessionLocal()
+    try:
+        records = db.scalars(
+            select(AttendanceRecord)
+            .where(
+                AttendanceRecord.user_id == user_id,
+                date_range_filter(AttendanceRecord.date, date_from, date_to + timedelta(days=1)),
+            )
+            .order_by(AttendanceRecord.date)
+            .execution_options(yield_per=EXPORT_BATCH_SIZE)
+        )
+        # 取得したEXPORT_BATCH_SIZE件ごとに集計値をまとめて計算する
+        for batch in records.partitions():
+            for result in calc_day_summaries_backend(batch):
+                row = {key: result["raw"][key] for key in RAW_FIELDS}
+                row.update(result["summary"])
+                yield row
+    finally:
+        db.close()
+
+
+def iter_ndjson(rows: Iterator[Dict[str, Any]]) -> Iterator[str]:
+    """1行1JSONの形式で出力する。"""
+    for row in rows:
+        yield json.dumps(row, ensure_ascii=False) + "\n"
+
+
+def iter_csv(rows: Iterator[Dict[str, Any]]) -> Iterator[str]:
+    """ヘッダー付きのCSV形式で出力する（中断時間はJSON文字列）。"""
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=EXPORT_FIELDS)
+    writer.writeheader()
+    for row in rows:
+        writer.writerow({**row, "interruptions": json.dumps(row["interruptions"] or [], ensure_ascii=False)})
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate(0)
+    # 0件の場合もヘッダーは出力する
+    if buffer.tell():
+        yield buffer.getvalue()
+
+
+@router.get("/attendance/export")
+def export_attendance(
+    date_from: date = Query(..., alias="from", description="開始日（YYYY-MM-DD）"),
+    date_to: date = Query(..., alias="to", description="終了日（YYYY-MM-DD、この日を含む）"),
+    format: Literal["ndjson", "csv"] = Query("ndjson"),
+    tenant: Tenant = Depends(get_tenant),
+):
+    """
+    指定期間の勤怠データと日ごとの集計値をNDJSONまたはCSVでストリーミング出力するAPI
+    """
+    if date_from > date_to:
+        raise HTTPException(status_code=400, detail="'from' must be on or before 'to'.")
+
+    rows = iter_export_rows(tenant.user_id, date_from, date_to)
+    filename = f"attendance_{date_from.isoformat()}_{date_to.isoformat()}.{format}"
+    if format == "csv":
+        body, media_type = iter_csv(rows), "text/csv; charset=utf-8"
+    else:
+        body, media_type = iter_ndjson(rows), "application/x-ndjson"
+    return StreamingResponse(
+        body,
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
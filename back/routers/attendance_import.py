@@ -0,0 +1,121 @@
+"""
+このモジュールは、CSV/NDJSON形式の勤怠データを一括で取り込むAPIを提供します。
+
+アップロードされたファイルを1行ずつ読みながら検証し、検証済みのデータを
+batch_size件ごとに1トランザクションで書き込みます。ファイル全体を
+メモリに読み込まないため、100万行規模のファイルでもメモリ使用量は一定です。
+"""
+import csv
+import io
+import json
+from typing import Any, Dict, Iterator, List, Literal, Tuple
+
+from fastapi import APIRouter, Depends, File, Query, UploadFile
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session
+
+from database import SessionLocal
+from modules import summary_cache
+from modules.attendance_upsert import upsert_attendance
+from modules.attendance_validation import AttendanceValidationError, validate_attendance_row
+from modules.forecast_engine import HISTORY_DAYS
+from modules.tenant import Tenant, get_tenant
+from schemas import AttendanceImportResponse
+
+router = APIRouter()
+
+def get_db():
+    db = SessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+def iter_csv_rows(stream: io.TextIOBase) -> Iterator[Tuple[int, Any]]:
+    """CSVを1行ずつ(行番号, 行の辞書)で返す（行番号はヘッダーを1行目とする）。"""
+    reader = csv.DictReader(stream)
+    for row in reader:
+        yield reader.line_num, row
+
+
+def iter_ndjson_rows(stream: io.TextIOBase) -> Iterator[Tuple[int, Any]]:
+    """NDJSONを1行ずつ(行番号, 行のオブジェクト)で返す（空行は読み飛ばす）。"""
+    for line_no, line in enumerate(stream, start=1):
+        if not line.strip():
+            continue
+        try:
+            yield line_no, json.loads(line)
+        except ValueError:
+            yield line_no, None
+
+
+@router.post("/attendance/import", response_model=AttendanceImportResponse)
+def import_attendance(
+    file: UploadFile = File(...),
+    format: Literal["csv", "ndjson"] = Query("csv"),
+    batch_size: int = Query(1000, ge=1, le=10000),
+    max_errors: int = Query(1000, ge=0, description="レスポンスに含めるエラーの最大件数"),
+    db: Session = Depends(get_db),
+    tenant: Tenant = Depends(get_tenant),
+):
+    """
+    CSV/NDJSON形式の勤怠データを検証しながら取り込むAPI
+
+    カラム（キー）はエクスポートAPIと同じで、date, start_time, end_time, break_minutes,
+    interruptions（JSON）, side_job_minutes, commentを使用します（その他は無視）。
+    """
+    stream = io.TextIOWrapper(file.file, encoding="utf-8-sig", newline="")
+    rows = iter_csv_rows(stream) if format == "csv" else iter_ndjson_rows(stream)
+
+    result = {"total": 0, "created": 0, "updated": 0, "skipped": 0, "failed": 0}
+    errors: List[Dict[str, Any]] = []
+
+    def add_error(line: int, detail: str):
+        result["failed"] += 1
+        if len(errors) < max_errors:
+            errors.append({"line": line, "detail": detail})
+
+    def flush(batch: List[Tuple[int, Any]]):
+        """検証済みのデータを1トランザクションで書き込む。"""
+        try:
+            statuses = upsert_attendance(db, tenant, [item for _, item in batch])
+            db.commit()
+            summary_cache.invalidate_dates(tenant, [item[0] for _, item in batch], following_days=HISTORY_DAYS)
+        except SQLAlchemyError as e:
+            db.rollback()
+            for line, _ in batch:
+                add_error(line, f"database error: {e.__class__.__name__}")
+            return
+        for status in statuses:
+            result[status["status"]] += 1
+
+    batch: List[Tuple[int, Any]] = []
+    try:
+        for line, row in rows:
+            result["total"] += 1
+            if not isinstance(row, dict):
+                add_error(line, "invalid record")
+                continue
+            try:
+                batch.append((line, validate_attendance_row(row)))
+            except AttendanceValidationError as e:
+                add_error(line, str(e))
+                continue
+            if len(batch) >= batch_size:
+                flush(batch)
+                batch = []
+        if batch:
+            flush(batch)
+    except (UnicodeDecodeError, csv.Error) as e:
+        # ファイル自体が読めない場合は、それまでの取り込み結果とともに返す
+        add_error(result["total"] + 1, f"unreadable file: {e}")
+    finally:
+        stream.detach()
+
+    return {
+        **result,
+        "imported": result["created"] + result["updated"],
+        "errors": errors,
+        "errors_truncated": result["failed"] > len(errors),
+    }
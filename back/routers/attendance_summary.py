@@ -1,15 +1,25 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from sqlalchemy import Select, select
 from sqlalchemy.orm import Session
 from datetime import datetime, timedelta, date
 from database import SessionLocal
-from modules.time_utils import parse_time_str
-from models import AttendanceRecord, AttendanceRecord, Holiday
-from schemas import AttendanceDaySummaryResponse, MonthlyAggregateSummary
+from modules import summary_cache
+from modules.summary_kernel import AttendanceColumns, aggregate, day_summaries
+from modules import team_aggregate
+from modules.attendance_aggregate import aggregate_attendance_sql
+from modules.date_filters import add_months, dates_between, date_range_filter, month_range
+from modules.etag import make_etag, not_modified, range_validator
+from modules import business_calendar
+from modules.forecast_engine import ForecastStrategy, StrategyName, cumulative_series, forecast_range, get_strategy
+from modules.holidays import holiday_owner_filter
+from modules.monthly_rollup import read_rollups
+from modules.tenant import Tenant, get_tenant
+from models import AttendanceRecord, AttendanceRecord, Holiday, MonthlyRollup
+from schemas import AttendanceDaySummaryResponse, CumulativeSeries, MonthlyAggregateSummary, MonthlyForecast, MonthlyTrendSummary, TeamAggregateResponse
 
 from datetime import timedelta
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Literal, Optional, Tuple
 from collections import defaultdict
-from sqlalchemy import extract
 
 router = APIRouter()
 
@@ -20,35 +30,9 @@ def get_db():
     finally:
         db.close()
 
-def calc_day_summary_backend(record: AttendanceRecord) -> Dict[str, any]:
-    """1日の勤怠データから元データと計算値を分けて返す（バックエンド用）"""
-    # 勤務時間などの計算
-    if record.start_time and record.end_time:
-        s = parse_time_str(record.start_time)
-        e = parse_time_str(record.end_time)
-        dt_s = datetime.combine(date.today(), s)
-        dt_e = datetime.combine(date.today(), e)
-        work_time = dt_e - dt_s
-    else:
-        work_time = timedelta(0)
-
-    break_minutes = int(record.break_minutes or 0)
-    break_time = timedelta(minutes=break_minutes)
-    interruptions = record.interruptions or []
-    interrupt_time = timedelta(0)
-    for it in interruptions:
-        its = parse_time_str(it.get("start"))
-        ite = parse_time_str(it.get("end"))
-        if its and ite:
-            dt_its = datetime.combine(date.today(), its)
-            dt_ite = datetime.combine(date.today(), ite)
-            interrupt_time += (dt_ite - dt_its)
-    total_break = break_time + interrupt_time
-    actual_work = work_time - total_break
-    side_job_minutes = int(record.side_job_minutes or 0)
-
-    # 取得したままのデータ
-    raw_data = {
+def record_raw_data(record: AttendanceRecord) -> Dict[str, Any]:
+    """勤怠レコードの取得したままのデータを返す。"""
+    return {
         "id": record.id,
         "date": str(record.date),
         "start_time": record.start_time,
@@ -60,22 +44,17 @@ def calc_day_summary_backend(record: AttendanceRecord) -> Dict[str, any]:
         "comment": record.comment,
     }
 
-    # 計算結果
-    calc_data = {
-        "work_hours": round(work_time.total_seconds() / 3600, 2),
-        "break_hours": round(break_time.total_seconds() / 3600, 2),
-        "interruptions_count": len(interruptions),
-        "interrupt_hours": round(interrupt_time.total_seconds() / 3600, 2),
-        "side_job_hours": round(side_job_minutes / 60, 2),
-        "break_total_hours": round(total_break.total_seconds() / 3600, 2),
-        "actual_work_hours": round(actual_work.total_seconds() / 3600, 2),
-        "gross_hours": round((work_time.total_seconds() + side_job_minutes * 60 - interrupt_time.total_seconds()) / 3600, 2),
-    }
+def calc_day_summaries_backend(records: List[AttendanceRecord]) -> List[Dict[str, Any]]:
+    """複数日の勤怠データから元データと計算値を分けて返す（列指向カーネルでまとめて計算）"""
+    summaries = day_summaries(AttendanceColumns.from_records(records))
+    return [
+        {"raw": record_raw_data(record), "summary": summary}
+        for record, summary in zip(records, summaries)
+    ]
 
-    return {
-        "raw": raw_data,
-        "summary": calc_data
-    }
+def calc_day_summary_backend(record: AttendanceRecord) -> Dict[str, any]:
+    """1日の勤怠データから元データと計算値を分けて返す（バックエンド用）"""
+    return calc_day_summaries_backend([record])[0]
 
 def aggregate_attendance(records: List[Dict[str, Any]]) -> Dict[str, Any]:
     """
@@ -93,105 +72,120 @@ def aggregate_attendance(records: List[Dict[str, Any]]) -> Dict[str, Any]:
             "gross_days": int  # 新たに追加
         }
     """
+    return aggregate(AttendanceColumns.from_records(records))
+
+def attendance_etag(db: Session, endpoint: str, *criteria) -> str:
+    """勤怠データの範囲（criteria）の件数・最終更新日時からETagを作成する。"""
+    return make_etag(endpoint, range_validator(db, AttendanceRecord, *criteria))
+
+def user_range_criteria(tenant: Tenant, first: date, next_first: date) -> Tuple[Any, Any]:
+    """ユーザーのfirst〜next_firstの勤怠データの条件を返す。"""
+    return (
+        AttendanceRecord.user_id == tenant.user_id,
+        date_range_filter(AttendanceRecord.date, first, next_first),
+    )
+
+def user_month_etag(db: Session, tenant: Tenant, endpoint: str, first: date, next_first: date) -> str:
+    """ユーザーの月の勤怠データからETagを作成する。"""
+    return attendance_etag(db, endpoint, *user_range_criteria(tenant, first, next_first))
+
+def user_month_holiday_etag(
+    db: Session, tenant: Tenant, endpoint: str, first: date, next_first: date, history_start: Optional[date] = None
+) -> str:
+    """
+    ユーザーの月の勤怠データと有効な休日の両方からETagを作成する。
 
-    work_total = timedelta()
-    break_total = 0
-    interrupt_total = timedelta()
-    side_job_total = 0
-    gross_days = 0  # グロス日数をカウント
-
-    for data in records:
-        # 勤務合計
-        if data.get("start_time") and data.get("end_time"):
-            s = parse_time_str(data.get("start_time"))
-            e = parse_time_str(data.get("end_time"))
-            dt_s = datetime.combine(date.today(), s)
-            dt_e = datetime.combine(date.today(), e)
-            work_total += (dt_e - dt_s)
-
-        # 休憩合計
-        break_total += int(data.get("break_minutes", 0))
-
-        # 中断合計
-        interruptions = data.get("interruptions", 0)
-        for it in interruptions:
-            its = parse_time_str(it.get("start"))
-            ite = parse_time_str(it.get("end"))
-            if its and ite:
-                dt_its = datetime.combine(date.today(), its)
-                dt_ite = datetime.combine(date.today(), ite)
-                interrupt_total += (dt_ite - dt_its)
-
-        # 副業合計
-        side_job_total += int(data.get("side_job_minutes", 0))
-
-        # グロス日数のカウント（勤務または副業に入力がある日）
-        if (data.get("start_time") and data.get("end_time")) or data.get("side_job_minutes"):
-            gross_days += 1
-
-    # 表示単位の変換
-    work_total_hours = work_total.total_seconds() / 3600  # 総勤務時間
-    break_total_hours = break_total / 60  # 休憩時間の合計
-    interrupt_total_hours = interrupt_total.total_seconds() / 3600  # 中断時間の合計
-    side_job_total_hours = side_job_total / 60  # 副業時間の合計
-
-    gross_total_hours = work_total_hours + side_job_total_hours  # 総勤務時間
-    actual_work_hours = work_total_hours - break_total_hours - interrupt_total_hours  # 実働時間
-
-    work_days = len([
-        r for r in records
-        if r.get("start_time") and r.get("end_time")
-    ])
-
-    return {
-        "work_total_hours": work_total_hours,
-        "break_total_hours": break_total_hours,
-        "interrupt_total_hours": interrupt_total_hours,
-        "side_job_total_hours": side_job_total_hours,
-        "gross_total_hours": gross_total_hours,
-        "actual_work_hours": actual_work_hours,
-        "work_days": work_days,
-        "gross_days": gross_days  # グロス日数を追加
-    }
+    history_startを指定した場合は、勤怠データの範囲をその日からとする（過去の実績を参照する予測用）。
+    """
+    return make_etag(
+        user_month_etag(db, tenant, endpoint, history_start or first, next_first),
+        range_validator(db, Holiday, *effective_holiday_criteria(tenant, first, next_first)),
+    )
+
+def effective_holiday_criteria(tenant: Tenant, first: date, next_first: date) -> Tuple[Any, Any]:
+    """利用者のfirst〜next_firstの有効な休日（組織共通・個人設定）の条件を返す。"""
+    return (
+        holiday_owner_filter(tenant, "effective"),
+        date_range_filter(Holiday.date, first, next_first),
+    )
 
 # 1日の集計を計算するAPI
 @router.get("/attendance/summary/daily/{record_date}", response_model=AttendanceDaySummaryResponse)
-def get_day_detail_summary(record_date: date, db: Session = Depends(get_db)):
-    record = db.query(AttendanceRecord).filter_by(date=record_date).first()
+def get_day_detail_summary(
+    record_date: date,
+    request: Request,
+    response: Response,
+    db: Session = Depends(get_db),
+    tenant: Tenant = Depends(get_tenant),
+):
+    etag = attendance_etag(db, "daily", AttendanceRecord.user_id == tenant.user_id, AttendanceRecord.date == record_date)
+    cached = not_modified(request, response, etag)
+    if cached:
+        return cached
+    record = db.query(AttendanceRecord).filter_by(user_id=tenant.user_id, date=record_date).first()
     if not record:
         raise HTTPException(status_code=404, detail="Record not found")
     result = calc_day_summary_backend(record)
     return result
 
 @router.get("/attendance/summary/monthly/{year_month}", response_model=List[AttendanceDaySummaryResponse])
-def get_monthly_summary(year_month: str, db: Session = Depends(get_db)):
+def get_monthly_summary(
+    year_month: str,
+    request: Request,
+    response: Response,
+    db: Session = Depends(get_db),
+    tenant: Tenant = Depends(get_tenant),
+):
     """
     指定した月の勤怠データを1日ずつ計算して返すAPI
     """
     try:
-        year, month = map(int, year_month.split("-"))
+        first, next_first = month_range(year_month)
     except ValueError:
         raise HTTPException(status_code=400, detail="Invalid format. Use YYYY-MM.")
 
-    # 月の日付範囲を取得
-    from calendar import monthrange
-    days_in_month = monthrange(year, month)[1]
-    all_dates = [date(year, month, day) for day in range(1, days_in_month + 1)]
+    cached = not_modified(request, response, user_month_etag(db, tenant, "monthly", first, next_first))
+    if cached:
+        return cached
+
+    key = summary_cache.month_key(tenant, first.strftime("%Y-%m"), "monthly")
+    return summary_cache.get_or_compute(key, lambda: build_monthly_summary(db, tenant, first, next_first))
+
 
-    # 登録済みの勤怠データを取得
-    registered_records = db.query(AttendanceRecord).filter(
-        AttendanceRecord.date.in_(all_dates)
-    ).all()
+def month_records_statement(tenant: Tenant, first: date, next_first: date) -> Select:
+    """登録済みの勤怠データを取得するSELECT文を返す（(user_id, date)の複合インデックスで範囲スキャン）。"""
+    return select(AttendanceRecord).where(
+        AttendanceRecord.user_id == tenant.user_id,
+        date_range_filter(AttendanceRecord.date, first, next_first),
+    )
 
-    # 日付ごとにデータを計算
+
+def fetch_month_records(db: Session, tenant: Tenant, first: date, next_first: date) -> List[AttendanceRecord]:
+    """登録済みの勤怠データを取得する。"""
+    return db.scalars(month_records_statement(tenant, first, next_first)).all()
+
+
+def build_monthly_summary(db: Session, tenant: Tenant, first: date, next_first: date) -> List[Dict[str, Any]]:
+    """月初〜翌月初の勤怠データを1日ずつ計算する（未登録の日は空のデータ）。"""
+    return month_day_summaries(fetch_month_records(db, tenant, first, next_first), first, next_first)
+
+
+def month_day_summaries(registered_records: List[AttendanceRecord], first: date, next_first: date) -> List[Dict[str, Any]]:
+    """取得済みの勤怠データから、月初〜翌月初の1日ずつの集計を作成する。"""
+    # 月の日付範囲を取得
+    all_dates = dates_between(first, next_first)
+
+    # 登録済みのデータをまとめて計算
     summaries = []
-    records_by_date = {record.date: record for record in registered_records}
+    summaries_by_date = {
+        record.date: summary
+        for record, summary in zip(registered_records, calc_day_summaries_backend(registered_records))
+    }
 
     for day in all_dates:
-        if day in records_by_date:
+        if day in summaries_by_date:
             # 登録済みのデータがある場合
-            record = records_by_date[day]
-            summary = calc_day_summary_backend(record)
+            summary = summaries_by_date[day]
         else:
             # 登録されていない場合は空のデータを作成
             summary = {
@@ -223,143 +217,311 @@ def get_monthly_summary(year_month: str, db: Session = Depends(get_db)):
 
 
 # ⬛ 1. 月別サマリーAPI
-@router.get("/attendance/summary/12months")
-def get_monthly_summary(db: Session = Depends(get_db)):
-    today = date.today()
-    summaries = []
-    for i in range(12):
-        # iヶ月前の月初を取得
-        month_date = (today.replace(day=1) - timedelta(days=30*i))
-        start = month_date.replace(day=1)
-        if start.month == 12:
-            end = start.replace(year=start.year + 1, month=1, day=1)
-        else:
-            end = start.replace(month=start.month + 1, day=1)
+@router.get("/attendance/summary/12months", response_model=List[MonthlyTrendSummary])
+def get_monthly_trend(
+    request: Request,
+    response: Response,
+    months: int = Query(12, ge=1, le=120),
+    end_month: Optional[str] = Query(None, description="最終月（YYYY-MM形式、省略時は今月）"),
+    db: Session = Depends(get_db),
+    tenant: Tenant = Depends(get_tenant),
+):
+    """
+    end_monthまでのmonthsヶ月分の月別集計を、月の集計（monthly_rollups）から返すAPI（古い月から順）
+
+    日ごとの勤怠データは読まないため、過去のデータの量によらず1ユーザーあたり最大months行の読み取りで済みます。
+    """
+    end_first, start_month, end_month = trend_range(months, end_month)
 
-        records = db.query(AttendanceRecord).filter(
-            AttendanceRecord.date >= start,
-            AttendanceRecord.date < end
-        ).all()
+    # 集計の行数・最終更新日時からETagを作成（勤怠データ・休日の書き込みで集計の行が更新される）
+    etag = make_etag("12months", range_validator(
+        db, MonthlyRollup,
+        MonthlyRollup.user_id == tenant.user_id,
+        MonthlyRollup.year_month.between(start_month, end_month),
+    ))
+    cached = not_modified(request, response, etag)
+    if cached:
+        return cached
 
-        total_minutes = 0
-        working_days = 0
+    return trend_summaries(read_rollups(db, tenant.user_id, start_month, end_month), end_first, months)
+
+
+def trend_range(months: int, end_month: Optional[str]) -> Tuple[date, str, str]:
+    """月別推移の最終月（省略時は今月）の月初と、開始月・最終月（"YYYY-MM"）を返す。"""
+    end_month = end_month or date.today().strftime("%Y-%m")
+    try:
+        end_first, _ = month_range(end_month)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid format. Use YYYY-MM.")
+    return end_first, add_months(end_first, -(months - 1)).strftime("%Y-%m"), end_first.strftime("%Y-%m")
 
-        for r in records:
-            if r.start_time and r.end_time:
-                minutes = ((datetime.combine(date.min, r.end_time) -
-                            datetime.combine(date.min, r.start_time)).seconds) / 60
-                minutes -= r.break_minutes or 0
-                total_minutes += minutes
-                working_days += 1
 
+def trend_summaries(rollups: Dict[str, MonthlyRollup], end_first: date, months: int) -> List[Dict[str, Any]]:
+    """月の集計から、end_firstの月までのmonthsヶ月分の月別集計を古い月から順に作成する（行のない月は0）。"""
+    summaries = []
+    for i in range(months):
+        month = add_months(end_first, i - (months - 1)).strftime("%Y-%m")
+        row = rollups.get(month)
         summaries.append({
-            "month": start.strftime("%Y-%m"),
-            "working_days": working_days,
-            "total_work_minutes": total_minutes
+            "month": month,
+            "working_days": row.work_days if row else 0,
+            "work_minutes": row.work_minutes if row else 0,
+            "break_minutes": row.break_minutes if row else 0,
+            "interrupt_minutes": row.interrupt_minutes if row else 0,
+            "side_job_minutes": row.side_job_minutes if row else 0,
+            "actual_work_minutes": row.actual_work_minutes if row else 0,
+            "gross_days": row.gross_days if row else 0,
+            "holiday_days": row.holiday_days if row else 0,
         })
-
-    summaries.reverse()  # 昇順（月初から最新）
     return summaries
 
 
-@router.get("/attendance/forecast/{year_month}")
-def forecast_monthly_work_hours(year_month: str, db: Session = Depends(get_db)):
+@router.get("/attendance/forecast/{year_month}", response_model=MonthlyForecast)
+def forecast_monthly_work_hours(
+    year_month: str,
+    request: Request,
+    response: Response,
+    strategy: Optional[StrategyName] = Query(None, description="予測方式（省略時はWORK_MANAGER_FORECAST_STRATEGY）"),
+    db: Session = Depends(get_db),
+    tenant: Tenant = Depends(get_tenant),
+):
     try:
-        year, month = map(int, year_month.split("-"))
+        first, next_first = month_range(year_month)
     except ValueError:
         raise HTTPException(status_code=400, detail="Invalid format. Use YYYY-MM.")
+    forecast_strategy = get_strategy(strategy)
+
+    # 予測は祝日と直前の実績にも依存するため、参照する範囲の勤怠データと休日からETagを作成
+    # （残りの営業日数は当日から数えるため、日付もETag・キャッシュのキーに含める）
+    as_of = date.today()
+    endpoint = f"forecast:{forecast_strategy.cache_key}:{as_of.isoformat()}"
+    etag = user_month_holiday_etag(db, tenant, endpoint, first, next_first, history_start(first, forecast_strategy))
+    cached = not_modified(request, response, etag)
+    if cached:
+        return cached
+
+    key = summary_cache.month_key(tenant, first.strftime("%Y-%m"), endpoint)
+    return summary_cache.get_or_compute(key, lambda: build_forecast(db, tenant, first, next_first, forecast_strategy, as_of))
+
+
+def history_start(first: date, strategy: ForecastStrategy) -> date:
+    """予測方式が参照する過去の実績の開始日を返す。"""
+    return first - timedelta(weeks=strategy.history_weeks)
+
+
+def fetch_history_records(db: Session, tenant: Tenant, first: date, strategy: ForecastStrategy) -> List[AttendanceRecord]:
+    """予測方式が参照する月初より前の実績を取得する（参照しない方式は空）。"""
+    if not strategy.history_weeks:
+        return []
+    return fetch_month_records(db, tenant, history_start(first, strategy), first)
+
+
+def build_forecast(
+    db: Session, tenant: Tenant, first: date, next_first: date, strategy: ForecastStrategy, as_of: date
+) -> Dict[str, Any]:
+    """月初〜翌月初の勤務時間を、未登録の営業日を予測方式で見積もって予測する。"""
+    records = fetch_month_records(db, tenant, first, next_first)
+    return month_forecast(db, tenant, records, first, next_first, strategy, as_of)["forecast"]
+
+
+def month_forecast(
+    db: Session,
+    tenant: Tenant,
+    records: List[AttendanceRecord],
+    first: date,
+    next_first: date,
+    strategy: ForecastStrategy,
+    as_of: Optional[date] = None,
+) -> Dict[str, Any]:
+    """
+    取得済みの月の勤怠データと直前の実績から、予測表（forecast）・日ごとの時間（daily）・累積推移（series）を計算する。
 
-    # 月の日付範囲を取得
-    from calendar import monthrange
-    days_in_month = monthrange(year, month)[1]
-    all_dates = [date(year, month, day) for day in range(1, days_in_month + 1)]
-
-    # 登録済みの勤怠データを取得
-    registered_records = db.query(AttendanceRecord).filter(
-        AttendanceRecord.date.in_(all_dates)
-    ).all()
-
-    # 勤務日としての判定: 開始時刻と終了時刻が入力されている日
-    work_days = {record.date for record in registered_records if record.start_time and record.end_time}
-
-    # 祝日を取得
-    holidays = db.query(Holiday).filter(Holiday.date.in_(all_dates)).all()
-    holiday_dates = {holiday.date for holiday in holidays}
-
-    # 未登録日を計算（勤務日と祝日を除外）
-    unregistered_dates = set(all_dates) - work_days - holiday_dates
-
-    # 土日を除外
-    unregistered_dates = {d for d in unregistered_dates if d.weekday() < 5}  # weekday()が5以上は土日
-
-    # 勤務時間の予測
-    total_work_hours = 0
-    for record in registered_records:
-        if record.start_time and record.end_time:  # 勤務日としての判定
-            start_time = parse_time_str(record.start_time)
-            end_time = parse_time_str(record.end_time)
-            work_time = (datetime.combine(date.today(), end_time) - datetime.combine(date.today(), start_time)).total_seconds() / 3600
-
-            # 休憩時間と中断時間を計算
-            break_time = (record.break_minutes or 0) / 60  # 分を時間に変換
-            interrupt_time = 0
-            for it in record.interruptions or []:
-                its = parse_time_str(it.get("start"))
-                ite = parse_time_str(it.get("end"))
-                if its and ite:
-                    interrupt_time += (datetime.combine(date.today(), ite) - datetime.combine(date.today(), its)).total_seconds() / 3600
-
-            # 実働時間を計算
-            actual_work_hours = work_time - break_time - interrupt_time
-            total_work_hours += actual_work_hours
-
-    # 未登録日は1日8時間として加算
-    total_work_hours += len(unregistered_dates) * 8
-
-    return {
+    予測表にはyear_monthと、as_of（省略時は当日）から月末までの営業日数（remaining_business_days）を加える。
+    """
+    history = fetch_history_records(db, tenant, first, strategy)
+    calendar = business_calendar.get_calendar(db, tenant)
+    return forecast_from(records, history, calendar, first, next_first, strategy, as_of)
+
+
+def forecast_from(
+    records: List[AttendanceRecord],
+    history: List[AttendanceRecord],
+    calendar: business_calendar.BusinessCalendar,
+    first: date,
+    next_first: date,
+    strategy: ForecastStrategy,
+    as_of: Optional[date] = None,
+) -> Dict[str, Any]:
+    """取得済みの月の勤怠データ・直前の実績・営業日カレンダーから、month_forecastの結果を計算する（DBは使わない）。"""
+    result = forecast_range(records, history, calendar, first, next_first, strategy)
+    year_month = first.strftime("%Y-%m")
+    result["forecast"] = {
         "year_month": year_month,
-        "registered_work_hours": total_work_hours - len(unregistered_dates) * 8,
-        "predicted_work_hours": total_work_hours,
-        "unregistered_days": len(unregistered_dates),
-        "holiday_days": len(holiday_dates),
+        **result["forecast"],
+        "remaining_business_days": calendar.remaining_business_days(year_month, as_of or date.today()),
     }
+    return result
+
+
+# 累積推移APIで指定できる最大の日数
+MAX_SERIES_DAYS = 731
+
+
+@router.get("/attendance/summary/cumulative", response_model=CumulativeSeries)
+def get_cumulative_series(
+    request: Request,
+    response: Response,
+    date_from: date = Query(..., alias="from", description="開始日（YYYY-MM-DD）"),
+    date_to: date = Query(..., alias="to", description="終了日（YYYY-MM-DD、この日を含む）"),
+    strategy: Optional[StrategyName] = Query(None, description="予測方式（省略時はWORK_MANAGER_FORECAST_STRATEGY）"),
+    db: Session = Depends(get_db),
+    tenant: Tenant = Depends(get_tenant),
+):
+    """
+    指定期間の実績・予測勤務時間の累積推移を列形式（dates, actual, forecast）で返すAPI
+    """
+    end = series_end(date_from, date_to)
+    forecast_strategy = get_strategy(strategy)
+
+    # 各月の予測はその月の直前の実績を参照するため、開始月の直前から期間の終わりまでの範囲でETagを作成
+    first_month = date_from.replace(day=1)
+    etag = user_month_holiday_etag(
+        db, tenant, f"cumulative:{forecast_strategy.cache_key}",
+        date_from, end, history_start(first_month, forecast_strategy),
+    )
+    cached = not_modified(request, response, etag)
+    if cached:
+        return cached
+
+    # 日ごとの時間を月単位で計算（キャッシュ）し、期間の分を連結して累積する
+    daily: Dict[str, List] = {"dates": [], "actual": [], "forecast": []}
+    month_first = first_month
+    while month_first < end:
+        month_daily = cached_month_daily(db, tenant, month_first, add_months(month_first, 1), forecast_strategy)
+        extend_daily(daily, month_daily, month_first, date_from, end)
+        month_first = add_months(month_first, 1)
+    return cumulative_series(daily)
+
+
+def series_end(date_from: date, date_to: date) -> date:
+    """累積推移の期間を検証し、終了日の翌日を返す。"""
+    if date_from > date_to:
+        raise HTTPException(status_code=400, detail="'from' must be on or before 'to'.")
+    end = date_to + timedelta(days=1)
+    if (end - date_from).days > MAX_SERIES_DAYS:
+        raise HTTPException(status_code=400, detail=f"Range must be at most {MAX_SERIES_DAYS} days.")
+    return end
+
+
+def extend_daily(daily: Dict[str, List], month_daily: Dict[str, List], month_first: date, date_from: date, end: date) -> None:
+    """月の日ごとの時間のうち、date_from〜endの期間の分をdailyの各列に追加する。"""
+    lo = max((date_from - month_first).days, 0)
+    hi = (end - month_first).days
+    for column in daily:
+        daily[column].extend(month_daily[column][lo:hi])
+
+
+def cached_month_daily(
+    db: Session, tenant: Tenant, first: date, next_first: date, strategy: ForecastStrategy
+) -> Dict[str, List]:
+    """月の日ごとの実績・予測時間を返す（月単位の集計キャッシュを使用）。"""
+    key = summary_cache.month_key(tenant, first.strftime("%Y-%m"), f"daily:{strategy.cache_key}")
+    return summary_cache.get_or_compute(
+        key,
+        lambda: month_forecast(db, tenant, fetch_month_records(db, tenant, first, next_first), first, next_first, strategy)["daily"],
+    )
 
 
 @router.get("/attendance/summary/monthly-agg/{year_month}", response_model=MonthlyAggregateSummary)
-def get_monthly_aggregate(year_month: str, db: Session = Depends(get_db)):
+def get_monthly_aggregate(
+    year_month: str,
+    request: Request,
+    response: Response,
+    db: Session = Depends(get_db),
+    tenant: Tenant = Depends(get_tenant),
+):
     """
     指定した月の勤怠データを集計して返すAPI
     """
     try:
-        year, month = map(int, year_month.split("-"))
+        first, next_first = month_range(year_month)
     except ValueError:
         raise HTTPException(status_code=400, detail="Invalid format. Use YYYY-MM.")
-    
-    records = db.query(AttendanceRecord)\
-        .filter(extract("year", AttendanceRecord.date) == year)\
-        .filter(extract("month", AttendanceRecord.date) == month)\
-        .all()
-
-    # オブジェクトを辞書形式に変換
-    records_dict = [
-        {
-            "id": record.id,
-            "date": record.date,
-            "start_time": record.start_time,
-            "end_time": record.end_time,
-            "break_minutes": record.break_minutes,
-            "interruptions": record.interruptions,
-            "side_job_minutes": record.side_job_minutes,
-            "updated_at": record.updated_at,
-            "comment": record.comment,
-        }
-        for record in records
-    ]
 
-    # 日付の昇順（古い→新しい）でソート
-    records_dict = sorted(records_dict, key=lambda r: r["date"])
+    cached = not_modified(request, response, user_month_etag(db, tenant, "monthly-agg", first, next_first))
+    if cached:
+        return cached
+
+    # SUM/COUNTをデータベース側で実行（ORMオブジェクトは生成しない）
+    key = summary_cache.month_key(tenant, first.strftime("%Y-%m"), "monthly-agg")
+    return summary_cache.get_or_compute(
+        key, lambda: aggregate_attendance_sql(db, *user_range_criteria(tenant, first, next_first))
+    )
+
+
+@router.get("/attendance/summary/team/{year_month}", response_model=TeamAggregateResponse)
+def get_team_aggregate(
+    year_month: str,
+    request: Request,
+    response: Response,
+    page: int = Query(1, ge=1),
+    page_size: int = Query(50, ge=1, le=500),
+    order: Literal["desc", "asc"] = Query("desc", description="実働時間の並び順"),
+    db: Session = Depends(get_db),
+    tenant: Tenant = Depends(get_tenant),
+):
+    """
+    組織内の全ユーザーの月次集計をGROUP BYクエリで返すAPI（実働時間順・ページングはSQLで行う）
+    """
+    try:
+        first, next_first = month_range(year_month)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid format. Use YYYY-MM.")
 
-    # 集計
-    summaries = aggregate_attendance(records_dict)
+    criteria = team_criteria(tenant, first, next_first)
+    etag = attendance_etag(db, "team", *criteria)
+    cached = not_modified(request, response, etag)
+    if cached:
+        return cached
+
+    # 並び替え・ページングもSQLで行い、当該ページの結果をキャッシュする（組織全体の集計）
+    key = summary_cache.month_key(tenant, first.strftime("%Y-%m"), f"team:{order}:{page}:{page_size}", user_id=None)
+    return summary_cache.get_or_compute(key, lambda: build_team_aggregate(
+        db, first.strftime("%Y-%m"), order, page, page_size, *criteria
+    ))
+
+
+def build_team_aggregate(
+    db: Session, year_month: str, order: str, page: int, page_size: int, *criteria
+) -> Dict[str, Any]:
+    """
+    条件に一致する勤怠データのユーザーごとの集計の当該ページと、全ユーザーの統計値を返す。
 
-    return summaries
\ No newline at end of file
+    集計カラムが未計算の勤怠データがある場合は、勤怠データを読み込んでPython集計で計算する。
+    """
+    offset = (page - 1) * page_size
+    dialect = db.get_bind().dialect.name
+    stats = team_aggregate.read_stats(dialect, db.execute(team_aggregate.stats_statement(dialect, *criteria)).all())
+    if stats.pop("unfilled_count"):
+        records = db.scalars(team_aggregate.records_statement(*criteria)).all()
+        result = team_aggregate.team_from_records(records, order, page_size, offset)
+    else:
+        rows = db.execute(team_aggregate.members_statement(order, page_size, offset, *criteria)).all()
+        result = {"total": stats["member_count"], "stats": stats, "members": team_aggregate.read_members(rows)}
+    return {"year_month": year_month, "page": page, "page_size": page_size, **result}
+
+
+def team_criteria(tenant: Tenant, first: date, next_first: date) -> Tuple[Any, Any]:
+    """組織内の全ユーザーの月の勤怠データの条件を返す。"""
+    return (
+        AttendanceRecord.org_id == tenant.org_id,
+        date_range_filter(AttendanceRecord.date, first, next_first),
+    )
+
+
+@router.get("/attendance/summary/cache/stats")
+def get_summary_cache_stats():
+    """
+    月単位の集計キャッシュのヒット・ミス回数と件数を返すAPI
+    """
+    return summary_cache.get_stats()
@@ -0,0 +1,102 @@
+"""
+このモジュールは、ダッシュボード画面の表示に必要なデータを1回で返すAPIを提供します。
+
+月の勤怠データを1回だけ読み込み、営業日カレンダー（休日のインデックス）とあわせて月次集計・
+勤務時間予測・日ごとの集計・休日・累積推移をまとめて計算します（従来は画面から5回のリクエストで取得していました）。
+勤務時間予測と累積推移は予測エンジン（forecast_engine）で計算し、画面側では計算しません。
+"""
+from datetime import date
+from typing import List, Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from sqlalchemy.orm import Session
+
+from database import SessionLocal
+from models import AttendanceRecord
+from modules import business_calendar, summary_cache
+from modules.date_filters import month_range
+from modules.etag import not_modified
+from modules.forecast_engine import ForecastStrategy, StrategyName, get_strategy, strategy_options
+from modules.summary_kernel import AttendanceColumns, aggregate
+from modules.tenant import Tenant, get_tenant
+from routers.attendance_summary import (
+    fetch_history_records,
+    fetch_month_records,
+    forecast_from,
+    history_start,
+    month_day_summaries,
+    user_month_holiday_etag,
+)
+from schemas import DashboardResponse
+
+router = APIRouter()
+
+def get_db():
+    db = SessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+def build_dashboard(
+    db: Session, tenant: Tenant, first: date, next_first: date, strategy: ForecastStrategy, as_of: date
+) -> dict:
+    """月の勤怠データを1回読み込み、営業日カレンダーとあわせてダッシュボードの全項目を計算する。"""
+    records = fetch_month_records(db, tenant, first, next_first)
+    history = fetch_history_records(db, tenant, first, strategy)
+    calendar = business_calendar.get_calendar(db, tenant)
+    return dashboard_from(records, history, calendar, first, next_first, strategy, as_of)
+
+
+def dashboard_from(
+    records: List[AttendanceRecord],
+    history: List[AttendanceRecord],
+    calendar: business_calendar.BusinessCalendar,
+    first: date,
+    next_first: date,
+    strategy: ForecastStrategy,
+    as_of: date,
+) -> dict:
+    """取得済みの月の勤怠データ・直前の実績・営業日カレンダーから、ダッシュボードの全項目を計算する（DBは使わない）。"""
+    # 予測表と累積推移は予測エンジンで同じ計算から作成する
+    forecast = forecast_from(records, history, calendar, first, next_first, strategy, as_of)
+    return {
+        "year_month": first.strftime("%Y-%m"),
+        "aggregate": aggregate(AttendanceColumns.from_records(records)),
+        "forecast": forecast["forecast"],
+        "daily": month_day_summaries(records, first, next_first),
+        "holidays": calendar.holidays_between(first, next_first),
+        "series": forecast["series"],
+        "strategies": strategy_options(),
+    }
+
+
+@router.get("/dashboard/{year_month}", response_model=DashboardResponse)
+def get_dashboard(
+    year_month: str,
+    request: Request,
+    response: Response,
+    strategy: Optional[StrategyName] = Query(None, description="予測方式（省略時はWORK_MANAGER_FORECAST_STRATEGY）"),
+    db: Session = Depends(get_db),
+    tenant: Tenant = Depends(get_tenant),
+):
+    """
+    指定した月のダッシュボード表示用データ（集計・予測・日ごとの集計・休日・累積推移）を返すAPI
+    """
+    try:
+        first, next_first = month_range(year_month)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid format. Use YYYY-MM.")
+    forecast_strategy = get_strategy(strategy)
+
+    # 残りの営業日数は当日から数えるため、日付もETag・キャッシュのキーに含める
+    as_of = date.today()
+    endpoint = f"dashboard:{forecast_strategy.cache_key}:{as_of.isoformat()}"
+    etag = user_month_holiday_etag(db, tenant, endpoint, first, next_first, history_start(first, forecast_strategy))
+    cached = not_modified(request, response, etag)
+    if cached:
+        return cached
+
+    key = summary_cache.month_key(tenant, first.strftime("%Y-%m"), endpoint)
+    return summary_cache.get_or_compute(key, lambda: build_dashboard(db, tenant, first, next_first, forecast_strategy, as_of))
@@ -1,11 +1,18 @@
-from fastapi import APIRouter, HTTPException, Depends
+from fastapi import APIRouter, HTTPException, Depends, Query, Request, Response
+from sqlalchemy import Select, select
 from sqlalchemy.orm import Session
 from datetime import date
-from typing import List
+from typing import Any, Dict, List, Literal, Tuple
 
 from models import Holiday
 from database import SessionLocal
-from schemas import HolidayCreate, HolidayOut
+from schemas import HolidayBulkResponse, HolidayCreate, HolidayOut
+from modules.date_filters import date_range_filter, month_range
+from modules import business_calendar, monthly_rollup, summary_cache
+from modules.etag import make_etag, not_modified, range_validator
+from modules.holidays import get_effective_holidays, holiday_owner_filter, upsert_holidays
+from modules.jp_holidays import MAX_YEAR, MIN_YEAR, japanese_holidays_between
+from modules.tenant import Tenant, get_tenant
 
 router = APIRouter()
 
@@ -16,64 +23,196 @@ def get_db():
     finally:
         db.close()
 
+def holiday_statement(tenant: Tenant, holiday_date: date, scope: str) -> Select:
+    """組織共通（scope="org"）または個人設定（scope="user"）の休日を取得するSELECT文を返す。"""
+    return select(Holiday).where(holiday_owner_filter(tenant, scope), Holiday.date == holiday_date)
+
+def find_holiday(db: Session, tenant: Tenant, holiday_date: date, scope: str):
+    """組織共通（scope="org"）または個人設定（scope="user"）の休日を1件取得する。"""
+    return db.scalars(holiday_statement(tenant, holiday_date, scope)).first()
+
+def scope_statement(tenant: Tenant, scope: str, *criteria) -> Select:
+    """組織共通のみ（scope="org"）または個人設定のみ（scope="user"）の休日を日付順に取得するSELECT文を返す。"""
+    return select(Holiday).where(holiday_owner_filter(tenant, scope), *criteria).order_by(Holiday.date)
+
+def new_holiday(tenant: Tenant, holiday: HolidayCreate) -> Holiday:
+    """登録する休日を作成する（scopeが"user"の場合は利用者の個人設定）。"""
+    return Holiday(
+        org_id=tenant.org_id,
+        user_id=tenant.user_id if holiday.scope == "user" else None,
+        date=holiday.date,
+        name=holiday.name,
+        is_holiday=holiday.is_holiday,
+    )
+
+def holidays_etag(db: Session, tenant: Tenant, scope: str, *criteria) -> str:
+    """対象の休日（組織共通・個人設定）の件数・最終更新日時からETagを作成する。"""
+    return make_etag("holidays", scope, range_validator(db, Holiday, holiday_owner_filter(tenant, scope), *criteria))
+
+def refresh_rollups(db: Session, tenant: Tenant, dates: List[date], scope: str) -> None:
+    """休日の変更を月の集計の休日数に反映する（組織共通の場合は組織内の全ユーザー）。"""
+    monthly_rollup.refresh_holiday_days(db, tenant.org_id, dates, user_id=None if scope == "org" else tenant.user_id)
+
+def invalidate_caches(tenant: Tenant, dates: List[date], scope: str) -> None:
+    """コミットした休日の変更に合わせて、月単位の集計キャッシュと営業日カレンダーを破棄する。"""
+    summary_cache.invalidate_dates(tenant, dates, org_wide=(scope == "org"))
+    business_calendar.invalidate(tenant.org_id, None if scope == "org" else tenant.user_id)
+
 @router.get("/holidays/", response_model=List[HolidayOut])
-def get_holidays(db: Session = Depends(get_db)):
-    return db.query(Holiday).all()
+def get_holidays(
+    request: Request,
+    response: Response,
+    scope: Literal["effective", "org", "user"] = "effective",
+    db: Session = Depends(get_db),
+    tenant: Tenant = Depends(get_tenant),
+):
+    """
+    休日一覧を取得するAPI
+    :param scope: "effective"（個人設定を反映した有効な休日）、"org"（組織共通のみ）、"user"（個人設定のみ）
+    """
+    cached = not_modified(request, response, holidays_etag(db, tenant, scope))
+    if cached:
+        return cached
+    if scope == "effective":
+        return get_effective_holidays(db, tenant)
+    return db.scalars(scope_statement(tenant, scope)).all()
 
 @router.get("/holidays/{year_month}", response_model=List[HolidayOut])
-def get_holidays_by_month(year_month: str, db: Session = Depends(get_db)):
+def get_holidays_by_month(
+    year_month: str,
+    request: Request,
+    response: Response,
+    scope: Literal["effective", "org", "user"] = "effective",
+    db: Session = Depends(get_db),
+    tenant: Tenant = Depends(get_tenant),
+):
     """
     指定した月の祝日を取得するAPI
     :param year_month: "YYYY-MM"形式の文字列
+    :param scope: "effective"（個人設定を反映した有効な休日）、"org"（組織共通のみ）、"user"（個人設定のみ）
     :param db: データベースセッション
     :return: 指定月の祝日リスト
     """
     try:
-        year, month = map(int, year_month.split("-"))
+        first, next_first = month_range(year_month)
     except ValueError:
         raise HTTPException(status_code=400, detail="Invalid year_month format. Use 'YYYY-MM'.")
 
-    holidays = db.query(Holiday).filter(
-        Holiday.date >= date(year, month, 1),
-        Holiday.date < date(year, month + 1, 1) if month < 12 else date(year + 1, 1, 1)
-    ).all()
-
-    return holidays
+    cached = not_modified(
+        request, response, holidays_etag(db, tenant, scope, date_range_filter(Holiday.date, first, next_first))
+    )
+    if cached:
+        return cached
+    if scope == "effective":
+        return get_effective_holidays(db, tenant, first, next_first)
+    return db.scalars(scope_statement(tenant, scope, date_range_filter(Holiday.date, first, next_first))).all()
 
 @router.post("/holidays/", response_model=HolidayOut)
-def add_holiday(holiday: HolidayCreate, db: Session = Depends(get_db)):
-    existing = db.query(Holiday).filter_by(date=holiday.date).first()
+def add_holiday(holiday: HolidayCreate, db: Session = Depends(get_db), tenant: Tenant = Depends(get_tenant)):
+    existing = find_holiday(db, tenant, holiday.date, holiday.scope)
     if existing:
         raise HTTPException(status_code=400, detail="Holiday already exists")
-    new_holiday = Holiday(date=holiday.date, name=holiday.name)
-    db.add(new_holiday)
+    created = new_holiday(tenant, holiday)
+    db.add(created)
+    refresh_rollups(db, tenant, [holiday.date], holiday.scope)
+    db.commit()
+    invalidate_caches(tenant, [holiday.date], holiday.scope)
+    db.refresh(created)
+    return created
+
+def stage_holidays(db: Session, tenant: Tenant, items: List[HolidayCreate]) -> Tuple[List[Dict[str, Any]], Dict[str, List[date]]]:
+    """
+    複数の休日を登録・更新し、月の集計の休日数に反映する（コミットは呼び出し側で行う）。
+
+    Returns:
+        tuple: (upsert_holidaysの処理結果, 設定範囲（"org" / "user"）ごとの変更した日付)
+    """
+    results = upsert_holidays(db, tenant, items)
+    changed = {
+        scope: [r["date"] for r in results if r["scope"] == scope and r["status"] in ("created", "updated")]
+        for scope in ("org", "user")
+    }
+    for scope, dates in changed.items():
+        if dates:
+            refresh_rollups(db, tenant, dates, scope)
+    return results, changed
+
+def finish_bulk_write(tenant: Tenant, results: List[Dict[str, Any]], changed: Dict[str, List[date]]) -> Dict[str, Any]:
+    """コミットした一括登録・更新のキャッシュを破棄し、一括登録レスポンスを返す。"""
+    for scope, dates in changed.items():
+        if dates:
+            invalidate_caches(tenant, dates, scope)
+    counts = {
+        status: sum(1 for r in results if r["status"] == status)
+        for status in ("created", "updated", "unchanged", "skipped")
+    }
+    return {**counts, "results": results}
+
+def bulk_write_holidays(db: Session, tenant: Tenant, items: List[HolidayCreate]) -> Dict[str, Any]:
+    """複数の休日を1つのトランザクションで登録・更新し、一括登録レスポンスを返す。"""
+    results, changed = stage_holidays(db, tenant, items)
     db.commit()
-    db.refresh(new_holiday)
-    return new_holiday
+    return finish_bulk_write(tenant, results, changed)
+
+def national_holiday_items(start_year: int, end_year: int) -> List[HolidayCreate]:
+    """start_year〜end_yearの日本の国民の祝日・休日を、組織共通の休日の登録データにする。"""
+    if start_year > end_year:
+        raise HTTPException(status_code=400, detail="start_year must not be after end_year")
+    return [HolidayCreate(date=day, name=name, scope="org") for day, name in japanese_holidays_between(start_year, end_year)]
+
+@router.post("/holidays/bulk", response_model=HolidayBulkResponse)
+def bulk_upsert_holidays(items: List[HolidayCreate], db: Session = Depends(get_db), tenant: Tenant = Depends(get_tenant)):
+    """
+    複数の休日を1つのトランザクションで登録・更新するAPI（既存の休日は名前・区分を上書き）
+    """
+    return bulk_write_holidays(db, tenant, items)
+
+@router.post("/holidays/national", response_model=HolidayBulkResponse)
+def register_national_holidays(
+    start_year: int = Query(..., ge=MIN_YEAR, le=MAX_YEAR),
+    end_year: int = Query(..., ge=MIN_YEAR, le=MAX_YEAR),
+    db: Session = Depends(get_db),
+    tenant: Tenant = Depends(get_tenant),
+):
+    """
+    start_year〜end_yearの日本の国民の祝日・休日（振替休日・国民の休日を含む）を規則から計算し、
+    組織共通の祝日として一括登録するAPI（外部への通信は行わない）
+    """
+    return bulk_write_holidays(db, tenant, national_holiday_items(start_year, end_year))
 
 @router.put("/holidays/{holiday_date}", response_model=HolidayOut)
-def update_holiday(holiday_date: date, updated_holiday: HolidayCreate, db: Session = Depends(get_db)):
+def update_holiday(holiday_date: date, updated_holiday: HolidayCreate, db: Session = Depends(get_db), tenant: Tenant = Depends(get_tenant)):
     """
     指定した日付の祝日を更新するAPI
     :param holiday_date: 更新対象の日付
-    :param updated_holiday: 更新後の祝日データ
+    :param updated_holiday: 更新後の祝日データ（scopeで組織共通・個人設定を指定）
     :param db: データベースセッション
     :return: 更新された祝日データ
     """
-    holiday = db.query(Holiday).filter_by(date=holiday_date).first()
+    holiday = find_holiday(db, tenant, holiday_date, updated_holiday.scope)
     if not holiday:
         raise HTTPException(status_code=404, detail="Holiday not found")
     
     holiday.name = updated_holiday.name
+    holiday.is_holiday = updated_holiday.is_holiday
+    refresh_rollups(db, tenant, [holiday_date], updated_holiday.scope)
     db.commit()
+    invalidate_caches(tenant, [holiday_date], updated_holiday.scope)
     db.refresh(holiday)
     return holiday
 
 @router.delete("/holidays/{holiday_date}")
-def delete_holiday(holiday_date: date, db: Session = Depends(get_db)):
-    holiday = db.query(Holiday).filter_by(date=holiday_date).first()
+def delete_holiday(
+    holiday_date: date,
+    scope: Literal["org", "user"] = "org",
+    db: Session = Depends(get_db),
+    tenant: Tenant = Depends(get_tenant),
+):
+    holiday = find_holiday(db, tenant, holiday_date, scope)
     if not holiday:
         raise HTTPException(status_code=404, detail="Holiday not found")
     db.delete(holiday)
+    refresh_rollups(db, tenant, [holiday_date], scope)
     db.commit()
-    return {"detail": "Holiday deleted"}
\ No newline at end of file
+    invalidate_caches(tenant, [holiday_date], scope)
+    return {"detail": "Holiday deleted"}
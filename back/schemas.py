@@ -7,15 +7,27 @@ Classes:
     AttendanceCreate: 勤怠新規作成リクエスト用スキーマ。
     AttendanceUpdate: 勤怠更新リクエスト用スキーマ。
     AttendanceOut: 勤怠情報レスポンス用スキーマ。
+    AttendanceBulkItem: 勤怠一括登録リクエストの1件分のスキーマ。
+    AttendanceBulkResult: 勤怠一括登録の1件分の処理結果スキーマ。
+    AttendanceBulkResponse: 勤怠一括登録レスポンス用スキーマ。
+    AttendanceImportError: 勤怠取り込みの1行分のエラースキーマ。
+    AttendanceImportResponse: 勤怠取り込みレスポンス用スキーマ。
     AttendanceSummary: 勤怠情報の集計結果スキーマ。
     AttendanceDaySummaryResponse: 勤怠情報の集計結果レスポンススキーマ。
     MonthlyAggregateSummary: 月次集計結果スキーマ。
+    MonthlyTrendSummary: 月別推移（複数月）の集計結果スキーマ。
+    TeamMemberAggregate: チーム集計の1ユーザー分の月次集計結果スキーマ。
+    TeamAggregateStats: チーム集計の統計値スキーマ。
+    TeamAggregateResponse: チーム集計レスポンス用スキーマ。
+    MonthlyForecast: 月の勤務時間予測スキーマ。
+    CumulativeSeries: 実績・予測勤務時間の累積推移スキーマ。
+    DashboardResponse: ダッシュボード表示用レスポンススキーマ。
     HolidayBase: 休日情報の共通部分を表す基底スキーマ。
     HolidayCreate: 休日新規作成リクエスト用スキーマ。
     HolidayOut: 休日情報レスポンス用スキーマ。
 """
 from pydantic import BaseModel, Field
-from typing import Optional, List
+from typing import Optional, List, Literal
 from datetime import date, time, datetime
 
 # 1件の中断時間（例：休憩や離席）を表すモデル
@@ -76,6 +88,78 @@ class AttendanceOut(AttendanceBase):
     """
     date: date
 
+# 勤怠一括登録リクエスト用
+class AttendanceBulkItem(AttendanceCreate):
+    """
+    モデル: 勤怠一括登録リクエストの1件分
+
+    Attributes:
+        date (date): 勤怠日付。
+    """
+    date: date
+
+# 勤怠一括登録の処理結果
+class AttendanceBulkResult(BaseModel):
+    """
+    モデル: 勤怠一括登録の1件分の処理結果
+
+    Attributes:
+        date (date): 勤怠日付。
+        status (str): 処理結果（"created": 新規作成, "updated": 更新, "skipped": 同じ日付の後続データを採用）。
+    """
+    date: date
+    status: str
+
+class AttendanceBulkResponse(BaseModel):
+    """
+    モデル: 勤怠一括登録レスポンス
+
+    Attributes:
+        created (int): 新規作成した件数。
+        updated (int): 更新した件数。
+        skipped (int): スキップした件数。
+        results (List[AttendanceBulkResult]): リクエスト順の処理結果。
+    """
+    created: int
+    updated: int
+    skipped: int
+    results: List[AttendanceBulkResult]
+
+# 勤怠取り込みのエラー
+class AttendanceImportError(BaseModel):
+    """
+    モデル: 勤怠取り込みの1行分のエラー
+
+    Attributes:
+        line (int): ファイル内の行番号（1始まり）。
+        detail (str): エラー内容。
+    """
+    line: int
+    detail: str
+
+class AttendanceImportResponse(BaseModel):
+    """
+    モデル: 勤怠取り込みレスポンス
+
+    Attributes:
+        total (int): 読み込んだ行数（ヘッダー・空行を除く）。
+        imported (int): 登録・更新した件数。
+        created (int): 新規作成した件数。
+        updated (int): 更新した件数。
+        skipped (int): 同じバッチ内の同じ日付の後続データを採用してスキップした件数。
+        failed (int): 検証・書き込みに失敗した件数。
+        errors (List[AttendanceImportError]): エラー内容（最大max_errors件）。
+        errors_truncated (bool): エラーが多くerrorsに全件を含めていない場合はTrue。
+    """
+    total: int
+    imported: int
+    created: int
+    updated: int
+    skipped: int
+    failed: int
+    errors: List[AttendanceImportError]
+    errors_truncated: bool
+
 # 勤怠情報の集計結果用
 class AttendanceSummary(BaseModel):
     """
@@ -141,6 +225,145 @@ class MonthlyAggregateSummary(BaseModel):
     class Config:
         from_attributes = True  # Pydantic v2対応
 
+class MonthlyTrendSummary(BaseModel):
+    """
+    モデル: 月別推移の1ヶ月分の集計結果
+
+    Attributes:
+        month (str): 対象月（"YYYY-MM"形式）。
+        working_days (int): 勤務日数。
+        work_minutes (int): 勤務時間の合計（分）。
+        break_minutes (int): 休憩時間の合計（分）。
+        interrupt_minutes (int): 中断時間の合計（分）。
+        side_job_minutes (int): 副業時間の合計（分）。
+        actual_work_minutes (int): 実働時間の合計（分）。
+        gross_days (int): 副業のみの日を含む勤務日数。
+        holiday_days (int): 有効な休日の日数（勤怠データのない月は0）。
+    """
+    month: str
+    working_days: int
+    work_minutes: int
+    break_minutes: int
+    interrupt_minutes: int
+    side_job_minutes: int
+    actual_work_minutes: int
+    gross_days: int = 0
+    holiday_days: int = 0
+
+class TeamMemberAggregate(MonthlyAggregateSummary):
+    """
+    モデル: チーム集計の1ユーザー分の月次集計結果
+
+    Attributes:
+        user_id (str): ユーザーID。
+    """
+    user_id: str
+
+class TeamAggregateStats(BaseModel):
+    """
+    モデル: チーム集計の統計値（実働時間）
+
+    Attributes:
+        member_count (int): 勤怠データのあるユーザー数。
+        mean_actual_work_hours (float): 実働時間の平均。
+        median_actual_work_hours (float): 実働時間の中央値。
+        p90_actual_work_hours (float): 実働時間の90パーセンタイル。
+    """
+    member_count: int
+    mean_actual_work_hours: float
+    median_actual_work_hours: float
+    p90_actual_work_hours: float
+
+class TeamAggregateResponse(BaseModel):
+    """
+    モデル: チーム集計レスポンス
+
+    Attributes:
+        year_month (str): 対象月（"YYYY-MM"形式）。
+        page (int): ページ番号（1始まり）。
+        page_size (int): 1ページあたりの件数。
+        total (int): 全ユーザー数。
+        stats (TeamAggregateStats): 全ユーザーの統計値。
+        members (List[TeamMemberAggregate]): 当該ページのユーザー別集計結果。
+    """
+    year_month: str
+    page: int
+    page_size: int
+    total: int
+    stats: TeamAggregateStats
+    members: List[TeamMemberAggregate]
+
+class MonthlyForecast(BaseModel):
+    """
+    モデル: 月の勤務時間予測
+
+    Attributes:
+        year_month (str): 対象月（"YYYY-MM"形式）。
+        registered_work_hours (float): 登録済みの勤務日の実働時間。
+        predicted_work_hours (float): 未登録の平日を含めた予測勤務時間。
+        unregistered_days (int): 未登録の平日の日数。
+        holiday_days (int): 休日の日数。
+        strategy (str): 未登録の平日の予測方式（fixed / trailing / ewma）。
+        remaining_business_days (int): 当日（この日を含む）から月末までの営業日数。
+        strategy_label (str): 予測方式とその設定（時間・週数）の説明。
+        history_days (int): 予測が参照する過去の実績の最大日数（勤怠データの書き込み時に、
+            書き込んだ日からこの日数後までの月の予測が変わる）。
+    """
+    year_month: str
+    registered_work_hours: float
+    predicted_work_hours: float
+    unregistered_days: int
+    holiday_days: int
+    strategy: str = "fixed"
+    remaining_business_days: int = 0
+    strategy_label: str = ""
+    history_days: int = 0
+
+class CumulativeSeries(BaseModel):
+    """
+    モデル: 実績・予測勤務時間の累積推移（列形式）
+
+    Attributes:
+        dates (List[str]): 日付（"YYYY-MM-DD"形式）。
+        actual (List[float]): 実績勤務時間の累積。
+        forecast (List[float]): 予測勤務時間の累積。
+    """
+    dates: List[str]
+    actual: List[float]
+    forecast: List[float]
+
+class ForecastStrategyOption(BaseModel):
+    """
+    モデル: 選択できる予測方式
+
+    Attributes:
+        name (str): APIのstrategyパラメータで指定する名前（fixed / trailing / ewma）。
+        label (str): 予測方式とその設定（時間・週数）の説明。
+    """
+    name: str
+    label: str
+
+class DashboardResponse(BaseModel):
+    """
+    モデル: ダッシュボード表示用レスポンス（1ヶ月分）
+
+    Attributes:
+        year_month (str): 対象月（"YYYY-MM"形式）。
+        aggregate (MonthlyAggregateSummary): 月次集計結果。
+        forecast (MonthlyForecast): 勤務時間予測。
+        daily (List[AttendanceDaySummaryResponse]): 日ごとの勤怠データと集計結果。
+        holidays (List[date]): 有効な休日の日付。
+        series (CumulativeSeries): 実績・予測勤務時間の累積推移。
+        strategies (List[ForecastStrategyOption]): 選択できる予測方式。
+    """
+    year_month: str
+    aggregate: MonthlyAggregateSummary
+    forecast: MonthlyForecast
+    daily: List[AttendanceDaySummaryResponse]
+    holidays: List[date]
+    series: CumulativeSeries
+    strategies: List[ForecastStrategyOption] = []
+
 class HolidayBase(BaseModel):
     """
     モデル: 休日情報の共通部分
@@ -155,8 +378,44 @@ class HolidayBase(BaseModel):
 class HolidayCreate(HolidayBase):
     """
     モデル: 休日新規作成リクエスト用
+
+    Attributes:
+        scope (str): "org"（組織共通）または"user"（リクエストしたユーザー個人の設定）。
+        is_holiday (bool): 休日かどうか（個人設定で組織の祝日を出勤日にする場合はFalse）。
     """
-    pass
+    scope: Literal["org", "user"] = "org"
+    is_holiday: bool = True
+
+class HolidayBulkResult(BaseModel):
+    """
+    モデル: 休日一括登録の1件分の処理結果
+
+    Attributes:
+        date (date): 休日の日付。
+        scope (str): 設定範囲（"org"または"user"）。
+        status (str): 処理結果（"created": 新規作成, "updated": 更新, "unchanged": 変更なし,
+            "skipped": 同じ設定範囲・日付の後続データを採用）。
+    """
+    date: date
+    scope: str
+    status: str
+
+class HolidayBulkResponse(BaseModel):
+    """
+    モデル: 休日一括登録レスポンス
+
+    Attributes:
+        created (int): 新規作成した件数。
+        updated (int): 更新した件数。
+        unchanged (int): 既に同じ内容で登録されていた件数。
+        skipped (int): スキップした件数。
+        results (List[HolidayBulkResult]): リクエスト順の処理結果。
+    """
+    created: int
+    updated: int
+    unchanged: int
+    skipped: int
+    results: List[HolidayBulkResult]
 
 class HolidayOut(HolidayBase):
     """
@@ -164,8 +423,12 @@ class HolidayOut(HolidayBase):
 
     Attributes:
         id (int): 休日のID。
+        user_id (Optional[str]): ユーザーID（組織共通の場合はNone）。
+        is_holiday (bool): 休日かどうか。
     """
     id: int
+    user_id: Optional[str] = None
+    is_holiday: bool = True
 
     class Config:
         from_attributes = True
\ No newline at end of file
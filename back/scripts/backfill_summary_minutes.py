@@ -0,0 +1,87 @@
+"""
+既存の勤怠レコードに集計用カラム（work_minutes, interrupt_minutes, actual_work_minutes）を
+追加・計算する一回限りのバックフィルスクリプト。
+
+集計カラムが存在しない既存DBにはALTER TABLEでカラムを追加してから、
+未計算のレコードをバッチ単位で計算して保存します。
+
+Usage:
+    cd back
+    python -m scripts.backfill_summary_minutes [--batch-size 1000] [--all]
+"""
+import argparse
+
+from sqlalchemy import bindparam, or_, update
+
+from database import SessionLocal, engine
+from models import AttendanceRecord
+from modules.attendance_calc import SUMMARY_MINUTE_COLUMNS, calc_summary_minutes
+from scripts import schema_utils
+
+
+def add_missing_columns() -> list:
+    """attendance_recordsに集計カラムがなければ追加し、追加したカラム名を返す。"""
+    return schema_utils.add_missing_columns(engine, AttendanceRecord.__table__, SUMMARY_MINUTE_COLUMNS)
+
+
+def backfill(batch_size: int = 1000, recompute_all: bool = False) -> int:
+    """
+    集計カラムを計算して保存する。
+
+    Args:
+        batch_size (int): 1トランザクションで更新するレコード数
+        recompute_all (bool): Trueの場合は計算済みのレコードも再計算する
+
+    Returns:
+        int: 更新したレコード数
+    """
+    table = AttendanceRecord.__table__
+    # updated_atは集計カラムの補完では変更しない（onupdateを発火させない）
+    stmt = update(table)\
+        .where(table.c.id == bindparam("_id"))\
+        .values(
+            updated_at=table.c.updated_at,
+            **{name: bindparam(name) for name in SUMMARY_MINUTE_COLUMNS},
+        )
+
+    db = SessionLocal()
+    updated = 0
+    try:
+        # 中断時間は子テーブル（interruptions）からまとめて読み込む
+        query = db.query(AttendanceRecord)
+        if not recompute_all:
+            query = query.filter(or_(*[
+                getattr(AttendanceRecord, name).is_(None) for name in SUMMARY_MINUTE_COLUMNS
+            ]))
+        rows = query.order_by(AttendanceRecord.id).all()
+
+        for i in range(0, len(rows), batch_size):
+            params = [
+                {"_id": row.id, **calc_summary_minutes(
+                    row.start_time, row.end_time, row.break_minutes, row.interruptions
+                )}
+                for row in rows[i:i + batch_size]
+            ]
+            db.execute(stmt, params)
+            db.commit()
+            updated += len(params)
+    finally:
+        db.close()
+    return updated
+
+
+def main():
+    parser = argparse.ArgumentParser(description="勤怠レコードの集計カラムをバックフィルする")
+    parser.add_argument("--batch-size", type=int, default=1000, help="1回のコミットで更新する件数")
+    parser.add_argument("--all", action="store_true", help="計算済みのレコードも再計算する")
+    args = parser.parse_args()
+
+    added = add_missing_columns()
+    if added:
+        print(f"カラムを追加しました: {', '.join(added)}")
+    updated = backfill(batch_size=args.batch_size, recompute_all=args.all)
+    print(f"{updated} 件のレコードを更新しました")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,28 @@
+"""
+既存DBのholidaysテーブルにupdated_atカラム（ETagの計算に使用）を追加するスクリプト。
+
+既存の休日のupdated_atは実行時刻で埋めます。
+
+Usage:
+    cd back
+    python -m scripts.migrate_holiday_updated_at
+"""
+from database import engine
+from models import Holiday, now_local
+from scripts import schema_utils
+
+
+def migrate() -> None:
+    holidays = Holiday.__table__
+    added = schema_utils.add_missing_columns(engine, holidays, ["updated_at"])
+    print(f"追加したカラム: {', '.join(added) or 'なし'}")
+
+    with engine.begin() as conn:
+        result = conn.execute(
+            holidays.update().where(holidays.c.updated_at.is_(None)).values(updated_at=now_local())
+        )
+    print(f"updated_atを設定した休日: {result.rowcount} 件")
+
+
+if __name__ == "__main__":
+    migrate()
@@ -0,0 +1,64 @@
+"""
+単一ユーザー用に作成された既存DBを、複数ユーザー対応のスキーマへ移行するスクリプト。
+
+- attendance_records: user_id, org_idカラムを追加し、dateの一意インデックスを
+  (user_id, date)の複合一意インデックスに置き換える
+- holidays: org_id, user_id, is_holidayカラムを追加し、dateの一意インデックスを
+  組織共通・個人設定ごとの部分一意インデックスに置き換える
+
+既存のデータは既定のユーザー・組織（"default"）のデータ、既存の祝日は組織共通の祝日になります。
+--user-id / --org-id で移行先を変更できます。
+
+Usage:
+    cd back
+    python -m scripts.migrate_multi_user [--user-id default] [--org-id default]
+"""
+import argparse
+
+from sqlalchemy import text
+
+from database import engine
+from models import AttendanceRecord, Holiday
+from modules.tenant import DEFAULT_ORG_ID, DEFAULT_USER_ID
+from scripts import schema_utils
+
+
+def migrate(user_id: str = DEFAULT_USER_ID, org_id: str = DEFAULT_ORG_ID) -> None:
+    attendance = AttendanceRecord.__table__
+    holidays = Holiday.__table__
+
+    added = schema_utils.add_missing_columns(engine, attendance, ["user_id", "org_id"])
+    added += schema_utils.add_missing_columns(engine, holidays, ["org_id", "user_id", "is_holiday"])
+    print(f"追加したカラム: {', '.join(added) or 'なし'}")
+
+    # 既存データの割り当て先を変更する場合（既定値以外）
+    with engine.begin() as conn:
+        if user_id != DEFAULT_USER_ID or org_id != DEFAULT_ORG_ID:
+            conn.execute(
+                text(f"UPDATE {attendance.name} SET user_id = :user_id, org_id = :org_id WHERE user_id = :default"),
+                {"user_id": user_id, "org_id": org_id, "default": DEFAULT_USER_ID},
+            )
+        if org_id != DEFAULT_ORG_ID:
+            conn.execute(
+                text(f"UPDATE {holidays.name} SET org_id = :org_id WHERE org_id = :default"),
+                {"org_id": org_id, "default": DEFAULT_ORG_ID},
+            )
+
+    # dateの一意インデックスは削除して、一意制約なしのインデックスとして作り直す
+    schema_utils.drop_unique_index(engine, attendance, "ix_attendance_records_date")
+    schema_utils.drop_unique_index(engine, holidays, "ix_holidays_date")
+    created = schema_utils.create_missing_indexes(engine, attendance)
+    created += schema_utils.create_missing_indexes(engine, holidays)
+    print(f"作成したインデックス: {', '.join(created) or 'なし'}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="既存DBを複数ユーザー対応のスキーマへ移行する")
+    parser.add_argument("--user-id", default=DEFAULT_USER_ID, help="既存の勤怠データを割り当てるユーザーID")
+    parser.add_argument("--org-id", default=DEFAULT_ORG_ID, help="既存データを割り当てる組織ID")
+    args = parser.parse_args()
+    migrate(args.user_id, args.org_id)
+
+
+if __name__ == "__main__":
+    main()
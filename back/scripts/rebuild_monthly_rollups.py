@@ -0,0 +1,70 @@
+"""
+月の集計（monthly_rollups）を勤怠データ・休日から作り直すスクリプト。
+
+集計は勤怠データ・休日のAPIでの書き込み時に差分で更新されます。スクリプトなどで
+attendance_records・holidaysを直接書き換えた場合や、集計がずれた場合に実行してください。
+--checkを指定すると書き込まずに、現在の集計と作り直した集計の差異を表示します。
+
+Usage:
+    cd back
+    python -m scripts.rebuild_monthly_rollups [--user USER_ID] [--check]
+"""
+import argparse
+import sys
+
+from database import SessionLocal
+from models import MonthlyRollup
+from modules.monthly_rollup import ROLLUP_COLUMNS, rebuild_rollups
+
+COMPARED_COLUMNS = ("org_id",) + ROLLUP_COLUMNS + ("holiday_days",)
+
+
+def snapshot(db, user_id=None) -> dict:
+    """集計を(user_id, year_month)をキーとする辞書で返す。"""
+    query = db.query(MonthlyRollup)
+    if user_id is not None:
+        query = query.filter(MonthlyRollup.user_id == user_id)
+    return {
+        (row.user_id, row.year_month): {name: getattr(row, name) for name in COMPARED_COLUMNS}
+        for row in query
+    }
+
+
+def rebuild(user_id=None, check: bool = False) -> int:
+    """
+    集計を作り直す（check=Trueの場合は書き込まずにロールバックする）。
+
+    Returns:
+        int: 作り直す前の集計と差異のあった行の数
+    """
+    db = SessionLocal()
+    try:
+        before = snapshot(db, user_id)
+        count = rebuild_rollups(db, user_id)
+        after = snapshot(db, user_id)
+        mismatches = 0
+        for key in sorted(set(before) | set(after)):
+            if before.get(key) != after.get(key):
+                mismatches += 1
+                print(f"{key[0]} {key[1]}: {before.get(key)} -> {after.get(key)}")
+        if check:
+            db.rollback()
+        else:
+            db.commit()
+        print(f"{count} 行の集計を{'確認' if check else '作成'}し、{mismatches} 行で差異がありました")
+        return mismatches
+    finally:
+        db.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="月の集計を勤怠データ・休日から作り直す")
+    parser.add_argument("--user", default=None, help="対象のユーザーID（省略時は全ユーザー）")
+    parser.add_argument("--check", action="store_true", help="書き込まずに差異のみ表示する")
+    args = parser.parse_args()
+    mismatches = rebuild(args.user, args.check)
+    sys.exit(1 if args.check and mismatches else 0)
+
+
+if __name__ == "__main__":
+    main()
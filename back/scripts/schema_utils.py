@@ -0,0 +1,73 @@
+"""
+既存DBのスキーマを更新するスクリプト用の共通処理。
+"""
+import os
+from typing import Iterable, List
+
+from alembic import command
+from alembic.config import Config
+from sqlalchemy import Table, inspect, text
+from sqlalchemy.engine import Engine
+from sqlalchemy.schema import CreateColumn
+
+
+# backディレクトリのalembic.ini
+ALEMBIC_INI = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "alembic.ini")
+
+
+def alembic_config(url: str) -> Config:
+    """接続先をurlとするAlembicの設定を返す。"""
+    config = Config(ALEMBIC_INI)
+    config.set_main_option("script_location", os.path.join(os.path.dirname(ALEMBIC_INI), "migrations"))
+    config.set_main_option("sqlalchemy.url", url.replace("%", "%%"))
+    return config
+
+
+def upgrade_to_head(url: str, revision: str = "head") -> None:
+    """接続先のDBをAlembicのマイグレーションで最新のスキーマ（またはrevision）に更新する。"""
+    command.upgrade(alembic_config(url), revision)
+
+
+def stamp(url: str, revision: str) -> None:
+    """接続先のDBのリビジョンを、マイグレーションを実行せずにrevisionとして記録する。"""
+    command.stamp(alembic_config(url), revision)
+
+
+def add_missing_columns(engine: Engine, table: Table, names: Iterable[str]) -> List[str]:
+    """
+    テーブルに存在しないカラムをモデルの定義どおりALTER TABLEで追加し、追加したカラム名を返す。
+
+    NOT NULLのカラムは既存行のためにモデル側でserver_defaultを定義しておくこと。
+    """
+    existing = {c["name"] for c in inspect(engine).get_columns(table.name)}
+    added = []
+    with engine.begin() as conn:
+        for name in names:
+            if name in existing:
+                continue
+            column_ddl = CreateColumn(table.c[name]).compile(dialect=engine.dialect)
+            conn.execute(text(f"ALTER TABLE {table.name} ADD COLUMN {column_ddl}"))
+            added.append(name)
+    return added
+
+
+def drop_unique_index(engine: Engine, table: Table, name: str) -> bool:
+    """一意インデックスが存在すれば削除し、削除したかどうかを返す。"""
+    indexes = {ix["name"]: ix for ix in inspect(engine).get_indexes(table.name)}
+    if name not in indexes or not indexes[name]["unique"]:
+        return False
+    with engine.begin() as conn:
+        conn.execute(text(f"DROP INDEX {name}"))
+    return True
+
+
+def create_missing_indexes(engine: Engine, table: Table) -> List[str]:
+    """モデルに定義されたインデックスのうち、存在しないものを作成して名前を返す。"""
+    existing = {ix["name"] for ix in inspect(engine).get_indexes(table.name)}
+    created = []
+    with engine.begin() as conn:
+        for index in table.indexes:
+            if index.name not in existing:
+                index.create(bind=conn)
+                created.append(index.name)
+    return created
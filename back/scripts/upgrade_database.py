@@ -0,0 +1,62 @@
+"""
+DBをAlembicのマイグレーションで最新のスキーマに更新するスクリプト（Dockerのバックエンドの起動時に実行）。
+
+マイグレーション導入前に作成したDB（テーブルはあるがalembic_versionがないDB）は、
+以下の移行スクリプトでマイグレーション0002の時点のスキーマにしてから0002としてstampし、
+そのうえで最新のスキーマ（head）まで更新します。
+
+- scripts.migrate_holiday_updated_at: holidays.updated_atを追加
+- scripts.migrate_multi_user: user_id・org_idなどのカラムと複合・部分一意インデックスを追加
+- scripts.backfill_summary_minutes: 集計カラムを追加して計算
+
+中断時間のJSONは0003で子テーブルへ移すため、集計カラムの計算は0003の後、
+月の集計を作成する0004の前に行います。
+
+Usage:
+    cd back
+    python -m scripts.upgrade_database
+"""
+from sqlalchemy import inspect
+
+from database import SQLALCHEMY_DATABASE_URL, engine
+from scripts import backfill_summary_minutes, migrate_holiday_updated_at, migrate_multi_user
+from scripts.schema_utils import stamp, upgrade_to_head
+
+# 移行スクリプトで作成できるスキーマのリビジョン
+LEGACY_REVISION = "0002"
+# 中断時間を子テーブルへ移すリビジョン
+INTERRUPTIONS_REVISION = "0003"
+
+
+def is_legacy_database() -> bool:
+    """マイグレーション導入前に作成したDB（テーブルはあるがalembic_versionがない）かどうかを返す。"""
+    tables = set(inspect(engine).get_table_names())
+    return "attendance_records" in tables and "alembic_version" not in tables
+
+
+def adopt_legacy_database() -> None:
+    """
+    マイグレーション導入前のDBを移行スクリプトで0002の時点のスキーマにしてstampし、
+    中断時間を子テーブルへ移す0003まで更新してから集計カラムを計算する。
+    """
+    migrate_holiday_updated_at.migrate()
+    migrate_multi_user.migrate()
+    added = backfill_summary_minutes.add_missing_columns()
+    print(f"追加した集計カラム: {', '.join(added) or 'なし'}")
+    stamp(SQLALCHEMY_DATABASE_URL, LEGACY_REVISION)
+    print(f"リビジョン{LEGACY_REVISION}としてstampしました")
+
+    # 中断時間（JSON）を子テーブルへ移してから、中断時間を含む集計カラムを計算する
+    upgrade_to_head(SQLALCHEMY_DATABASE_URL, INTERRUPTIONS_REVISION)
+    print(f"集計カラムを計算したレコード: {backfill_summary_minutes.backfill()} 件")
+
+
+def main():
+    if is_legacy_database():
+        adopt_legacy_database()
+    # 0004以降（月の集計の作成など）は計算済みの集計カラムから行う
+    upgrade_to_head(SQLALCHEMY_DATABASE_URL)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+"""
+SQL集計（aggregate_attendance_sql）とPython集計（aggregate_attendance）の結果を
+DB内の全ての月について比較するスクリプト。
+中断時間は、集計カラム（interrupt_minutes）と子テーブル（interruptions）のJOINによる合計も比較します。
+
+複数年分のデータに対してSQL集計の値が従来の計算と一致することを確認するために使用します。
+
+Usage:
+    cd back
+    python -m scripts.verify_aggregate_parity [--tolerance 1e-9]
+"""
+import argparse
+import sys
+
+from sqlalchemy import extract
+
+from database import SessionLocal
+from models import AttendanceRecord
+from modules.attendance_aggregate import aggregate_attendance_sql, query_interrupt_totals
+from modules.date_filters import month_filter
+from routers.attendance_summary import aggregate_attendance
+
+
+def verify(tolerance: float = 1e-9) -> int:
+    """
+    ユーザー・月ごとに両方の集計を比較し、差異のある月の数を返す。
+
+    Args:
+        tolerance (float): 時間（float）の比較で許容する誤差
+
+    Returns:
+        int: 差異が見つかった月の数
+    """
+    db = SessionLocal()
+    mismatches = 0
+    try:
+        year_col = extract("year", AttendanceRecord.date)
+        month_col = extract("month", AttendanceRecord.date)
+        months = db.query(AttendanceRecord.user_id, year_col, month_col)\
+            .distinct()\
+            .order_by(AttendanceRecord.user_id, year_col, month_col)\
+            .all()
+
+        for user_id, year, month in months:
+            year, month = int(year), int(month)
+            criteria = (
+                AttendanceRecord.user_id == user_id,
+                month_filter(AttendanceRecord.date, f"{year:04d}-{month:02d}"),
+            )
+            records = [
+                {
+                    "start_time": r.start_time,
+                    "end_time": r.end_time,
+                    "break_minutes": r.break_minutes,
+                    "interruptions": r.interruptions,
+                    "side_job_minutes": r.side_job_minutes,
+                }
+                for r in db.query(AttendanceRecord).filter(*criteria)
+            ]
+            expected = aggregate_attendance(records)
+            actual = aggregate_attendance_sql(db, *criteria)
+
+            diffs = {
+                key: (expected[key], actual[key])
+                for key in expected
+                if abs(expected[key] - actual[key]) > tolerance
+            }
+            joined_interrupt_hours = query_interrupt_totals(db, *criteria)[0].interrupt_minutes / 60
+            if abs(joined_interrupt_hours - actual["interrupt_total_hours"]) > tolerance:
+                diffs["interrupt_total_hours (interruptions)"] = (joined_interrupt_hours, actual["interrupt_total_hours"])
+            if diffs:
+                mismatches += 1
+                print(f"{user_id} {year:04d}-{month:02d}: NG {diffs}")
+        print(f"{len(months)} ヶ月を比較し、{mismatches} ヶ月で差異がありました")
+    finally:
+        db.close()
+    return mismatches
+
+
+def main():
+    parser = argparse.ArgumentParser(description="SQL集計とPython集計の結果を比較する")
+    parser.add_argument("--tolerance", type=float, default=1e-9, help="時間の比較で許容する誤差")
+    args = parser.parse_args()
+    sys.exit(1 if verify(args.tolerance) else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,24 @@
+"""
+テスト共通のフィクスチャ。
+
+各テストはインメモリのSQLite（StaticPoolで1つの接続を共有）に、モデルの定義からテーブルを作成して実行します。
+"""
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+import models  # noqa: F401  Base.metadataにテーブルを登録する
+from database import Base
+
+
+@pytest.fixture
+def db():
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Base.metadata.create_all(engine)
+    session = sessionmaker(autocommit=False, autoflush=False, bind=engine)()
+    try:
+        yield session
+    finally:
+        session.close()
+        engine.dispose()
@@ -0,0 +1,180 @@
+"""
+SQL集計（aggregate_attendance_sql）とPython集計（aggregate_attendance）が一致することのテスト。
+
+どちらも新しい実装のため、合計値は従来のレコードごとのループ（benchmarks.bench_summary_kernel.legacy_aggregate）
+とも比較します。
+"""
+import logging
+from datetime import date
+
+import pytest
+from sqlalchemy import update
+
+from benchmarks.bench_summary_kernel import legacy_aggregate
+from models import AttendanceRecord
+from modules.attendance_aggregate import aggregate_attendance_sql
+from modules.attendance_upsert import upsert_attendance
+from modules.date_filters import month_filter
+from modules.tenant import Tenant
+from routers.attendance_summary import aggregate_attendance
+
+TENANT = Tenant(user_id="alice")
+MONTH = "2025-07"
+
+
+def record(start_time="09:00", end_time="18:00", break_minutes=60, interruptions=(), side_job_minutes=0):
+    return {
+        "start_time": start_time,
+        "end_time": end_time,
+        "break_minutes": break_minutes,
+        "interruptions": [{"start": start, "end": end} for start, end in interruptions],
+        "side_job_minutes": side_job_minutes,
+        "comment": None,
+    }
+
+
+def save(db, records):
+    """{日: 入力データ}を書き込みAPIと同じ処理で登録する。"""
+    upsert_attendance(db, TENANT, [(date(2025, 7, day), data) for day, data in records.items()])
+    db.commit()
+
+
+def criteria():
+    return (AttendanceRecord.user_id == TENANT.user_id, month_filter(AttendanceRecord.date, MONTH))
+
+
+def stored_records(db):
+    return [
+        {
+            "start_time": r.start_time,
+            "end_time": r.end_time,
+            "break_minutes": r.break_minutes,
+            "interruptions": r.interruptions,
+            "side_job_minutes": r.side_job_minutes,
+        }
+        for r in db.query(AttendanceRecord).filter(*criteria())
+    ]
+
+
+def python_aggregate(db):
+    return aggregate_attendance(stored_records(db))
+
+
+def legacy_totals(records):
+    """legacy_aggregateの合計値を集計結果と同じキー（時間単位）に変換する。"""
+    work, break_minutes, interrupt, side_job = legacy_aggregate(records)
+    work_hours = work.total_seconds() / 3600
+    break_hours = break_minutes / 60
+    interrupt_hours = interrupt.total_seconds() / 3600
+    side_job_hours = side_job / 60
+    return {
+        "work_total_hours": work_hours,
+        "break_total_hours": break_hours,
+        "interrupt_total_hours": interrupt_hours,
+        "side_job_total_hours": side_job_hours,
+        "gross_total_hours": work_hours + side_job_hours,
+        "actual_work_hours": work_hours - break_hours - interrupt_hours,
+    }
+
+
+def assert_matches_legacy(result, records):
+    expected = legacy_totals(records)
+    assert {key: result[key] for key in expected} == pytest.approx(expected)
+
+
+def assert_parity(db):
+    expected = python_aggregate(db)
+    actual = aggregate_attendance_sql(db, *criteria())
+    assert actual == pytest.approx(expected)
+    return actual
+
+
+CASES = {
+    "通常の勤務日": {1: record()},
+    "開始・終了がNULL": {1: record(start_time=None, end_time=None, break_minutes=0)},
+    "開始・終了が空文字": {1: record(start_time="", end_time="", break_minutes=0)},
+    "終了のみ空": {1: record(end_time="", break_minutes=0)},
+    "副業のみの日": {1: record(start_time=None, end_time=None, break_minutes=0, side_job_minutes=90)},
+    "勤務なしの休憩": {1: record(start_time=None, end_time=None, break_minutes=30)},
+    "複数の中断": {1: record(interruptions=[("10:00", "10:15"), ("13:00", "13:45"), ("16:30", "17:00")])},
+    "勤務なしの中断": {1: record(start_time=None, end_time=None, break_minutes=0, interruptions=[("10:00", "10:30")])},
+    "組み合わせ": {
+        1: record(),
+        2: record(start_time="", end_time=None, break_minutes=15, side_job_minutes=120),
+        3: record(start_time="10:00", end_time="19:30", interruptions=[("12:00", "12:30"), ("15:00", "15:10")], side_job_minutes=30),
+        4: record(start_time=None, end_time=None, break_minutes=45),
+    },
+}
+
+
+@pytest.mark.parametrize("records", CASES.values(), ids=CASES.keys())
+def test_sql_aggregate_matches_python(db, records):
+    save(db, records)
+    assert_parity(db)
+
+
+@pytest.mark.parametrize("records", CASES.values(), ids=CASES.keys())
+def test_sql_and_python_aggregates_match_legacy(db, records):
+    save(db, records)
+    stored = stored_records(db)
+    assert_matches_legacy(aggregate_attendance_sql(db, *criteria()), stored)
+    assert_matches_legacy(python_aggregate(db), stored)
+
+
+# 書き込みAPIを通らない入力（NULLの数値・中断リスト、不正な時刻など）はPython集計のみで比較する
+RAW_CASES = {
+    "休憩・副業がNULL": [{**record(), "break_minutes": None, "side_job_minutes": None}],
+    "中断がNULL": [{**record(), "interruptions": None}],
+    "中断が空": [record(interruptions=[])],
+    "キーなし": [{}],
+    "中断の時刻が空": [record(interruptions=[("12:00", ""), ("", "")])],
+    "不正な時刻": [record(start_time="9時", end_time="18:00")],
+    "組み合わせ": [
+        record(),
+        {"start_time": "", "end_time": None, "break_minutes": None, "interruptions": None, "side_job_minutes": 60},
+        record(start_time=None, end_time=None, interruptions=[("10:00", "10:20"), ("11:00", "11:05")]),
+    ],
+}
+
+
+@pytest.mark.parametrize("records", RAW_CASES.values(), ids=RAW_CASES.keys())
+def test_python_aggregate_matches_legacy_on_raw_input(records):
+    assert_matches_legacy(aggregate_attendance(records), records)
+
+
+def test_side_job_only_day_counts_as_gross_day(db):
+    save(db, CASES["副業のみの日"])
+    result = assert_parity(db)
+    assert (result["work_days"], result["gross_days"]) == (0, 1)
+    assert result["gross_total_hours"] == pytest.approx(1.5)
+
+
+def test_break_without_work_reduces_actual_hours(db):
+    save(db, CASES["勤務なしの休憩"])
+    result = assert_parity(db)
+    assert result["work_days"] == 0
+    assert result["actual_work_hours"] == pytest.approx(-0.5)
+
+
+def test_multiple_interruptions_are_summed(db):
+    save(db, CASES["複数の中断"])
+    result = assert_parity(db)
+    assert result["interrupt_total_hours"] == pytest.approx(1.5)
+    assert result["actual_work_hours"] == pytest.approx(6.5)
+
+
+def test_unfilled_summary_columns_fall_back_to_python(db, caplog):
+    save(db, CASES["組み合わせ"])
+    # 集計カラムを補完していない既存レコードを再現する
+    db.execute(
+        update(AttendanceRecord)
+        .where(AttendanceRecord.date.in_([date(2025, 7, 1), date(2025, 7, 3)]))
+        .values(work_minutes=None, interrupt_minutes=None, actual_work_minutes=None)
+    )
+    db.commit()
+
+    with caplog.at_level(logging.WARNING, logger="modules.attendance_aggregate"):
+        result = assert_parity(db)
+    assert "2 件" in caplog.text
+    assert_matches_legacy(result, stored_records(db))
+    assert result["work_days"] == 2
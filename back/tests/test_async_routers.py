@@ -0,0 +1,114 @@
+"""
+非同期のルータ（routers.async_*）の読み取り・計算が同期版と一致することのテスト。
+
+同じSQLiteのファイルに同期（Session）と非同期（AsyncSession、aiosqlite）の両方で接続して比較します。
+"""
+import asyncio
+from datetime import date
+
+import pytest
+from sqlalchemy import create_engine, update
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.orm import sessionmaker
+
+import models  # noqa: F401  Base.metadataにテーブルを登録する
+from database import Base
+from models import AttendanceRecord, Holiday
+from modules import business_calendar, summary_cache
+from modules.attendance_upsert import upsert_attendance
+from modules.forecast_engine import get_strategy
+from modules.tenant import Tenant
+from routers import async_attendance_summary, attendance_summary
+
+TENANT = Tenant(user_id="alice")
+FIRST, NEXT_FIRST = date(2025, 7, 1), date(2025, 8, 1)
+
+
+@pytest.fixture
+def sessions(tmp_path):
+    """同じDBファイルに接続した(Session, async_sessionmaker)を返す（勤怠データと休日を登録済み）。"""
+    url = f"sqlite:///{tmp_path / 'attendance.db'}"
+    engine = create_engine(url)
+    Base.metadata.create_all(engine)
+    db = sessionmaker(autocommit=False, autoflush=False, bind=engine)()
+    for user_id, days in {"alice": range(1, 10), "bob": range(2, 6)}.items():
+        upsert_attendance(db, Tenant(user_id=user_id), [
+            (date(2025, 6, 20 + day % 10) if day % 3 == 0 else date(2025, 7, day),
+             {"start_time": "09:00", "end_time": f"{17 + day % 3:02d}:00", "break_minutes": 60,
+              "interruptions": [{"start": "12:00", "end": "12:15"}] if day % 2 else []})
+            for day in days
+        ])
+    db.add(Holiday(org_id="default", date=date(2025, 7, 21), name="海の日"))
+    db.commit()
+    async_engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'attendance.db'}")
+    business_calendar.clear()
+    summary_cache.clear()
+    try:
+        yield db, async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+    finally:
+        db.close()
+        engine.dispose()
+        asyncio.run(async_engine.dispose())
+
+
+def run(async_sessions, build):
+    async def main():
+        async with async_sessions() as db:
+            return await build(db)
+    return asyncio.run(main())
+
+
+@pytest.mark.parametrize("strategy", ["fixed", "trailing", "ewma"])
+def test_forecast_matches_sync(sessions, strategy):
+    db, async_sessions = sessions
+    forecast_strategy = get_strategy(strategy)
+    as_of = date(2025, 7, 10)
+    expected = attendance_summary.month_forecast(
+        db, TENANT, attendance_summary.fetch_month_records(db, TENANT, FIRST, NEXT_FIRST),
+        FIRST, NEXT_FIRST, forecast_strategy, as_of,
+    )
+    business_calendar.clear()
+
+    async def build(adb):
+        records = await async_attendance_summary.fetch_month_records(adb, TENANT, FIRST, NEXT_FIRST)
+        return await async_attendance_summary.month_forecast(adb, TENANT, records, FIRST, NEXT_FIRST, forecast_strategy, as_of)
+    assert run(async_sessions, build) == expected
+
+
+def test_etag_matches_sync(sessions):
+    db, async_sessions = sessions
+    expected = attendance_summary.user_month_holiday_etag(db, TENANT, "forecast", FIRST, NEXT_FIRST, date(2025, 6, 1))
+    actual = run(async_sessions, lambda adb: async_attendance_summary.user_month_holiday_etag(
+        adb, TENANT, "forecast", FIRST, NEXT_FIRST, date(2025, 6, 1)
+    ))
+    assert actual == expected
+
+
+@pytest.mark.parametrize("unfilled", [False, True])
+def test_team_aggregate_matches_sync(sessions, unfilled):
+    db, async_sessions = sessions
+    if unfilled:
+        db.execute(update(AttendanceRecord).where(AttendanceRecord.date == date(2025, 7, 2)).values(work_minutes=None))
+        db.commit()
+    criteria = attendance_summary.team_criteria(TENANT, FIRST, NEXT_FIRST)
+    expected = attendance_summary.build_team_aggregate(db, "2025-07", "asc", 1, 1, *criteria)
+    actual = run(async_sessions, lambda adb: async_attendance_summary.build_team_aggregate(adb, "2025-07", "asc", 1, 1, *criteria))
+    assert actual == expected
+
+
+def test_async_get_or_compute_skips_store_after_invalidation():
+    summary_cache.clear()
+    key = summary_cache.month_key(TENANT, "2025-07", "test")
+
+    async def compute():
+        # 計算中に同じ月への書き込みがあった場合
+        summary_cache.invalidate_dates(TENANT, [FIRST])
+        return "stale"
+
+    assert asyncio.run(summary_cache.async_get_or_compute(key, compute)) == "stale"
+
+    async def fresh():
+        return "fresh"
+
+    assert asyncio.run(summary_cache.async_get_or_compute(key, fresh)) == "fresh"
+    assert asyncio.run(summary_cache.async_get_or_compute(key, compute)) == "fresh"
@@ -0,0 +1,52 @@
+"""
+営業日カレンダー（BusinessCalendar）のテスト。
+"""
+import random
+from datetime import date, timedelta
+
+import pytest
+
+from modules.business_calendar import BusinessCalendar
+
+# 2025-07-21（月）の海の日、2025-07-26（土）の休日、2025-08-11（月）の山の日
+CALENDAR = BusinessCalendar([date(2025, 7, 21), date(2025, 7, 26), date(2025, 8, 11)])
+
+
+def naive_business_days(calendar, start, end):
+    """1日ずつ判定した営業日数。"""
+    return sum(calendar.is_business_day(start + timedelta(days=i)) for i in range((end - start).days))
+
+
+def test_business_days_match_day_by_day_count():
+    rng = random.Random(0)
+    for _ in range(200):
+        start = date(2025, 6, 1) + timedelta(days=rng.randint(0, 120))
+        end = start + timedelta(days=rng.randint(0, 90))
+        expected = naive_business_days(CALENDAR, start, end)
+        assert CALENDAR.business_days(start, end) == expected
+        mask = CALENDAR.business_day_mask(start, end)
+        assert len(mask) == (end - start).days
+        assert int(mask.sum()) == expected
+
+
+def test_business_day_mask_excludes_weekends_and_holidays():
+    mask = CALENDAR.business_day_mask(date(2025, 7, 19), date(2025, 7, 23))
+    # 7/19（土）、7/20（日）、7/21（海の日）、7/22（火）
+    assert mask.tolist() == [False, False, False, True]
+    assert CALENDAR.business_day_mask(date(2025, 7, 2), date(2025, 7, 1)).tolist() == []
+
+
+@pytest.mark.parametrize("as_of, expected", [
+    (date(2025, 6, 15), 22),  # 月初より前は月全体
+    (date(2025, 7, 1), 22),
+    (date(2025, 7, 21), 8),   # 当日が休日（7/22〜7/31の営業日）
+    (date(2025, 7, 31), 1),   # 当日を含む
+    (date(2025, 8, 1), 0),    # 月末より後
+])
+def test_remaining_business_days(as_of, expected):
+    assert CALENDAR.remaining_business_days("2025-07", as_of) == expected
+
+
+def test_remaining_business_days_rejects_invalid_month():
+    with pytest.raises(ValueError):
+        CALENDAR.remaining_business_days("2025-13", date(2025, 7, 1))
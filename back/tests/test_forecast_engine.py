@@ -0,0 +1,52 @@
+"""
+予測エンジン（forecast_range）のテスト。
+"""
+from datetime import date
+
+import pytest
+
+from modules.business_calendar import BusinessCalendar
+from modules.forecast_engine import FixedHours, forecast_range
+
+
+class Record:
+    """forecast_rangeに渡す勤怠データ（AttendanceRecordと同じ属性を持つ）。"""
+
+    def __init__(self, day, start_time="09:00", end_time="18:00", break_minutes=60):
+        self.date = day
+        self.start_time = start_time
+        self.end_time = end_time
+        self.break_minutes = break_minutes
+        self.side_job_minutes = 0
+        self.interruption_rows = []
+
+
+# 2025-07: 営業日は23日（7/21の海の日を除くと22日）
+CALENDAR = BusinessCalendar([date(2025, 7, 21), date(2025, 7, 26)])
+START, END = date(2025, 7, 1), date(2025, 8, 1)
+
+
+def test_unregistered_days_use_calendar_business_days():
+    # 平日の勤務日2日、土曜日の勤務日1日、勤務なしの平日1日（未登録として数える）
+    records = [
+        Record(date(2025, 7, 1)),
+        Record(date(2025, 7, 2)),
+        Record(date(2025, 7, 5)),
+        Record(date(2025, 7, 3), start_time=None, end_time=None, break_minutes=0),
+    ]
+    result = forecast_range(records, [], CALENDAR, START, END, FixedHours(8))
+    forecast = result["forecast"]
+
+    assert CALENDAR.business_days(START, END) == 22
+    assert forecast["unregistered_days"] == 20
+    assert forecast["holiday_days"] == 2
+    assert forecast["registered_work_hours"] == pytest.approx(24)
+    assert forecast["predicted_work_hours"] == pytest.approx(24 + 20 * 8)
+    # 累積推移の最終値は予測表の予測時間と一致する
+    assert result["series"]["forecast"][-1] == pytest.approx(forecast["predicted_work_hours"])
+
+
+def test_empty_month_forecasts_every_business_day():
+    result = forecast_range([], [], CALENDAR, START, END, FixedHours(7.5))
+    assert result["forecast"]["unregistered_days"] == 22
+    assert result["forecast"]["predicted_work_hours"] == pytest.approx(22 * 7.5)
@@ -0,0 +1,85 @@
+"""
+チーム集計（build_team_aggregate）のテスト。
+"""
+import logging
+from datetime import date
+
+import pytest
+from sqlalchemy import update
+
+from models import AttendanceRecord
+from modules.attendance_aggregate import aggregate_attendance_sql
+from modules.attendance_upsert import upsert_attendance
+from modules.date_filters import date_range_filter
+from modules.tenant import Tenant
+from routers.attendance_summary import build_team_aggregate
+
+FIRST, NEXT_FIRST = date(2025, 7, 1), date(2025, 8, 1)
+# ユーザーごとの勤務日数（1日8時間、bobとcarolは同じ実働時間）
+WORK_DAYS = {"alice": 3, "bob": 5, "carol": 5, "dave": 1, "erin": 8}
+
+
+def criteria():
+    return (AttendanceRecord.org_id == "default", date_range_filter(AttendanceRecord.date, FIRST, NEXT_FIRST))
+
+
+@pytest.fixture
+def team(db):
+    for user_id, days in WORK_DAYS.items():
+        upsert_attendance(db, Tenant(user_id=user_id), [
+            (date(2025, 7, day), {"start_time": "09:00", "end_time": "18:00", "break_minutes": 60, "interruptions": []})
+            for day in range(1, days + 1)
+        ])
+    db.commit()
+    return db
+
+
+def user_monthly(db, user_id):
+    return aggregate_attendance_sql(db, AttendanceRecord.user_id == user_id, *criteria())
+
+
+def test_members_are_sorted_and_paged_in_sql(team):
+    result = build_team_aggregate(team, "2025-07", "desc", 1, 2, *criteria())
+    assert result["total"] == 5
+    assert [m["user_id"] for m in result["members"]] == ["erin", "bob"]
+    result = build_team_aggregate(team, "2025-07", "desc", 2, 2, *criteria())
+    assert [m["user_id"] for m in result["members"]] == ["carol", "alice"]
+    result = build_team_aggregate(team, "2025-07", "asc", 1, 3, *criteria())
+    assert [m["user_id"] for m in result["members"]] == ["dave", "alice", "bob"]
+    assert build_team_aggregate(team, "2025-07", "asc", 3, 3, *criteria())["members"] == []
+    for member in result["members"]:
+        assert {k: v for k, v in member.items() if k != "user_id"} == user_monthly(team, member["user_id"])
+
+
+def test_stats_use_linear_percentiles(team):
+    stats = build_team_aggregate(team, "2025-07", "desc", 1, 1, *criteria())["stats"]
+    # 実働時間: 8, 24, 40, 40, 64
+    assert stats == pytest.approx({
+        "member_count": 5,
+        "mean_actual_work_hours": 35.2,
+        "median_actual_work_hours": 40.0,
+        "p90_actual_work_hours": 54.4,
+    })
+
+
+def test_empty_month(db):
+    result = build_team_aggregate(db, "2025-07", "desc", 1, 50, *criteria())
+    assert result["total"] == 0 and result["members"] == []
+    assert result["stats"]["median_actual_work_hours"] == 0.0
+
+
+def test_unfilled_summary_columns_match_monthly_aggregate(team, caplog):
+    # bobの集計カラムを補完していない既存レコードを再現する（SQLの合計ではbobの勤務時間が0になる）
+    team.execute(
+        update(AttendanceRecord).where(AttendanceRecord.user_id == "bob")
+        .values(work_minutes=None, interrupt_minutes=None, actual_work_minutes=None)
+    )
+    team.commit()
+
+    with caplog.at_level(logging.WARNING):
+        result = build_team_aggregate(team, "2025-07", "desc", 1, 50, *criteria())
+    assert "Python集計" in caplog.text
+    assert [m["user_id"] for m in result["members"]] == ["erin", "bob", "carol", "alice", "dave"]
+    for member in result["members"]:
+        assert {k: v for k, v in member.items() if k != "user_id"} == pytest.approx(user_monthly(team, member["user_id"]))
+    assert result["stats"]["median_actual_work_hours"] == pytest.approx(40.0)
@@ -2,9 +2,9 @@ import streamlit as st
 from datetime import datetime, time, date
 import pandas as pd
 
-from modules.api_client import fetch_attendance_data, fetch_monthly_attendance, save_attendance, fetch_daily_summary
+from modules.api_client import fetch_attendance_data, fetch_input_page_data, save_attendance
 from modules.session import init_session_state
-from modules.ui_components import show_last_updated, show_attendance_form, render_calendar_only, get_safe
+from modules.ui_components import show_last_updated, show_attendance_form, render_calendar_only, get_safe, render_user_selector
 from settings import API_URL, DEFAULT_START_TIME, DEFAULT_END_TIME, DEFAULT_BREAK_MINUTES, DEFAULT_SIDE_JOB_MINUTES, DEFAULT_START_INTERRUPTION, DEFAULT_END_INTERRUPTION, DEFAULT_INTERRUPTION
 
 
@@ -17,13 +17,13 @@ session_state_list = ["last_payload", "saved", "deleted", "error"]
 
 # ページ遷移時にセッションステートを初期化する
 init_session_state(PAGE_NAME, session_state_list)
+render_user_selector()
 
 st.title("勤怠入力")
 record_date: date = st.date_input("対象日付", date.today())
 
-# --- カレンダー用データの取得 ---
-month_str = record_date.strftime("%Y-%m")
-records = fetch_monthly_attendance(month_str)
+# --- カレンダー用の月データと対象日のサマリーを並行して取得 ---
+records, data = fetch_input_page_data(record_date)
 
 # 日付入力
 input_dates_set = set(pd.to_datetime([
@@ -33,8 +33,7 @@ input_dates_set = set(pd.to_datetime([
 render_calendar_only(record_date.year, record_date.month, input_dates_set, select_key="selected_date")
 
 
-# 勤怠データをサマリーAPIから取得
-data = fetch_daily_summary(record_date)
+# 勤怠データ（サマリーAPIから取得済み）
 if data is None:
     st.error("データ取得に失敗したため、入力欄を表示できません。")
     st.stop()
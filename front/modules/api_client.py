@@ -1,8 +1,309 @@
 import requests
-from datetime import datetime, time, date
-from typing import Any, Dict, List, Optional
+from collections import OrderedDict, defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, time, date, timedelta
+from threading import Lock, local
+from typing import Any, Dict, Hashable, Iterable, List, Optional, Tuple
 import streamlit as st
-from settings import API_URL
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from settings import (
+    API_URL,
+    CACHE_MAX_ENTRIES,
+    CACHE_TTL_SECONDS,
+    HTTP_BACKOFF_FACTOR,
+    HTTP_POOL_SIZE,
+    HTTP_RETRIES,
+    HTTP_TIMEOUT,
+    ORG_ID,
+)
+from modules.session import api_headers, get_user_id
+
+# ETagで検証済みのレスポンスを保持する件数（プロセス内で共有）
+VALIDATOR_CACHE_SIZE = 256
+
+
+class TimeoutHTTPAdapter(HTTPAdapter):
+    """タイムアウトが指定されていないリクエストに既定のタイムアウトを設定するアダプタ。"""
+
+    def __init__(self, *args, timeout=None, **kwargs):
+        self.timeout = timeout
+        super().__init__(*args, **kwargs)
+
+    def send(self, request, **kwargs):
+        if kwargs.get("timeout") is None:
+            kwargs["timeout"] = self.timeout
+        return super().send(request, **kwargs)
+
+
+@st.cache_resource
+def get_http_session() -> requests.Session:
+    """
+    APIとの通信に使用するSessionを返す（Streamlitのサーバープロセスごとに1つ）。
+
+    接続をプールして使い回し（keep-alive）、タイムアウトと、
+    接続エラー・502/503/504に対する指数バックオフ付きの再試行を設定する。
+    """
+    retry = Retry(
+        total=HTTP_RETRIES,
+        backoff_factor=HTTP_BACKOFF_FACTOR,
+        status_forcelist=(502, 503, 504),
+        # 応答後の再試行は冪等なメソッドのみ（接続エラーはメソッドによらず再試行される）
+        allowed_methods=frozenset({"GET", "HEAD", "PUT", "DELETE"}),
+        raise_on_status=False,
+    )
+    adapter = TimeoutHTTPAdapter(
+        pool_connections=HTTP_POOL_SIZE, pool_maxsize=HTTP_POOL_SIZE, max_retries=retry, timeout=HTTP_TIMEOUT
+    )
+    session = requests.Session()
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+class ApiResponseError(Exception):
+    """APIが200以外を返したことを表す例外（キャッシュには保存されない）。"""
+
+    def __init__(self, status_code: int, text: str):
+        super().__init__(f"{status_code}: {text}")
+        self.status_code = status_code
+        self.text = text
+
+
+class _ValidatorStore:
+    """ETagと、そのETagで返されたJSONを保持する（プロセス内で共有、件数上限付き）。"""
+
+    def __init__(self, maxsize: int):
+        self.maxsize = maxsize
+        self._entries: "OrderedDict[Hashable, Tuple[str, Any]]" = OrderedDict()
+        self._lock = Lock()
+
+    def get(self, key: Hashable) -> Optional[Tuple[str, Any]]:
+        with self._lock:
+            return self._entries.get(key)
+
+    def set(self, key: Hashable, value: Tuple[str, Any]) -> None:
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+
+@st.cache_resource
+def _validator_store() -> _ValidatorStore:
+    return _ValidatorStore(VALIDATOR_CACHE_SIZE)
+
+
+@st.cache_resource
+def _data_versions() -> Dict[Hashable, int]:
+    """月ごとのデータのバージョン（書き込み時に更新し、キャッシュのキーに含める）。"""
+    return defaultdict(int)
+
+
+_versions_lock = Lock()
+
+
+def _version_keys(year_month: str, depends: Iterable[str]) -> List[Hashable]:
+    keys = []
+    for kind in depends:
+        if kind == "attendance":
+            keys.append(("attendance", get_user_id(), year_month))
+        elif kind == "holidays":
+            # 組織共通の祝日の変更は組織内の全ユーザーに影響する
+            keys.append(("holidays", ORG_ID, year_month))
+    return keys
+
+
+def data_version(year_month: str, depends: Iterable[str] = ("attendance",)) -> Tuple[int, ...]:
+    """指定月のデータのバージョンを返す（dependsは"attendance"・"holidays"）。"""
+    versions = _data_versions()
+    return tuple(versions[key] for key in _version_keys(year_month, depends))
+
+
+@st.cache_resource
+def _forecast_settings() -> Dict[str, int]:
+    """APIの予測のレスポンスから読み取った設定（プロセス内で共有）。"""
+    return {"history_days": 0}
+
+
+def remember_forecast_settings(forecast: Optional[Dict[str, Any]]) -> None:
+    """
+    予測（MonthlyForecast）のhistory_daysを保存する（invalidate_monthで無効にする月の範囲に使う）。
+
+    予測をキャッシュに載せるfetch関数が取得のたびに呼ぶため、このプロセスに予測のキャッシュが
+    あれば、その予測を返したAPIの設定が保存されている。
+    """
+    if not forecast:
+        return
+    settings = _forecast_settings()
+    with _versions_lock:
+        settings["history_days"] = max(settings["history_days"], int(forecast.get("history_days") or 0))
+
+
+def _forecast_months(month: Any) -> List[str]:
+    """
+    勤怠データの書き込みで予測が変わる月（対象月から、APIが返したhistory_days日後まで）を返す。
+
+    予測（trailing・ewma）は直前の実績を参照するため、バックエンドのキャッシュと同じ範囲を無効にする。
+    日付を含まない"YYYY-MM"の場合は月末の書き込みとして扱う。
+    """
+    value = str(month)
+    if len(value) >= 10:
+        day = date.fromisoformat(value[:10])
+    else:
+        year, mon = map(int, value[:7].split("-"))
+        day = date(year + mon // 12, mon % 12 + 1, 1) - timedelta(days=1)
+    last = day + timedelta(days=_forecast_settings()["history_days"])
+    months = []
+    current = date(day.year, day.month, 1)
+    while current <= last:
+        months.append(current.strftime("%Y-%m"))
+        current = date(current.year + current.month // 12, current.month % 12 + 1, 1)
+    return months
+
+
+def invalidate_month(month: Any, depends: Iterable[str] = ("attendance",)) -> None:
+    """
+    指定月のデータのバージョンを更新し、その月のキャッシュを無効にする。
+
+    勤怠データ（"attendance"）の場合は、直前の実績を参照する予測のため、
+    APIが返したhistory_days日後までの月も無効にする。
+
+    Args:
+        month: 対象月を含む日付（date型、"YYYY-MM-DD"または"YYYY-MM"形式の文字列）
+        depends: 変更したデータの種類（"attendance"・"holidays"）
+    """
+    year_month = str(month)[:7]
+    keys = _version_keys(year_month, depends)
+    if "attendance" in depends:
+        for following in _forecast_months(month)[1:]:
+            keys += _version_keys(following, ("attendance",))
+    versions = _data_versions()
+    with _versions_lock:
+        for key in keys:
+            versions[key] += 1
+
+
+class _CacheMiss(Exception):
+    """prefetch_jsonの確認で、キャッシュにない（通信が必要な）ことを表す例外（キャッシュには保存されない）。"""
+
+
+# prefetch_jsonがメインスレッドから_cached_get_jsonに渡す状態（スクリプトの実行スレッドごと）
+#   probing: Trueの場合、キャッシュにないときは通信せずに_CacheMissを送出する
+#   response: 別スレッドで取得済みの(送信時の保存済みのETagとJSON, レスポンス)
+_prefetch_state = local()
+
+
+def _request_headers(user_id: str, org_id: str, stored: Optional[Tuple[str, Any]]) -> Dict[str, str]:
+    headers = {"X-User-Id": user_id, "X-Org-Id": org_id}
+    if stored:
+        headers["If-None-Match"] = stored[0]
+    return headers
+
+
+@st.cache_data(ttl=CACHE_TTL_SECONDS, max_entries=CACHE_MAX_ENTRIES, show_spinner=False)
+def _cached_get_json(url: str, user_id: str, org_id: str, version: Tuple[int, ...]) -> Any:
+    """
+    JSONを取得する（URL・利用者・データのバージョンごとにTTLの間キャッシュ）。
+
+    TTL切れの再取得では前回のETagをIf-None-Matchで送信し、304（未変更）の場合は
+    保存済みのJSONを使用する（本文の転送・JSONの解析を省略）。
+    200以外の場合はApiResponseErrorを送出する（キャッシュされない）。
+    prefetch_jsonからの呼び出しでは、通信せずに_prefetch_stateの状態を使う。
+    """
+    key = (user_id, url)
+    validators = _validator_store()
+    prefetched = getattr(_prefetch_state, "response", None)
+    if prefetched is not None:
+        stored, res = prefetched
+    elif getattr(_prefetch_state, "probing", False):
+        raise _CacheMiss()
+    else:
+        stored = validators.get(key)
+        res = get_http_session().get(url, headers=_request_headers(user_id, org_id, stored))
+
+    if res.status_code == 304 and stored:
+        return stored[1]
+    if res.status_code != 200:
+        raise ApiResponseError(res.status_code, res.text)
+
+    data = res.json()
+    etag = res.headers.get("ETag")
+    if etag:
+        validators.set(key, (etag, data))
+    return data
+
+
+def _cache_args(url: str, year_month: str, depends: Iterable[str]) -> Tuple[str, str, str, Tuple[int, ...]]:
+    headers = api_headers()
+    return url, headers["X-User-Id"], headers["X-Org-Id"], data_version(year_month, depends)
+
+
+def get_json(url: str, year_month: str, depends: Iterable[str] = ("attendance",)) -> Tuple[int, Any, str]:
+    """
+    キャッシュを通してJSONを取得する。
+
+    キャッシュのキーには指定月のデータのバージョンを含むため、invalidate_monthで
+    更新されるまで（またはTTLが切れるまで）はAPIへの通信を行わない。
+
+    Args:
+        url (str): 取得するURL
+        year_month (str): データの対象月（"YYYY-MM"形式）
+        depends (Iterable[str]): 依存するデータの種類（"attendance"・"holidays"）
+
+    Returns:
+        tuple: (ステータスコード, JSON（200以外はNone）, エラー時のレスポンス本文)
+    """
+    try:
+        return 200, _cached_get_json(*_cache_args(url, year_month, depends)), ""
+    except ApiResponseError as e:
+        return e.status_code, None, e.text
+
+
+def prefetch_json(*specs: Tuple[str, str, Iterable[str]]) -> None:
+    """
+    (url, year_month, depends)の組を並行して取得し、キャッシュに載せる。
+
+    キャッシュ済みのものは通信しない。別スレッドにはScriptRunContextがないため、
+    別スレッドではrequestsでの通信のみを行い、キャッシュの確認・保存（st.cache_data・st.cache_resourceの
+    呼び出し）はメインスレッドで行う。エラー表示などは、続けて呼ぶ各fetch関数がメインスレッドで行う。
+    """
+    args = [_cache_args(url, year_month, depends) for url, year_month, depends in specs]
+    missing = []
+    _prefetch_state.probing = True
+    try:
+        for a in args:
+            try:
+                _cached_get_json(*a)
+            except _CacheMiss:
+                missing.append(a)
+            except Exception:
+                # エラーはfetch関数での再取得時に表示する
+                pass
+    finally:
+        _prefetch_state.probing = False
+    if not missing:
+        return
+
+    session = get_http_session()
+    validators = _validator_store()
+    requests_to_send = []
+    for url, user_id, org_id, version in missing:
+        stored = validators.get((user_id, url))
+        requests_to_send.append((stored, url, _request_headers(user_id, org_id, stored)))
+    with ThreadPoolExecutor(max_workers=len(requests_to_send)) as executor:
+        futures = [executor.submit(session.get, url, headers=headers) for _, url, headers in requests_to_send]
+
+    for a, (stored, _, _), future in zip(missing, requests_to_send, futures):
+        try:
+            _prefetch_state.response = (stored, future.result())
+            _cached_get_json(*a)
+        except Exception:
+            # エラーはfetch関数での再取得時に表示する
+            pass
+        finally:
+            _prefetch_state.response = None
 
 
 def fetch_attendance_data(record_date: date) -> Optional[Dict[str, Any]]:
@@ -16,13 +317,13 @@ def fetch_attendance_data(record_date: date) -> Optional[Dict[str, Any]]:
         dict or None: 勤怠データ（存在しない場合は空dict、失敗時はNone）
     """
     try:
-        res = requests.get(f"{API_URL}/attendance/{record_date.isoformat()}")
-        if res.status_code == 200:
-            return res.json()
-        elif res.status_code == 404:
+        status, data, _ = get_json(f"{API_URL}/attendance/{record_date.isoformat()}", record_date.strftime("%Y-%m"))
+        if status == 200:
+            return data
+        elif status == 404:
             return {}
         else:
-            st.warning(f"データ取得失敗: {res.status_code}")
+            st.warning(f"データ取得失敗: {status}")
             return None
     except Exception as e:
         st.error(f"取得失敗: {e}")
@@ -42,8 +343,9 @@ def save_attendance(record_date, payload: Dict[str, Any], api_url: str) -> bool:
         bool: 保存成功時はTrue、失敗時はFalse
     """
     try:
-        res = requests.post(f"{api_url}/attendance/{record_date}", json=payload)
+        res = get_http_session().post(f"{api_url}/attendance/{record_date}", json=payload, headers=api_headers())
         if res.status_code == 200:
+            invalidate_month(record_date)
             return True
         else:
             st.error(f"保存に失敗しました: {res.text}")
@@ -56,10 +358,10 @@ def save_attendance(record_date, payload: Dict[str, Any], api_url: str) -> bool:
 # 勤怠データ取得
 def fetch_monthly_attendance(month_str):
     try:
-        res = requests.get(f"{API_URL}/attendance/month/{month_str}")
-        if res.status_code == 200:
-            print(f'{API_URL}/attendance/month/{month_str} : {res.json()}')
-            return res.json()
+        status, data, _ = get_json(f"{API_URL}/attendance/month/{month_str}", month_str)
+        if status == 200:
+            print(f'{API_URL}/attendance/month/{month_str} : {data}')
+            return data
     except Exception as e:
         st.error(f"取得失敗: {e}")
     return []
@@ -76,13 +378,13 @@ def fetch_daily_summary(record_date: date) -> Optional[Dict[str, Any]]:
         dict or None: 勤怠データと集計データ（存在しない場合は空dict、失敗時はNone）
     """
     try:
-        res = requests.get(f"{API_URL}/attendance/summary/daily/{record_date.isoformat()}")
-        if res.status_code == 200:
-            return res.json()
-        elif res.status_code == 404:
+        status, data, _ = get_json(f"{API_URL}/attendance/summary/daily/{record_date.isoformat()}", record_date.strftime("%Y-%m"))
+        if status == 200:
+            return data
+        elif status == 404:
             return {}
         else:
-            st.warning(f"データ取得失敗: {res.status_code}")
+            st.warning(f"データ取得失敗: {status}")
             return None
     except Exception as e:
         st.error(f"取得失敗: {e}")
@@ -100,26 +402,25 @@ def fetch_monthly_summary(year_month: str) -> Optional[List[Dict[str, Any]]]:
         list or None: 勤怠データと集計データのリスト（失敗時はNone）
     """
     try:
-        res = requests.get(f"{API_URL}/attendance/summary/monthly/{year_month}")
-        if res.status_code == 200:
-            return res.json()
+        status, data, _ = get_json(f"{API_URL}/attendance/summary/monthly/{year_month}", year_month)
+        if status == 200:
+            return data
         else:
-            st.warning(f"データ取得失敗: {res.status_code}")
+            st.warning(f"データ取得失敗: {status}")
             return None
     except Exception as e:
         st.error(f"取得失敗: {e}")
         return None
-    
 
-API_URL = "http://back:8000/api"
 
 def fetch_forecast_data(year_month):
     try:
-        res = requests.get(f"{API_URL}/attendance/forecast/{year_month}")
-        if res.status_code == 200:
-            return res.json()
+        status, data, detail = get_json(f"{API_URL}/attendance/forecast/{year_month}", year_month, ("attendance", "holidays"))
+        if status == 200:
+            remember_forecast_settings(data)
+            return data
         else:
-            st.error(f"予測データの取得に失敗しました: {res.text}")
+            st.error(f"予測データの取得に失敗しました: {detail}")
             return None
     except Exception as e:
         st.error(f"予測データの取得時にエラーが発生しました: {e}")
@@ -127,11 +428,11 @@ def fetch_forecast_data(year_month):
 
 def fetch_daily_attendance(year_month):
     try:
-        res = requests.get(f"{API_URL}/attendance/month/{year_month}")
-        if res.status_code == 200:
-            return res.json()
+        status, data, detail = get_json(f"{API_URL}/attendance/month/{year_month}", year_month)
+        if status == 200:
+            return data
         else:
-            st.error(f"日毎の勤怠データの取得に失敗しました: {res.text}")
+            st.error(f"日毎の勤怠データの取得に失敗しました: {detail}")
             return None
     except Exception as e:
         st.error(f"日毎の勤怠データの取得時にエラーが発生しました: {e}")
@@ -139,11 +440,11 @@ def fetch_daily_attendance(year_month):
 
 def fetch_holidays(year_month):
     try:
-        res = requests.get(f"{API_URL}/holidays/{year_month}")
-        if res.status_code == 200:
-            return [holiday["date"] for holiday in res.json()]  # 祝日の日付リストを取得
+        status, data, detail = get_json(f"{API_URL}/holidays/{year_month}", year_month, ("holidays",))
+        if status == 200:
+            return [holiday["date"] for holiday in data]  # 祝日の日付リストを取得
         else:
-            st.error(f"祝日データの取得に失敗しました: {res.text}")
+            st.error(f"祝日データの取得に失敗しました: {detail}")
             return []
     except Exception as e:
         st.error(f"祝日データの取得時にエラーが発生しました: {e}")
@@ -160,12 +461,66 @@ def fetch_aggregate_attendance(year_month: str) -> Dict[str, float]:
         dict: 集計結果（勤務日数、総勤務時間、実働時間など）
     """
     try:
-        res = requests.get(f'{API_URL}/attendance/summary/monthly-agg/{year_month}')
-        if res.status_code == 200:
-            return res.json()
+        status, data, _ = get_json(f'{API_URL}/attendance/summary/monthly-agg/{year_month}', year_month)
+        if status == 200:
+            return data
         else:
-            st.warning(f"データ取得失敗: {res.status_code}")
+            st.warning(f"データ取得失敗: {status}")
             return None
     except Exception as e:
         st.error(f"取得失敗: {e}")
-        return None
\ No newline at end of file
+        return None
+
+
+def fetch_dashboard(year_month: str, strategy: Optional[str] = None) -> Optional[Dict[str, Any]]:
+    """
+    ダッシュボード表示用のデータ（集計・予測・日ごとの集計・休日・累積推移）を1回のリクエストで取得する。
+
+    Args:
+        year_month (str): 取得対象年月（YYYY-MM形式）
+        strategy (str or None): 勤務時間の予測方式（fixed / trailing / ewma、省略時はAPIの既定）
+
+    Returns:
+        dict or None: ダッシュボード表示用のデータ（失敗時はNone）
+    """
+    try:
+        url = f"{API_URL}/dashboard/{year_month}" + (f"?strategy={strategy}" if strategy else "")
+        status, data, detail = get_json(url, year_month, ("attendance", "holidays"))
+        if status == 200:
+            remember_forecast_settings(data.get("forecast"))
+            return data
+        else:
+            st.error(f"ダッシュボードデータの取得に失敗しました: {detail}")
+            return None
+    except Exception as e:
+        st.error(f"ダッシュボードデータの取得時にエラーが発生しました: {e}")
+        return None
+
+
+def fetch_month_overview(year_month: str) -> Tuple[Optional[Dict[str, Any]], List[Dict[str, Any]]]:
+    """
+    指定した年月の集計と勤怠データ一覧を並行して取得する（編集画面用）。
+
+    Returns:
+        tuple: (fetch_aggregate_attendanceの結果, fetch_monthly_attendanceの結果)
+    """
+    prefetch_json(
+        (f"{API_URL}/attendance/summary/monthly-agg/{year_month}", year_month, ("attendance",)),
+        (f"{API_URL}/attendance/month/{year_month}", year_month, ("attendance",)),
+    )
+    return fetch_aggregate_attendance(year_month), fetch_monthly_attendance(year_month)
+
+
+def fetch_input_page_data(record_date: date) -> Tuple[List[Dict[str, Any]], Optional[Dict[str, Any]]]:
+    """
+    対象日の月の勤怠データ一覧と、対象日の集計データを並行して取得する（入力画面用）。
+
+    Returns:
+        tuple: (fetch_monthly_attendanceの結果, fetch_daily_summaryの結果)
+    """
+    month_str = record_date.strftime("%Y-%m")
+    prefetch_json(
+        (f"{API_URL}/attendance/month/{month_str}", month_str, ("attendance",)),
+        (f"{API_URL}/attendance/summary/daily/{record_date.isoformat()}", month_str, ("attendance",)),
+    )
+    return fetch_monthly_attendance(month_str), fetch_daily_summary(record_date)
@@ -1,104 +1,61 @@
 import pandas as pd
 import plotly.express as px
-import calendar
 import plotly.graph_objects as go
 
 
-def prepare_work_hours_graph_data(daily_data, month_str, holidays):
-    """
-    グラフ描画用のデータを準備する関数
-
-    Args:
-        daily_data (list): 日毎の勤怠データ
-        month_str (str): 対象月（YYYY-MM形式）
-        holidays (list): 祝日の日付リスト
-
-    Returns:
-        pd.DataFrame: グラフ描画用のデータフレーム
-    """
-    # 実績データを日付順に並べる
-    daily_records = sorted(daily_data, key=lambda x: x["raw"]["date"])  # "raw"キーの"date"でソート
-    actual_hours_dict = {record["raw"]["date"]: record["summary"]["actual_work_hours"] for record in daily_records}
-
-    # 月末の日付を計算
-    year, month = map(int, month_str.split("-"))
-    _, last_day = calendar.monthrange(year, month)
-    all_dates = pd.date_range(start=f"{year}-{month:02d}-01", end=f"{year}-{month:02d}-{last_day}")
-
-    # 実績勤務時間を全日付に対応する形で構築
-    actual_hours = []
-    for date_obj in all_dates:
-        date_str = date_obj.strftime("%Y-%m-%d")
-        actual_hours.append(actual_hours_dict.get(date_str, 0))  # 登録されていない日は0
-
-    # 土日と祝日を除外して予測勤務時間を計算
-    daily_forecast_hours = []
-    for date_obj in all_dates:
-        date_str = date_obj.strftime("%Y-%m-%d")
-        if date_str in actual_hours_dict and actual_hours_dict[date_str] > 0:
-            # 実績データがある場合はその実績勤務時間を使用
-            daily_forecast_hours.append(actual_hours_dict[date_str])
-        elif date_obj.weekday() < 5 and date_str not in holidays:  # 平日かつ祝日でない場合
-            daily_forecast_hours.append(8)  # 未登録日は1日8時間の予測
-        else:
-            daily_forecast_hours.append(0)  # 土日または祝日は0時間
-
-    # 実績データを累積計算
-    cumulative_actual_hours = pd.Series(actual_hours).cumsum()
-
-    # 予測勤務時間を累積計算
-    cumulative_forecast_hours = pd.Series(daily_forecast_hours).cumsum()
-
-    # データフレーム作成
-    df = pd.DataFrame({
-        "日付": all_dates.strftime("%Y-%m-%d"),
-        "予測勤務時間（累積）": cumulative_forecast_hours,
-        "実績勤務時間（累積）": cumulative_actual_hours
-    })
-
-    return df
-
-def create_work_hours_graph(df: pd.DataFrame, threshold1: float = 140, threshold2: float = 180):
+def create_work_hours_graph(series: dict, threshold1: float = 140, threshold2: float = 180):
     """
     勤務時間推移と予測のグラフを作成する関数
 
+    APIで計算済みの累積推移の列をそのまま描画する（画面側ではデータフレームを作成しない）。
+
     Args:
-        df (pd.DataFrame): グラフ描画用のデータフレーム
+        series (dict): 累積推移（dates, actual, forecastの列。/dashboard/{year_month}のseriesなど）
         threshold1 (float): 閾値1（デフォルト140時間）
         threshold2 (float): 閾値2（デフォルト180時間）
 
     Returns:
         plotly.graph_objects.Figure: 作成されたグラフオブジェクト
     """
-    # グラフ描画
-    fig = px.line(
-        df,
-        x="日付",
-        y=["予測勤務時間（累積）","実績勤務時間（累積）"],
-        labels={"variable": "種類", "value": "勤務時間（時間）"},
-    )
-
+    dates = series["dates"]
+    fig = go.Figure()
 
-    # 予測勤務時間のスタイルを設定（水色の点線）
-    fig.data[0].update(line=dict(color="lightblue", width=3, dash="dot"), name="予測勤務時間（累積）")
-    # 実績勤務時間のスタイルを設定（青色の実線）
-    fig.data[1].update(line=dict(color="blue", width=3), name="実績勤務時間（累積）")
+    # 予測勤務時間（水色の点線）
+    fig.add_trace(
+        go.Scatter(
+            x=dates,
+            y=series["forecast"],
+            mode="lines",
+            line=dict(color="lightblue", width=3, dash="dot"),
+            name="予測勤務時間（累積）",
+        )
+    )
+    # 実績勤務時間（青色の実線）
+    fig.add_trace(
+        go.Scatter(
+            x=dates,
+            y=series["actual"],
+            mode="lines",
+            line=dict(color="blue", width=3),
+            name="実績勤務時間（累積）",
+        )
+    )
 
     # 閾値2（上限）を凡例に追加
     fig.add_trace(
         go.Scatter(
-            x=[df["日付"].iloc[0], df["日付"].iloc[-1]],
+            x=[dates[0], dates[-1]],
             y=[threshold2, threshold2],
             mode="lines",
             line=dict(color="gray", dash="dash", width=1),
             name="上限（180時間）"
         )
     )
-    
+
     # 閾値1（下限）を凡例に追加
     fig.add_trace(
         go.Scatter(
-            x=[df["日付"].iloc[0], df["日付"].iloc[-1]],
+            x=[dates[0], dates[-1]],
             y=[threshold1, threshold1],
             mode="lines",
             line=dict(color="gray", dash="dash", width=1),
@@ -106,8 +63,6 @@ def create_work_hours_graph(df: pd.DataFrame, threshold1: float = 140, threshold
         )
     )
 
-
-
     # レイアウト調整
     fig.update_layout(
         title="累積時間推移グラフ",
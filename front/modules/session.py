@@ -3,6 +3,8 @@
 import streamlit as st
 from typing import List, Dict, Any
 
+from settings import DEFAULT_USER_ID, ORG_ID
+
 def init_session_state(PAGE_NAME: str, session_state_list: List[str]):
     """
     ページ遷移時にセッションステートを初期化する。
@@ -13,3 +15,13 @@ def init_session_state(PAGE_NAME: str, session_state_list: List[str]):
         for key in session_state_list:
             if key in st.session_state:
                 del st.session_state[key]
+
+
+def get_user_id() -> str:
+    """現在選択されているユーザーIDを返す。"""
+    return st.session_state.get("user_id") or DEFAULT_USER_ID
+
+
+def api_headers() -> Dict[str, str]:
+    """APIリクエストに付与する利用者ヘッダーを返す。"""
+    return {"X-User-Id": get_user_id(), "X-Org-Id": ORG_ID}
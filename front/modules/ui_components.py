@@ -1,11 +1,11 @@
 # Streamlit UI部品・描画系
 from datetime import date, datetime, time
 from typing import Any, Dict, List, Optional
-import requests
 import streamlit as st
 
 from modules.time_utils import parse_time_str
-from modules.api_client import save_attendance
+from modules.api_client import get_http_session, invalidate_month, save_attendance
+from modules.session import api_headers, get_user_id
 from settings import (
     API_URL,
     DEFAULT_START_TIME,
@@ -17,6 +17,12 @@ from settings import (
     DEFAULT_SIDE_JOB_MINUTES,
 )
 
+def render_user_selector():
+    """サイドバーに利用者（ユーザーID）の入力欄を表示し、選択をセッションに保存する。"""
+    user_id = st.sidebar.text_input("ユーザーID", value=get_user_id())
+    st.session_state["user_id"] = user_id.strip() or None
+
+
 def get_safe(summary: dict, key: str, default=""):
     """summary辞書からkeyを安全に取得。なければdefaultを返す"""
     return summary[key] if summary and key in summary else default
@@ -305,8 +311,9 @@ def render_edit_blocks(records):
                         }
                         print(f'POST Data: {payload}')
                         st.session_state["last_payload"] = payload
-                        res = requests.post(f"{API_URL}/attendance/{record_date}", json=payload)
+                        res = get_http_session().post(f"{API_URL}/attendance/{record_date}", json=payload, headers=api_headers())
                         if res.status_code == 200:
+                            invalidate_month(record_date)
                             st.session_state["saved"] = True
                             #st.rerun()
                         else:
@@ -315,8 +322,9 @@ def render_edit_blocks(records):
                 with col_delete:
                     if st.button("DELETE", key=f"{record_date}_delete"):
                         st.session_state["last_payload"] = None
-                        res = requests.delete(f"{API_URL}/attendance/{record_date}")
+                        res = get_http_session().delete(f"{API_URL}/attendance/{record_date}", headers=api_headers())
                         if res.status_code == 200:
+                            invalidate_month(record_date)
                             st.session_state['deleted'] = True
                             st.rerun()
                         else:
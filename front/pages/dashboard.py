@@ -2,8 +2,11 @@ import streamlit as st
 import pandas as pd
 import plotly.express as px
 from datetime import date, datetime
-from modules.graph import create_work_hours_graph, prepare_work_hours_graph_data, create_daily_attendance_chart
-from modules.api_client import fetch_monthly_summary, fetch_holidays, fetch_aggregate_attendance, fetch_forecast_data
+from modules.graph import create_work_hours_graph, create_daily_attendance_chart
+from modules.api_client import fetch_dashboard
+from modules.ui_components import render_user_selector
+
+render_user_selector()
 
 st.title("📊 勤怠ダッシュボード")
 
@@ -16,10 +19,27 @@ default_month = date(today.year, today.month, 1)
 selected_month = st.date_input("対象月を選択", value=default_month)
 month_str = selected_month.strftime("%Y-%m")
 
+# 集計・予測・日毎の集計・祝日・累積推移を1回のリクエストで取得
+# 未登録の平日の勤務時間の予測方式は、選択済みの値（初回はAPIの既定）で取得する
+dashboard = fetch_dashboard(month_str, st.session_state.get("forecast_strategy")) or {}
+
+# 予測方式の選択肢と説明は、APIの設定（時間・週数）から作成されたものを使う
+strategy_labels = {option["name"]: option["label"] for option in dashboard.get("strategies", [])}
+if strategy_labels:
+    current_strategy = (dashboard.get("forecast") or {}).get("strategy")
+    options = list(strategy_labels)
+    st.selectbox(
+        "予測方式",
+        options=options,
+        index=options.index(current_strategy) if current_strategy in options else 0,
+        format_func=strategy_labels.get,
+        key="forecast_strategy",
+    )
+
 # ---------------------------------- 
 # 集計
 # ----------------------------------
-agg = fetch_aggregate_attendance(month_str)
+agg = dashboard.get("aggregate")
 if agg is None:
     st.error("集計データの取得に失敗しました。")
 else:
@@ -51,7 +71,7 @@ else:
 # ------------------------------
 st.markdown(f"### 予測と実績推移")
 # 予測勤務時間データを取得して表にする
-forecast_data = fetch_forecast_data(month_str)
+forecast_data = dashboard.get("forecast")
 if forecast_data is None:
     st.error("予測勤務時間の取得に失敗しました。")
 else:
@@ -59,39 +79,36 @@ else:
     st.table(
         {
             "項目": [
+                "予測方式",
                 "登録済み勤務時間",
                 "予測勤務時間",
                 "未登録日数",
+                "残り営業日数",
                 "登録休日数",
             ],
             "値": [
+                forecast_data.get("strategy_label") or forecast_data.get("strategy", ""),
                 f"{forecast_data['registered_work_hours']} h",
                 f"{forecast_data['predicted_work_hours']} h",
                 f"{forecast_data['unregistered_days']} 日",
+                f"{forecast_data.get('remaining_business_days', 0)} 日",
                 f"{forecast_data['holiday_days']} 日",
             ],
         }
     )
 
-# 日毎の集計データを取得
-daily_data = fetch_monthly_summary(month_str)
-# 祝日データの取得
-holidays = fetch_holidays(month_str)
-
-# グラフデータの作成
-if daily_data:
-    df = prepare_work_hours_graph_data(daily_data, month_str, holidays)
-
+# 累積推移はAPIで計算済みの列をそのまま使用
+if dashboard.get("series"):
     # グラフを表示
-    fig = create_work_hours_graph(df)
+    fig = create_work_hours_graph(dashboard["series"])
     st.plotly_chart(fig, use_container_width=True)
 
 
 # ----------------------------------
 # 1ヶ月の日々の勤怠データの積み重ね棒グラフ
 # ----------------------------------
-# 日毎の勤怠データを取得
-daily_attendance_data = fetch_monthly_summary(month_str)
+# 日毎の勤怠データ
+daily_attendance_data = dashboard.get("daily")
 # グラフ作成して表示
 if daily_attendance_data is None:
     st.error("日毎の勤怠データの取得に失敗しました。")
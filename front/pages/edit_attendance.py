@@ -2,8 +2,8 @@ import streamlit as st
 from datetime import datetime, date, timedelta
 import pandas as pd
 
-from modules.api_client import fetch_monthly_attendance, fetch_aggregate_attendance
-from modules.ui_components import render_calendar, render_edit_blocks
+from modules.api_client import fetch_month_overview
+from modules.ui_components import render_calendar, render_edit_blocks, render_user_selector
 from modules.session import init_session_state
 
 
@@ -14,6 +14,7 @@ session_state_list = ["last_payload", "saved", "deleted", "error"]
 
 # ページ遷移時にセッションステートを初期化する
 init_session_state(PAGE_NAME, session_state_list)
+render_user_selector()
 
 st.title("勤怠確認・編集")
 
@@ -28,8 +29,8 @@ st.markdown(f"## 対象月: {selected_month.strftime('%Y-%m')}")
 month_str = selected_month.strftime("%Y-%m")
 
 
-# --- 集計 ---
-agg = fetch_aggregate_attendance(month_str)
+# --- 集計と勤怠データを並行して取得 ---
+agg, records = fetch_month_overview(month_str)
 
 work_total_hours = agg["work_total_hours"]
 break_total_hours = agg["break_total_hours"]
@@ -64,9 +65,6 @@ st.table({
     ]
 })
 
-# --- 勤怠データの取得 ---
-records = fetch_monthly_attendance(month_str)
-
 # 日付の昇順（古い→新しい）でソート
 records = sorted(records, key=lambda r: r["date"])
 
@@ -1,9 +1,24 @@
 import streamlit as st
 from datetime import date, datetime
-import requests
 from typing import List, Dict
 
-API_URL = "http://back:8000/api"
+from modules.api_client import get_http_session, get_json, invalidate_month, prefetch_json
+from modules.session import api_headers
+from modules.ui_components import render_user_selector
+from settings import API_URL
+
+# 設定範囲の表示名（"org": 組織共通、"user": 個人設定）
+SCOPE_LABELS = {"org": "組織共通", "user": "個人設定"}
+
+def holiday_scope(h: Dict) -> str:
+    """祝日データの設定範囲を返す（user_idが無ければ組織共通）。"""
+    return "org" if h.get("user_id") is None else "user"
+
+def format_holiday(h: Dict) -> str:
+    kind = "休日" if h.get("is_holiday", True) else "出勤日"
+    return f"{h['date']} - {h['name']}（{SCOPE_LABELS[holiday_scope(h)]}・{kind}）"
+
+render_user_selector()
 
 st.title("🎌 祝日管理")
 
@@ -14,15 +29,21 @@ st.subheader("📅 祝日を登録")
 
 selected_date = st.date_input("対象日付を選択", value=date.today())
 holiday_name = st.text_input("祝日の名前を入力", value="")
+scope = st.radio("設定範囲", options=list(SCOPE_LABELS), format_func=SCOPE_LABELS.get, horizontal=True)
+# 個人設定では組織の祝日を出勤日に変更できる
+is_holiday = True
+if scope == "user":
+    is_holiday = not st.checkbox("この日を出勤日にする（組織の祝日を取り消す）")
 
 if st.button("祝日を登録"):
     if not holiday_name.strip():
         st.error("祝日の名前を入力してください。")
     else:
-        payload = {"date": selected_date.isoformat(), "name": holiday_name}
+        payload = {"date": selected_date.isoformat(), "name": holiday_name, "scope": scope, "is_holiday": is_holiday}
         try:
-            res = requests.post(f"{API_URL}/holidays/", json=payload)
+            res = get_http_session().post(f"{API_URL}/holidays/", json=payload, headers=api_headers())
             if res.status_code == 200:
+                invalidate_month(selected_date, ("holidays",))
                 st.success(f"祝日 '{holiday_name}' を登録しました。")
             elif res.status_code == 400:
                 st.error("既に登録されている祝日です。")
@@ -31,6 +52,40 @@ if st.button("祝日を登録"):
         except Exception as e:
             st.error(f"登録時にエラーが発生しました: {e}")
 
+# -------------------------------
+# 1-2. 国民の祝日を一括登録（規則から計算するため通信は不要）
+# -------------------------------
+st.subheader("🇯🇵 国民の祝日を一括登録")
+
+this_year = date.today().year
+col_start, col_end = st.columns(2)
+start_year = col_start.number_input("開始年", min_value=1980, max_value=2099, value=this_year, step=1)
+end_year = col_end.number_input("終了年", min_value=1980, max_value=2099, value=this_year + 1, step=1)
+
+if st.button("国民の祝日を登録（組織共通）"):
+    if start_year > end_year:
+        st.error("開始年は終了年以前を指定してください。")
+    else:
+        try:
+            res = get_http_session().post(
+                f"{API_URL}/holidays/national",
+                params={"start_year": int(start_year), "end_year": int(end_year)},
+                headers=api_headers(),
+            )
+            if res.status_code == 200:
+                result = res.json()
+                for year in range(int(start_year), int(end_year) + 1):
+                    for month in range(1, 13):
+                        invalidate_month(f"{year}-{month:02d}", ("holidays",))
+                st.success(
+                    f"{int(start_year)}〜{int(end_year)}年の祝日を登録しました"
+                    f"（新規 {result['created']} 件・更新 {result['updated']} 件・変更なし {result['unchanged']} 件）。"
+                )
+            else:
+                st.error(f"登録に失敗しました: {res.text}")
+        except Exception as e:
+            st.error(f"登録時にエラーが発生しました: {e}")
+
 st.markdown("---")
 
 # -------------------------------
@@ -40,22 +95,38 @@ st.subheader("📋 対象月の祝日一覧")
 
 month_str = selected_date.strftime("%Y-%m")
 
-def fetch_holidays_by_month(year_month: str) -> List[Dict]:
+def holidays_url(year_month: str, scope: str) -> str:
+    return f"{API_URL}/holidays/{year_month}?scope={scope}"
+
+def fetch_holidays_by_month(year_month: str, scope: str) -> List[Dict]:
     try:
-        res = requests.get(f"{API_URL}/holidays/{year_month}")
-        if res.status_code == 200:
-            return res.json()
+        status, data, detail = get_json(holidays_url(year_month, scope), year_month, ("holidays",))
+        if status == 200:
+            return data
         else:
-            st.error(f"祝日一覧の取得に失敗しました: {res.text}")
+            st.error(f"祝日一覧の取得に失敗しました: {detail}")
             return []
     except Exception as e:
         st.error(f"祝日一覧の取得時にエラーが発生しました: {e}")
         return []
 
-holidays = fetch_holidays_by_month(month_str)
+# 組織共通の祝日と個人設定をまとめて表示する
+prefetch_json(*[(holidays_url(month_str, s), month_str, ("holidays",)) for s in SCOPE_LABELS])
+holidays = sorted(
+    fetch_holidays_by_month(month_str, "org") + fetch_holidays_by_month(month_str, "user"),
+    key=lambda h: h["date"],
+)
 
 if holidays:
-    st.table([{"日付": h["date"], "名前": h["name"]} for h in holidays])
+    st.table([
+        {
+            "日付": h["date"],
+            "名前": h["name"],
+            "設定範囲": SCOPE_LABELS[holiday_scope(h)],
+            "区分": "休日" if h.get("is_holiday", True) else "出勤日",
+        }
+        for h in holidays
+    ])
 else:
     st.info("この月には祝日が登録されていません。")
 
@@ -66,7 +137,7 @@ else:
 st.subheader("✏️ 祝日を編集")
 
 if holidays:
-    holiday_to_edit = st.selectbox("編集する祝日を選択", options=holidays, format_func=lambda h: f"{h['date']} - {h['name']}")
+    holiday_to_edit = st.selectbox("編集する祝日を選択", options=holidays, format_func=format_holiday)
     new_name = st.text_input("新しい祝日の名前を入力", value=holiday_to_edit["name"])
     if st.button("祝日を更新"):
         if not new_name.strip():
@@ -75,11 +146,14 @@ if holidays:
             # date フィールドを含めた payload を作成
             payload = {
                 "date": holiday_to_edit["date"],  # 必須フィールドとして date を追加
-                "name": new_name
+                "name": new_name,
+                "scope": holiday_scope(holiday_to_edit),
+                "is_holiday": holiday_to_edit.get("is_holiday", True),
             }
             try:
-                res = requests.put(f"{API_URL}/holidays/{holiday_to_edit['date']}", json=payload)
+                res = get_http_session().put(f"{API_URL}/holidays/{holiday_to_edit['date']}", json=payload, headers=api_headers())
                 if res.status_code == 200:
+                    invalidate_month(holiday_to_edit["date"], ("holidays",))
                     #st.success(f"祝日 '{holiday_to_edit['date']}' を '{new_name}' に更新しました。")
                     st.rerun()  
                 else:
@@ -93,11 +167,16 @@ if holidays:
 st.subheader("🗑️ 祝日を削除")
 
 if holidays:
-    holiday_to_delete = st.selectbox("削除する祝日を選択", options=holidays, format_func=lambda h: f"{h['date']} - {h['name']}")
+    holiday_to_delete = st.selectbox("削除する祝日を選択", options=holidays, format_func=format_holiday)
     if st.button("祝日を削除"):
         try:
-            res = requests.delete(f"{API_URL}/holidays/{holiday_to_delete['date']}")
+            res = get_http_session().delete(
+                f"{API_URL}/holidays/{holiday_to_delete['date']}",
+                params={"scope": holiday_scope(holiday_to_delete)},
+                headers=api_headers(),
+            )
             if res.status_code == 200:
+                invalidate_month(holiday_to_delete["date"], ("holidays",))
                 st.success(f"祝日 '{holiday_to_delete['name']}' を削除しました。")
                 st.experimental_rerun()
             else:
@@ -1,7 +1,19 @@
+import os
 from datetime import time
 from typing import List, Dict
 
-API_URL = "http://back:8000/api"
+API_URL = os.getenv("WORK_MANAGER_API_URL", "http://back:8000/api")
+# APIとの通信設定（接続タイムアウト, 読み取りタイムアウト）の秒数、接続プール数、再試行
+HTTP_TIMEOUT = (3.05, 30)
+HTTP_POOL_SIZE = 10
+HTTP_RETRIES = 3
+HTTP_BACKOFF_FACTOR = 0.3
+# APIレスポンスのキャッシュ（書き込み時は対象月のみ無効化、TTLは他のクライアントからの変更を反映するまでの上限）
+CACHE_TTL_SECONDS = 300
+CACHE_MAX_ENTRIES = 512
+# 利用者（サイドバーで変更可能）。バックエンドへはX-User-Id / X-Org-Idヘッダーで送信する
+DEFAULT_USER_ID = os.getenv("WORK_MANAGER_USER_ID", "default")
+ORG_ID = os.getenv("WORK_MANAGER_ORG_ID", "default")
 DEFAULT_START_TIME = time(8, 30)
 DEFAULT_END_TIME = time(17, 30)
 DEFAULT_BREAK_MINUTES = 60